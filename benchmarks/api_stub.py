@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Laravel API, used by the benchmarks.
+
+Implements the endpoints NoxFeed talks to (see LARAVEL_API_SPEC.md):
+
+    POST /api/auth/token                         -> token + expires_at
+    POST /api/auth/renew                         -> new token
+    POST /api/message                            -> 201
+    POST /api/message/bulk                       -> 201 (optional)
+    GET  /api/config                             -> config JSON
+    POST /broadcasting/auth                      -> channel auth signature
+    POST /api/websocket/track/noxfeed-client     -> 200
+
+Every request can be delayed (latency + random jitter) and a share of
+requests can be answered with an error status (failure injection).
+
+Request bodies may be gzip or zstd compressed (Content-Encoding); the
+accepted codings are listed in an Accept-Encoding response header, other
+codings get 415. Bulk bodies may use the compact format
+(includes/handlers/compact_batch.py). Request body bytes are counted.
+
+Usage:
+    python3 benchmarks/api_stub.py --port 8000 --latency-ms 20 --failure-rate 0.05
+"""
+
+import argparse
+import gzip
+import json
+import os
+import random
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from includes.api.body_encoder import SUPPORTED_ENCODINGS, zstandard  # noqa: E402
+from includes.handlers.compact_batch import decode_compact_batch  # noqa: E402
+
+
+class _Server(ThreadingHTTPServer):
+    # The default listen backlog (5) drops the SYNs of concurrent clients
+    # opening their connections at once; the retransmit costs a second
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class ApiStub:
+    """Threaded HTTP server emulating the Laravel API."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        failure_status: int = 503,
+        bulk: bool = True,
+        token_ttl: float = 10 * 86400,
+        on_message: Optional[Callable[[Dict[str, Any]], None]] = None,
+        request_encodings: Sequence[str] = SUPPORTED_ENCODINGS,
+    ) -> None:
+        """
+        Args:
+            host: Interface to listen on
+            port: TCP port (0 = pick a free port)
+            latency: Delay added to every response (seconds)
+            jitter: Random extra delay of up to this many seconds
+            failure_rate: Share of requests answered with failure_status (0..1)
+            failure_status: HTTP status used for injected failures
+            bulk: Serve /message/bulk (False = 404 like an older API)
+            token_ttl: Lifetime of issued tokens (seconds)
+            on_message: Called with every accepted message payload
+            request_encodings: Request body codings accepted and advertised
+                (empty = none, compressed bodies get 415)
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.failure_status = failure_status
+        self.bulk = bulk
+        self.token_ttl = token_ttl
+        self.on_message = on_message
+        self.request_encodings = tuple(request_encodings)
+
+        self.tokens = set()
+        self.requests: Counter = Counter()
+        self.failures: Counter = Counter()
+        self.messages = 0
+        self.body_bytes = 0
+        self.decoded_bytes = 0
+        self.rejected_encodings = 0
+        self._lock = threading.Lock()
+        self._random = random.Random(1234)
+
+        self.server = _Server((host, port), self._handler_class())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    def start(self) -> "ApiStub":
+        self._thread = threading.Thread(
+            target=self.server.serve_forever, name="api-stub", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": dict(self.requests),
+                "failures": dict(self.failures),
+                "messages": self.messages,
+                "body_bytes": self.body_bytes,
+                "decoded_bytes": self.decoded_bytes,
+                "rejected_encodings": self.rejected_encodings,
+            }
+
+    # ------------------------------------------------------------------
+    # Request handling
+    # ------------------------------------------------------------------
+
+    def _issue_token(self) -> Dict[str, Any]:
+        token = secrets.token_hex(20)
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=self.token_ttl)
+        with self._lock:
+            self.tokens.add(token)
+        return {
+            "token": token,
+            "expires_at": expires_at.isoformat(),
+            "user": {"id": 1, "name": "Benchmark", "email": "bench@example.com"},
+        }
+
+    def _authorized(self, headers) -> bool:
+        auth = headers.get("Authorization", "")
+        return auth.startswith("Bearer ") and auth[7:] in self.tokens
+
+    def handle(
+        self, method: str, path: str, headers, body: Any
+    ) -> Tuple[int, Dict[str, Any]]:
+        """Route one request. Returns (status, JSON body)."""
+        path = path.split("?", 1)[0]
+        # /broadcasting/auth lives outside the /api prefix
+        if path.startswith("/api/"):
+            path = path[4:]
+        route = f"{method} {path}"
+
+        with self._lock:
+            self.requests[route] += 1
+            inject_failure = self._random.random() < self.failure_rate
+            delay = self.latency + self._random.random() * self.jitter
+
+        if delay > 0:
+            time.sleep(delay)
+
+        if inject_failure:
+            with self._lock:
+                self.failures[route] += 1
+            return self.failure_status, {"message": "Injected failure"}
+
+        if route == "POST /auth/token":
+            if not body or not body.get("user") or not body.get("password"):
+                return 422, {"message": "The given data was invalid."}
+            return 200, self._issue_token()
+
+        if not self._authorized(headers):
+            return 401, {"message": "Unauthenticated."}
+
+        if route == "POST /auth/renew":
+            return 200, self._issue_token()
+
+        if route == "POST /message":
+            self._accept([body])
+            return 201, {"id": self.messages, "status": "stored"}
+
+        if route == "POST /message/bulk" and self.bulk:
+            try:
+                messages = decode_compact_batch(body or {})
+            except (KeyError, TypeError, ValueError) as e:
+                return 422, {"message": f"Invalid bulk body: {e}"}
+            self._accept(messages)
+            return 201, {"stored": len(messages)}
+
+        if route == "GET /config":
+            return 200, {"messages": {"send_to_api": True}}
+
+        if route == "POST /broadcasting/auth":
+            return 200, {"auth": f"stub:{secrets.token_hex(32)}"}
+
+        if route == "POST /websocket/track/noxfeed-client":
+            return 200, {"status": "ok"}
+
+        return 404, {"message": "Not Found"}
+
+    def decode(self, raw: bytes, encoding: Optional[str]) -> Tuple[Optional[int], Any]:
+        """Request body as JSON; (415, error) for an unsupported coding."""
+        with self._lock:
+            self.body_bytes += len(raw)
+        if raw and encoding:
+            if encoding not in self.request_encodings:
+                with self._lock:
+                    self.rejected_encodings += 1
+                return 415, {"message": f"Unsupported Content-Encoding: {encoding}"}
+            if encoding == "zstd":
+                raw = zstandard.ZstdDecompressor().decompressobj().decompress(raw)
+            else:
+                raw = gzip.decompress(raw)
+        with self._lock:
+            self.decoded_bytes += len(raw)
+        try:
+            return None, json.loads(raw) if raw else None
+        except ValueError:
+            return None, None
+
+    def _accept(self, messages) -> None:
+        with self._lock:
+            self.messages += len(messages)
+        if self.on_message:
+            for message in messages:
+                self.on_message(message)
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are separate writes; without this every
+            # keep-alive response waits for the client's delayed ACK
+            disable_nagle_algorithm = True
+
+            def _dispatch(self, method: str) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                encoding = self.headers.get("Content-Encoding")
+                status, data = stub.decode(raw, encoding)
+                if status is None:
+                    status, data = stub.handle(method, self.path, self.headers, data)
+                encoded = json.dumps(data).encode("utf-8")
+
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(encoded)))
+                if stub.request_encodings:
+                    self.send_header(
+                        "Accept-Encoding", ", ".join(stub.request_encodings)
+                    )
+                self.end_headers()
+                if method != "HEAD":
+                    self.wfile.write(encoded)
+
+            def do_GET(self) -> None:
+                self._dispatch("GET")
+
+            def do_HEAD(self) -> None:
+                # Connection warm-up (LaravelAPIClient.warm_up)
+                self._dispatch("HEAD")
+
+            def do_POST(self) -> None:
+                self._dispatch("POST")
+
+            def do_PUT(self) -> None:
+                self._dispatch("PUT")
+
+            def do_DELETE(self) -> None:
+                self._dispatch("DELETE")
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local Laravel API stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--failure-status", type=int, default=503)
+    parser.add_argument("--no-bulk", action="store_true", help="404 on /message/bulk")
+    parser.add_argument(
+        "--no-compression", action="store_true", help="415 on compressed bodies"
+    )
+    args = parser.parse_args()
+
+    stub = ApiStub(
+        host=args.host,
+        port=args.port,
+        latency=args.latency_ms / 1000.0,
+        jitter=args.jitter_ms / 1000.0,
+        failure_rate=args.failure_rate,
+        failure_status=args.failure_status,
+        bulk=not args.no_bulk,
+        request_encodings=() if args.no_compression else SUPPORTED_ENCODINGS,
+    )
+    print(f"API stub listening on {stub.base_url}")
+    try:
+        stub.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(json.dumps(stub.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
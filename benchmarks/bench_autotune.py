@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Auto-tune simulation: RfAutoTuner against a simulated rtl_fm pipeline.
+
+No dongle is involved. A SimulatedSupervisor stands in for the
+PipelineSupervisor: pages arrive at random, every codeword gets bit errors
+depending on how far the gain is from the (hidden) optimum, a squelch
+above the signal level drops pages, and every restart costs a short gap
+without audio. Half way through, the optimum moves (new interference),
+so the tuner has to follow it.
+
+The tuner runs on virtual time, so hours pass in seconds. Reported are
+the final setting, rounds, restarts, the share of time lost to restarts
+and the share of pages decoded: by the tuner, by the initial setting left
+alone, and by an oracle that always knows the optimum.
+
+Usage:
+    python3 benchmarks/bench_autotune.py
+    python3 benchmarks/bench_autotune.py --hours 48 --gain 20.7 --json
+    python3 benchmarks/bench_autotune.py --auto-gain
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from includes.worker import RfAutoTuner  # noqa: E402
+
+CODEWORDS_PER_PAGE = 8
+
+# Hidden channel: optimum gain (dB) before and after the drift
+OPTIMUM = (33.8, 40.2)
+# Squelch levels above this cut off pages
+SIGNAL_LEVEL = 40
+
+
+class SimulatedChannel:
+    def __init__(self, seed: int, pages_per_minute: float) -> None:
+        self.random = random.Random(seed)
+        self.pages_per_minute = pages_per_minute
+        self.optimum = OPTIMUM[0]
+
+    def bit_error_rate(self, gain: Optional[float]) -> float:
+        # Automatic gain sits a few dB off; errors grow fast off the optimum
+        offset = 6.0 if gain is None else gain - self.optimum
+        return min(0.2, 0.002 * math.exp((offset / 4.0) ** 2))
+
+    def pass_rate(self, squelch: int) -> float:
+        return 1 / (1 + math.exp((squelch - SIGNAL_LEVEL) / 3.0))
+
+    def expected_decode_rate(self, gain: Optional[float], squelch: int) -> float:
+        p = self.bit_error_rate(gain)
+        correctable = sum(
+            math.comb(31, k) * p**k * (1 - p) ** (31 - k) for k in range(3)
+        )
+        return self.pass_rate(squelch) * correctable**CODEWORDS_PER_PAGE
+
+    def transmit(self, seconds: float) -> int:
+        """Pages sent in the next ``seconds``."""
+        # Poisson arrivals, seconds is small compared to the page interval
+        return int(self.random.random() < self.pages_per_minute * seconds / 60)
+
+    def receive(self, gain: Optional[float], squelch: int) -> List[int]:
+        """Bit errors per codeword of one page (empty if squelched)."""
+        if self.random.random() > self.pass_rate(squelch):
+            return []
+        p = self.bit_error_rate(gain)
+        return [
+            sum(1 for _ in range(31) if self.random.random() < p)
+            for _ in range(CODEWORDS_PER_PAGE)
+        ]
+
+
+class SimulatedSupervisor:
+    """What RfAutoTuner uses of a PipelineSupervisor."""
+
+    def __init__(
+        self,
+        channel: SimulatedChannel,
+        args: List[str],
+        restart_gap: float,
+        telemetry: bool,
+    ) -> None:
+        self.name = "simulated"
+        self.channel = channel
+        self.restart_gap = restart_gap
+        self.rtl_worker = SimpleNamespace(args=list(args))
+        self.multimon_worker = SimpleNamespace(telemetry=self._telemetry)
+        self.telemetry_enabled = telemetry
+        self.counters = {"codewords": 0, "corrected_bits": 0, "uncorrectable": 0}
+        self.down_until = 0.0
+        self.now = 0.0
+
+        # Counters
+        self.restarts = 0
+        self.downtime = 0.0
+        self.sent = 0
+        self.decoded = 0
+
+    def _telemetry(self) -> Dict[str, Any]:
+        if not self.telemetry_enabled:
+            return {}
+        return {"samples": 0, "pocsag1200": dict(self.counters)}
+
+    def restart_stage(self, stage: str, reason: str, immediate: bool = False) -> None:
+        self.restarts += 1
+        self.downtime += self.restart_gap
+        self.down_until = self.now + self.restart_gap
+
+    def setting(self):
+        args = self.rtl_worker.args
+        gain = float(args[args.index("-g") + 1]) if "-g" in args else None
+        squelch = int(args[args.index("-l") + 1]) if "-l" in args else 0
+        return gain, squelch
+
+    def step(self, now: float, seconds: float) -> int:
+        """Simulate ``seconds`` of reception; returns the pages decoded."""
+        self.now = now
+        sent = self.channel.transmit(seconds)
+        self.sent += sent
+        if now < self.down_until:
+            return 0
+        gain, squelch = self.setting()
+        decoded = 0
+        for _ in range(sent):
+            errors = self.channel.receive(gain, squelch)
+            if not errors:
+                continue
+            self.counters["codewords"] += len(errors)
+            self.counters["corrected_bits"] += sum(e for e in errors if e <= 2)
+            self.counters["uncorrectable"] += sum(1 for e in errors if e > 2)
+            if all(e <= 2 for e in errors):
+                decoded += 1
+        self.decoded += decoded
+        return decoded
+
+
+def simulate(
+    hours: float,
+    gain: Optional[float],
+    squelch: int,
+    pages_per_minute: float,
+    tune: bool,
+    telemetry: bool,
+    seed: int,
+    restart_gap: float = 2.0,
+    **tuner_options: Any,
+) -> Dict[str, Any]:
+    channel = SimulatedChannel(seed, pages_per_minute)
+    args = ["-f", "168.075M", "-M", "fm", "-s", "22050", "-l", str(squelch)]
+    if gain is not None:
+        args[:0] = ["-g", f"{gain:g}"]
+    supervisor = SimulatedSupervisor(channel, args, restart_gap, telemetry)
+
+    # The tuner schedules from time.monotonic(); virtual time starts there
+    clock = time.monotonic()
+    tuner = RfAutoTuner(supervisor, **tuner_options) if tune else None
+
+    duration = int(hours * 3600)
+    oracle = 0.0
+    best = channel.expected_decode_rate(channel.optimum, 0)
+    for second in range(duration):
+        if second == duration // 2:
+            channel.optimum = OPTIMUM[1]
+            best = channel.expected_decode_rate(channel.optimum, 0)
+        now = clock + second
+        sent_before = supervisor.sent
+        for _ in range(supervisor.step(now, 1.0)):
+            if tuner:
+                tuner.record()
+        oracle += (supervisor.sent - sent_before) * best
+        if tuner:
+            tuner.tick(now)
+
+    final_gain, final_squelch = supervisor.setting()
+    return {
+        "gain": final_gain,
+        "squelch": final_squelch,
+        "rounds": tuner.rounds if tuner else 0,
+        "changes": tuner.changes if tuner else 0,
+        "restarts": supervisor.restarts,
+        "downtime_share": round(supervisor.downtime / duration, 5),
+        "pages": supervisor.sent,
+        "decoded": supervisor.decoded,
+        "decode_rate": (
+            round(supervisor.decoded / supervisor.sent, 4) if supervisor.sent else 0.0
+        ),
+        "oracle_rate": round(oracle / supervisor.sent, 4) if supervisor.sent else 0.0,
+    }
+
+
+def run(
+    hours: float = 24.0,
+    gain: Optional[float] = 25.4,
+    squelch: int = 30,
+    pages_per_minute: float = 6.0,
+    telemetry: bool = True,
+    seed: int = 1,
+    interval: float = 3600.0,
+    trial_seconds: float = 300.0,
+) -> Dict[str, Any]:
+    options = {
+        "interval": interval,
+        "start_delay": 600.0,
+        "trial_seconds": trial_seconds,
+    }
+    common = dict(
+        hours=hours,
+        gain=gain,
+        squelch=squelch,
+        pages_per_minute=pages_per_minute,
+        telemetry=telemetry,
+        seed=seed,
+    )
+    return {
+        "optimum_gain": list(OPTIMUM),
+        "fixed": simulate(tune=False, **common),
+        "tuned": simulate(tune=True, **common, **options),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Gain/squelch auto-tune simulation")
+    parser.add_argument("--hours", type=float, default=24.0, help="Virtual hours")
+    parser.add_argument("--gain", type=float, default=25.4, help="Initial gain (dB)")
+    parser.add_argument(
+        "--auto-gain", action="store_true", help="Start with automatic gain (no -g)"
+    )
+    parser.add_argument("--squelch", type=int, default=30, help="Initial squelch")
+    parser.add_argument("--rate", type=float, default=6.0, help="Pages per minute")
+    parser.add_argument("--interval", type=float, default=3600.0, help="Round interval")
+    parser.add_argument("--trial", type=float, default=300.0, help="Seconds per trial")
+    parser.add_argument(
+        "--no-telemetry", action="store_true", help="Score by messages (multimon-ng)"
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="Print JSON result")
+    args = parser.parse_args()
+
+    result = run(
+        args.hours,
+        None if args.auto_gain else args.gain,
+        args.squelch,
+        args.rate,
+        not args.no_telemetry,
+        args.seed,
+        args.interval,
+        args.trial,
+    )
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    before, after = result["optimum_gain"]
+    print(f"{args.hours:g} h, optimum gain {before:g} dB, {after:g} dB after half time")
+    for name in ("fixed", "tuned"):
+        entry = result[name]
+        gain = "auto" if entry["gain"] is None else f"{entry['gain']:g} dB"
+        print(
+            f"{name:<6} gain {gain}  squelch {entry['squelch']:>2}  "
+            f"{entry['decoded']:>5}/{entry['pages']} pages ({entry['decode_rate']:.1%}, "
+            f"oracle {entry['oracle_rate']:.1%})  {entry['rounds']} rounds  "
+            f"{entry['changes']} changes  {entry['restarts']} restarts  "
+            f"{entry['downtime_share']:.3%} downtime"
+        )
+
+
+if __name__ == "__main__":
+    main()
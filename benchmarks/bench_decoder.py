@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+POCSAG decoder benchmark: native NumPy decoder vs. multimon-ng.
+
+Generates synthetic POCSAG 512/1200/2400 transmissions (pocsag_synth.py)
+with noise and correctable bit errors, decodes them with the in-process
+PocsagDecoder and, if installed, with multimon-ng, and reports for each
+path the share of pages decoded correctly and the throughput (samples/s
+and multiple of real time).
+
+Usage:
+    python3 benchmarks/bench_decoder.py
+    python3 benchmarks/bench_decoder.py --pages 200 --noise 0.4 --bit-errors 2 --json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Sequence, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.pocsag_synth import (  # noqa: E402
+    Page,
+    modulate,
+    sample_pages,
+    transmission_bits,
+)
+from includes.decoder import PocsagDecoder  # noqa: E402
+from includes.handlers.pocsag_parser import parse_pocsag_fields  # noqa: E402
+
+BAUD_RATES = (512, 1200, 2400)
+
+MULTIMON_ARGS = [
+    "-t",
+    "raw",
+    "-a",
+    "POCSAG512",
+    "-a",
+    "POCSAG1200",
+    "-a",
+    "POCSAG2400",
+    "-f",
+    "auto",
+    "-",
+]
+
+# (protocol, address, function, type, message)
+Decoded = Tuple[str, int, int, str, str]
+
+
+def expected(pages: Sequence[Page], baud: int) -> List[Decoded]:
+    return [
+        (f"POCSAG{baud}", address, function, message_type, text)
+        for address, function, message_type, text in pages
+    ]
+
+
+def score(decoded: List[Decoded], wanted: List[Decoded]) -> Dict[str, Any]:
+    hits = sum(1 for page in wanted if page in decoded)
+    return {
+        "pages": len(wanted),
+        "decoded": hits,
+        "false": sum(1 for page in decoded if page not in wanted),
+        "decode_rate": round(hits / len(wanted), 4) if wanted else 0.0,
+    }
+
+
+def run_native(pcm: bytes, sample_rate: int, block: int) -> Tuple[List[Decoded], float]:
+    decoder = PocsagDecoder(sample_rate=sample_rate, baud_rates=BAUD_RATES)
+    started = time.perf_counter()
+    messages = []
+    for offset in range(0, len(pcm), block):
+        messages.extend(decoder.feed(pcm[offset : offset + block]))
+    messages.extend(decoder.flush())
+    elapsed = time.perf_counter() - started
+    decoded = [
+        (m.protocol, int(m.address), int(m.function), m.type, m.message)
+        for m in messages
+    ]
+    return decoded, elapsed
+
+
+def run_multimon(command: str, pcm: bytes) -> Tuple[List[Decoded], float]:
+    started = time.perf_counter()
+    output = subprocess.run(
+        [command, *MULTIMON_ARGS], input=pcm, capture_output=True, check=False
+    ).stdout.decode("utf-8", errors="replace")
+    elapsed = time.perf_counter() - started
+
+    decoded = []
+    for line in output.splitlines():
+        fields = parse_pocsag_fields(line)
+        if fields:
+            protocol, address, function, message_type, message, _ = fields
+            decoded.append(
+                (protocol, int(address), int(function), message_type, message)
+            )
+    return decoded, elapsed
+
+
+def throughput(samples: int, sample_rate: int, elapsed: float) -> Dict[str, float]:
+    return {
+        "seconds": round(elapsed, 4),
+        "samples_per_sec": round(samples / elapsed, 1) if elapsed else 0.0,
+        "realtime_factor": (
+            round(samples / sample_rate / elapsed, 1) if elapsed else 0.0
+        ),
+    }
+
+
+def run(
+    pages: int = 100,
+    noise: float = 0.3,
+    bit_errors: int = 1,
+    sample_rate: int = 22050,
+    block: int = 16384,
+    multimon: str = "multimon-ng",
+) -> Dict[str, Any]:
+    page_list = sample_pages(pages)
+    command = shutil.which(multimon)
+    result: Dict[str, Any] = {
+        "pages": pages,
+        "noise": noise,
+        "bit_errors": bit_errors,
+        "sample_rate": sample_rate,
+        "multimon": command or "not installed",
+    }
+
+    for baud in BAUD_RATES:
+        pcm = modulate(
+            transmission_bits(page_list, bit_errors),
+            baud,
+            sample_rate,
+            noise=noise,
+        )
+        samples = len(pcm) // 2
+        wanted = expected(page_list, baud)
+
+        decoded, elapsed = run_native(pcm, sample_rate, block)
+        entry: Dict[str, Any] = {
+            "audio_seconds": round(samples / sample_rate, 2),
+            "native": {
+                **score(decoded, wanted),
+                **throughput(samples, sample_rate, elapsed),
+            },
+        }
+
+        if command:
+            decoded, elapsed = run_multimon(command, pcm)
+            entry["multimon"] = {
+                **score(decoded, wanted),
+                **throughput(samples, sample_rate, elapsed),
+            }
+
+        result[f"pocsag{baud}"] = entry
+
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="POCSAG decoder benchmark")
+    parser.add_argument("--pages", type=int, default=100, help="Pages per baud rate")
+    parser.add_argument("--noise", type=float, default=0.3, help="Noise / amplitude")
+    parser.add_argument("--bit-errors", type=int, default=1, help="Per codeword")
+    parser.add_argument("--sample-rate", type=int, default=22050)
+    parser.add_argument("--multimon", default="multimon-ng", help="multimon-ng binary")
+    parser.add_argument("--json", action="store_true", help="Print JSON result")
+    args = parser.parse_args()
+
+    result = run(
+        args.pages,
+        args.noise,
+        args.bit_errors,
+        args.sample_rate,
+        multimon=args.multimon,
+    )
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    print(f"multimon-ng: {result['multimon']}")
+    for baud in BAUD_RATES:
+        entry = result[f"pocsag{baud}"]
+        for path in ("native", "multimon"):
+            if path not in entry:
+                continue
+            stats = entry[path]
+            print(
+                f"POCSAG{baud:<5} {path:<9} {stats['decoded']:>5}/{stats['pages']} pages "
+                f"({stats['false']} false)  {stats['samples_per_sec']:>12,.0f} samples/s  "
+                f"x{stats['realtime_factor']:.0f} real time"
+            )
+
+
+if __name__ == "__main__":
+    main()
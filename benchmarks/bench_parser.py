@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+POCSAG line parser micro-benchmark.
+
+Replays a corpus of recorded multimon-ng output through the previous
+split-based parser and the current single-pass parser and reports
+lines/sec for both.
+
+Usage:
+    python3 benchmarks/bench_parser.py
+    python3 benchmarks/bench_parser.py --corpus my_capture.txt --lines 500000 --json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from includes.handlers.pocsag_parser import parse_pocsag_fields  # noqa: E402
+
+DEFAULT_CORPUS = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "data", "multimon_sample.txt"
+)
+
+
+def legacy_parse(line: str) -> Optional[Dict[str, Any]]:
+    """The split-based parser MessageHandler used before the single-pass engine."""
+    if not line or "POCSAG" not in line:
+        return None
+
+    parts = line.split(":", 1)
+    if len(parts) < 2:
+        return None
+
+    protocol = parts[0].strip()
+    content = parts[1].strip()
+
+    address = None
+    if "Address:" in content:
+        addr_parts = content.split("Address:", 1)[1].split("Function:", 1)
+        if addr_parts:
+            address = addr_parts[0].strip()
+
+    function = None
+    if "Function:" in content:
+        func_parts = content.split("Function:", 1)[1].split("Alpha:", 1)
+        if not func_parts:
+            func_parts = content.split("Function:", 1)[1].split("Numeric:", 1)
+        if func_parts:
+            function = func_parts[0].strip()
+
+    message_type = "alpha"
+    message = ""
+    if "Alpha:" in content:
+        message_type = "alpha"
+        message = content.split("Alpha:", 1)[1].strip()
+    elif "Numeric:" in content:
+        message_type = "numeric"
+        message = content.split("Numeric:", 1)[1].strip()
+
+    return {
+        "protocol": protocol,
+        "address": address,
+        "function": function,
+        "type": message_type,
+        "message": message,
+    }
+
+
+def load_corpus(path: str, total_lines: int) -> List[str]:
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        corpus = [line.rstrip("\n") for line in f]
+    if not corpus:
+        raise ValueError(f"Empty corpus: {path}")
+    repeats = total_lines // len(corpus) + 1
+    return (corpus * repeats)[:total_lines]
+
+
+def measure(
+    parsers: Dict[str, Callable[[str], Any]], lines: List[str], rounds: int
+) -> Dict[str, float]:
+    """Best lines/sec per parser; rounds alternate between parsers to even out noise."""
+    best = {name: 0.0 for name in parsers}
+    for _ in range(rounds):
+        for name, parse in parsers.items():
+            started = time.perf_counter()
+            for line in lines:
+                parse(line)
+            elapsed = time.perf_counter() - started
+            best[name] = max(best[name], len(lines) / elapsed)
+    return best
+
+
+def compare(lines: List[str]) -> Dict[str, int]:
+    """Count where the parsers disagree on the unique corpus lines."""
+    result = {"pocsag": 0, "legacy_wrong_protocol": 0, "legacy_wrong_function": 0}
+    for line in set(lines):
+        fields = parse_pocsag_fields(line)
+        if fields is None:
+            continue
+        result["pocsag"] += 1
+        legacy = legacy_parse(line)
+        if legacy is None:
+            continue
+        if legacy["protocol"] != fields[0]:
+            result["legacy_wrong_protocol"] += 1
+        if legacy["function"] != fields[2]:
+            result["legacy_wrong_function"] += 1
+    return result
+
+
+def run(corpus: str, total_lines: int, rounds: int) -> Dict[str, Any]:
+    lines = load_corpus(corpus, total_lines)
+    parsers = {"legacy": legacy_parse, "single_pass": parse_pocsag_fields}
+
+    result = {
+        "corpus": corpus,
+        "lines": len(lines),
+        "rounds": rounds,
+        "differences": compare(lines),
+    }
+
+    # Full corpus, then only the lines that are not POCSAG (reject path)
+    rejected = [line for line in lines if parse_pocsag_fields(line) is None]
+    for label, subset in (("all", lines), ("reject", rejected)):
+        if not subset:
+            continue
+        rates = measure(parsers, subset, rounds)
+        result[label] = {
+            "legacy_lines_per_sec": round(rates["legacy"]),
+            "single_pass_lines_per_sec": round(rates["single_pass"]),
+            "speedup": round(rates["single_pass"] / rates["legacy"], 2),
+        }
+
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="POCSAG parser benchmark")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="multimon-ng output")
+    parser.add_argument("--lines", type=int, default=200000, help="Lines per round")
+    parser.add_argument("--rounds", type=int, default=5, help="Rounds (best counts)")
+    parser.add_argument("--json", action="store_true", help="Print JSON result")
+    args = parser.parse_args()
+
+    result = run(args.corpus, args.lines, args.rounds)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    print(f"Corpus:       {result['corpus']} ({result['lines']} lines/round)")
+    for label in ("all", "reject"):
+        if label not in result:
+            continue
+        rates = result[label]
+        print(f"[{label}]")
+        print(f"  Legacy:       {rates['legacy_lines_per_sec']:>12,} lines/s")
+        print(f"  Single-pass:  {rates['single_pass_lines_per_sec']:>12,} lines/s")
+        print(f"  Speedup:      {rates['speedup']:>12}x")
+    print(f"Differences:  {result['differences']}")
+
+
+if __name__ == "__main__":
+    main()
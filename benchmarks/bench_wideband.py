@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Wideband benchmark: one rtl_sdr stream, several POCSAG channels.
+
+Generates synthetic multi-carrier u8 I/Q (pocsag_synth.modulate_iq) with
+one paging network per channel (different baud rates, two channels only
+25 kHz apart), runs it through the WidebandDecoder (Channelizer + one
+PocsagDecoder per channel) and reports per channel the share of pages
+decoded, plus the throughput of the channelizer alone, of the whole
+chain and how the channelizer scales with the number of channels.
+
+NumPy's FFT runs on one thread, so all throughput figures are per core;
+"cores" is the CPU share needed for real time (0.25 = a quarter core).
+
+Usage:
+    python3 benchmarks/bench_wideband.py
+    python3 benchmarks/bench_wideband.py --channels 4 --pages 20 --noise 2 --json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List, Sequence
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_decoder import expected, score  # noqa: E402
+from benchmarks.pocsag_synth import (  # noqa: E402
+    modulate_iq,
+    sample_pages,
+    transmission_bits,
+)
+from includes.decoder import Channelizer, WidebandDecoder  # noqa: E402
+
+CENTER_FREQUENCY = 168.5e6
+
+# Offsets from the tuning frequency; the last two are adjacent 25 kHz channels
+OFFSETS = (-425000.0, -187500.0, 400000.0, 425000.0, -700000.0, 700000.0)
+BAUDS = (1200, 2400, 512, 1200, 2400, 1200)
+
+
+def channel_plan(count: int) -> Dict[str, Dict[str, Any]]:
+    if not 1 <= count <= len(OFFSETS):
+        raise ValueError(f"1 to {len(OFFSETS)} channels")
+    return {
+        f"ch{index + 1}": {
+            "frequency": CENTER_FREQUENCY + OFFSETS[index],
+            "baud": BAUDS[index],
+        }
+        for index in range(count)
+    }
+
+
+def realtime(samples: int, sample_rate: int, elapsed: float) -> Dict[str, float]:
+    factor = samples / sample_rate / elapsed if elapsed else 0.0
+    return {
+        "seconds": round(elapsed, 4),
+        "msps": round(samples / elapsed / 1e6, 2) if elapsed else 0.0,
+        "realtime_factor": round(factor, 2),
+        "cores": round(1 / factor, 3) if factor else 0.0,
+    }
+
+
+def time_channelizer(
+    chunks: Sequence[bytes], channels: Dict[str, float], sample_rate: int, rate: int
+) -> float:
+    channelizer = Channelizer(sample_rate, CENTER_FREQUENCY, channels, rate)
+    started = time.perf_counter()
+    for chunk in chunks:
+        channelizer.feed(chunk)
+    return time.perf_counter() - started
+
+
+def run(
+    channels: int = 4,
+    pages: int = 8,
+    noise: float = 1.0,
+    bit_errors: int = 1,
+    sample_rate: int = 2400000,
+    channel_rate: int = 24000,
+) -> Dict[str, Any]:
+    plan = channel_plan(channels)
+    page_lists = {
+        name: sample_pages(pages, seed=index + 1) for index, name in enumerate(plan)
+    }
+    carriers = [
+        (
+            entry["frequency"] - CENTER_FREQUENCY,
+            transmission_bits(page_lists[name], bit_errors, seed=index + 1),
+            entry["baud"],
+        )
+        for index, (name, entry) in enumerate(plan.items())
+    ]
+    chunks: List[bytes] = list(modulate_iq(carriers, sample_rate, noise=noise))
+    samples = sum(len(chunk) for chunk in chunks) // 2
+    frequencies = {name: entry["frequency"] for name, entry in plan.items()}
+
+    decoder = WidebandDecoder(
+        sample_rate, CENTER_FREQUENCY, frequencies, channel_rate=channel_rate
+    )
+    started = time.perf_counter()
+    messages = []
+    for chunk in chunks:
+        messages.extend(decoder.feed(chunk))
+    messages.extend(decoder.flush())
+    elapsed = time.perf_counter() - started
+
+    result: Dict[str, Any] = {
+        "channels": channels,
+        "pages": pages,
+        "noise": noise,
+        "bit_errors": bit_errors,
+        "sample_rate": sample_rate,
+        "channel_rate": channel_rate,
+        "audio_seconds": round(samples / sample_rate, 2),
+        "fft_size": decoder.channelizer.fft_size,
+        "total": realtime(samples, sample_rate, elapsed),
+        "channelizer": realtime(
+            samples,
+            sample_rate,
+            time_channelizer(chunks, frequencies, sample_rate, channel_rate),
+        ),
+    }
+
+    result["per_channel"] = {}
+    for name, entry in plan.items():
+        decoded = [
+            (m.protocol, int(m.address), int(m.function), m.type, m.message)
+            for m in messages
+            if m.source == name
+        ]
+        result["per_channel"][name] = {
+            "frequency": entry["frequency"],
+            "baud": entry["baud"],
+            **score(decoded, expected(page_lists[name], entry["baud"])),
+        }
+
+    # Channelizer cost by channel count on the first two seconds
+    head = chunks[: max(1, (2 * sample_rate * 2) // max(1, len(chunks[0])))]
+    head_samples = sum(len(chunk) for chunk in head) // 2
+    result["scaling"] = {}
+    for count in range(1, len(OFFSETS) + 1):
+        subset = {
+            name: entry["frequency"] for name, entry in channel_plan(count).items()
+        }
+        result["scaling"][str(count)] = realtime(
+            head_samples,
+            sample_rate,
+            time_channelizer(head, subset, sample_rate, channel_rate),
+        )["realtime_factor"]
+
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Wideband channelizer benchmark")
+    parser.add_argument("--channels", type=int, default=4, help="1 to 6")
+    parser.add_argument("--pages", type=int, default=8, help="Pages per channel")
+    parser.add_argument("--noise", type=float, default=1.0, help="Noise / carrier")
+    parser.add_argument("--bit-errors", type=int, default=1, help="Per codeword")
+    parser.add_argument("--sample-rate", type=int, default=2400000)
+    parser.add_argument("--channel-rate", type=int, default=24000)
+    parser.add_argument("--json", action="store_true", help="Print JSON result")
+    args = parser.parse_args()
+
+    result = run(
+        args.channels,
+        args.pages,
+        args.noise,
+        args.bit_errors,
+        args.sample_rate,
+        args.channel_rate,
+    )
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    print(
+        f"{result['audio_seconds']} s at {args.sample_rate} S/s, "
+        f"FFT {result['fft_size']}, {args.channels} channels at {args.channel_rate} Hz"
+    )
+    for name in channel_plan(args.channels):
+        entry = result["per_channel"][name]
+        print(
+            f"{name}  {entry['frequency'] / 1e6:.4f} MHz  POCSAG{entry['baud']:<5} "
+            f"{entry['decoded']:>4}/{entry['pages']} pages ({entry['false']} false)"
+        )
+    for path in ("channelizer", "total"):
+        stats = result[path]
+        print(
+            f"{path:<12} {stats['msps']:>6.2f} MS/s  x{stats['realtime_factor']:.1f} "
+            f"real time  {stats['cores']:.3f} cores"
+        )
+    scaling = "  ".join(
+        f"{count}: x{factor:.1f}" for count, factor in result["scaling"].items()
+    )
+    print(f"channelizer by channel count (x real time per core): {scaling}")
+
+
+if __name__ == "__main__":
+    main()
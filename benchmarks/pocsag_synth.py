@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Synthetic POCSAG transmissions for decoder benchmarks.
+
+Encodes pages into POCSAG codewords (preamble, sync, batches, idle fill)
+and modulates them into the audio rtl_fm would output: NRZ FSK after the
+FM discriminator, signed 16 bit mono PCM. Optional bit errors per codeword
+and Gaussian noise exercise the BCH correction and the slicer.
+modulate_iq() builds wideband rtl_sdr test vectors: several FSK paging
+carriers in one u8 I/Q stream.
+
+Usage:
+    python3 benchmarks/pocsag_synth.py --baud 1200 --output pages.raw
+    python3 noxfeed.py --log console --replay pages.raw
+"""
+
+import argparse
+import os
+import random
+import sys
+from typing import Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from includes.decoder.bch import encode, SYNC_CODEWORD, IDLE_CODEWORD  # noqa: E402
+from includes.decoder.pocsag_decoder import NUMERIC_CHARS  # noqa: E402
+
+PREAMBLE_BITS = 576
+
+# (address, function, type, text); type is 'alpha', 'numeric' or 'tone'
+Page = Tuple[int, int, str, str]
+
+
+def content_bits(message_type: str, text: str) -> str:
+    """Message content as transmitted (characters LSB first), padded to 20 bits."""
+    if message_type == "alpha":
+        bits = "".join(f"{ord(char):07b}"[::-1] for char in text + "\x04")
+        pad = "0"
+    elif message_type == "numeric":
+        bits = "".join(f"{NUMERIC_CHARS.index(char):04b}"[::-1] for char in text)
+        pad = f"{NUMERIC_CHARS.index(' '):04b}"[::-1]
+    else:
+        return ""
+    while len(bits) % 20:
+        bits += pad[: 20 - len(bits) % 20]
+    return bits
+
+
+def encode_pages(pages: Sequence[Page]) -> List[int]:
+    """Codewords of all batches (without sync words), idle filled."""
+    codewords: List[int] = []
+    for address, function, message_type, text in pages:
+        # The address codeword must be sent in frame (address & 7)
+        while (len(codewords) % 16) // 2 != address & 7:
+            codewords.append(IDLE_CODEWORD)
+        codewords.append(encode(((address >> 3) << 2) | function))
+
+        bits = content_bits(message_type, text)
+        for offset in range(0, len(bits), 20):
+            codewords.append(encode((1 << 20) | int(bits[offset : offset + 20], 2)))
+
+    codewords.append(IDLE_CODEWORD)
+    while len(codewords) % 16:
+        codewords.append(IDLE_CODEWORD)
+    return codewords
+
+
+def transmission_bits(
+    pages: Sequence[Page], bit_errors: int = 0, seed: int = 1
+) -> np.ndarray:
+    """
+    Bit stream of one transmission: preamble, then sync + 16 codewords per batch.
+
+    Args:
+        pages: Pages to send
+        bit_errors: Bits flipped in every codeword (0-2 are correctable)
+        seed: Random seed for the error positions
+    """
+    rng = random.Random(seed)
+    words = []
+    codewords = encode_pages(pages)
+    for index, codeword in enumerate(codewords):
+        if index % 16 == 0:
+            words.append(SYNC_CODEWORD)
+        for bit in rng.sample(range(32), bit_errors):
+            codeword ^= 1 << bit
+        words.append(codeword)
+
+    bits = [(index + 1) % 2 for index in range(PREAMBLE_BITS)]
+    for word in words:
+        bits.extend((word >> (31 - bit)) & 1 for bit in range(32))
+    return np.array(bits, dtype=np.uint8)
+
+
+def modulate(
+    bits: np.ndarray,
+    baud: int,
+    sample_rate: int = 22050,
+    amplitude: float = 8000.0,
+    noise: float = 0.0,
+    dc_offset: float = 0.0,
+    invert: bool = False,
+    silence: float = 0.2,
+    seed: int = 1,
+) -> bytes:
+    """
+    Discriminator audio for a bit stream (1 = negative, like the lower FSK tone).
+
+    Args:
+        bits: Bits to send
+        baud: POCSAG baud rate
+        sample_rate: Output sample rate (rtl_fm -s)
+        amplitude: Peak level of the NRZ signal
+        noise: Gaussian noise level relative to amplitude
+        dc_offset: Constant offset relative to amplitude (tuning error)
+        invert: Swap the polarity
+        silence: Seconds of noise before and after the transmission
+        seed: Random seed for the noise
+    """
+    rng = np.random.default_rng(seed)
+    count = int(np.ceil(len(bits) * sample_rate / baud))
+    index = np.minimum((np.arange(count) * baud) // sample_rate, len(bits) - 1)
+    signal = np.where(bits[index] == 1, -amplitude, amplitude).astype(np.float64)
+    if invert:
+        signal = -signal
+
+    # Soften the edges like the receiver's audio filter would
+    width = max(1, int(sample_rate / baud / 4))
+    signal = np.convolve(signal, np.ones(width) / width, mode="same")
+
+    pad = np.zeros(int(silence * sample_rate))
+    signal = np.concatenate((pad, signal, pad))
+    signal += dc_offset * amplitude
+    if noise:
+        signal += rng.normal(0.0, noise * amplitude, len(signal))
+    return np.clip(signal, -32768, 32767).astype("<i2").tobytes()
+
+
+def modulate_iq(
+    carriers: Sequence[Tuple[float, np.ndarray, int]],
+    sample_rate: int = 2400000,
+    deviation: float = 4500.0,
+    level: float = 0.2,
+    noise: float = 0.0,
+    silence: float = 0.2,
+    chunk: int = 262144,
+    seed: int = 1,
+) -> Iterator[bytes]:
+    """
+    Wideband rtl_sdr output (interleaved u8 I/Q) with several paging carriers.
+
+    Each carrier is phase-continuous 2-FSK (1 = -deviation, like modulate())
+    and keyed for the whole stream. Generated in chunks, so long
+    transmissions at MS/s rates do not need gigabytes of memory.
+
+    Args:
+        carriers: (offset from the tuning frequency in Hz, bits, baud) per carrier
+        sample_rate: rtl_sdr sample rate
+        deviation: FM deviation in Hz
+        level: Amplitude of every carrier (full scale = 1)
+        noise: Complex Gaussian noise level relative to ``level``
+        silence: Seconds of unmodulated carrier before and after the bits
+        chunk: Samples per yielded chunk
+        seed: Random seed for the noise
+    """
+    rng = np.random.default_rng(seed)
+    lead = int(silence * sample_rate)
+    total = lead + max(
+        int(np.ceil(len(bits) * sample_rate / baud)) for _, bits, baud in carriers
+    )
+    total += lead
+    phases = np.zeros(len(carriers))
+
+    for start in range(0, total, chunk):
+        n = np.arange(start, min(total, start + chunk))
+        iq = np.zeros(len(n), dtype=np.complex128)
+        for index, (offset, bits, baud) in enumerate(carriers):
+            bit = (n - lead) * baud // sample_rate
+            keyed = (bit >= 0) & (bit < len(bits))
+            symbol = np.where(bits[np.clip(bit, 0, len(bits) - 1)] == 1, -1.0, 1.0)
+            frequency = offset + deviation * np.where(keyed, symbol, 0.0)
+            phase = phases[index] + 2 * np.pi * np.cumsum(frequency) / sample_rate
+            phases[index] = phase[-1] % (2 * np.pi)
+            iq += level * np.exp(1j * phase)
+        if noise:
+            iq += (noise * level / np.sqrt(2)) * (
+                rng.normal(size=len(n)) + 1j * rng.normal(size=len(n))
+            )
+
+        output = np.empty(2 * len(n), dtype=np.uint8)
+        output[0::2] = np.clip(np.round(iq.real * 127.5 + 127.5), 0, 255)
+        output[1::2] = np.clip(np.round(iq.imag * 127.5 + 127.5), 0, 255)
+        yield output.tobytes()
+
+
+def sample_pages(count: int, seed: int = 1) -> List[Page]:
+    """Mixed alpha, numeric and tone pages with random addresses."""
+    rng = random.Random(seed)
+    pages: List[Page] = []
+    for n in range(count):
+        address = rng.randrange(1, 1 << 21)
+        if n % 5 == 4:
+            pages.append((address, rng.randrange(4), "tone", ""))
+        elif n % 3 == 2:
+            digits = "".join(
+                rng.choice("0123456789") for _ in range(rng.randrange(3, 16))
+            )
+            pages.append((address, 0, "numeric", digits))
+        else:
+            pages.append(
+                (address, 3, "alpha", f"SYNTH {n:05d} Einsatz B2 Brandmeldeanlage")
+            )
+    return pages
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Synthetic POCSAG audio (s16le)")
+    parser.add_argument("--baud", type=int, default=1200, choices=(512, 1200, 2400))
+    parser.add_argument("--sample-rate", type=int, default=22050)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--noise", type=float, default=0.0)
+    parser.add_argument("--bit-errors", type=int, default=0)
+    parser.add_argument("--output", required=True, help="PCM output file")
+    args = parser.parse_args()
+
+    bits = transmission_bits(sample_pages(args.pages), args.bit_errors)
+    with open(args.output, "wb") as f:
+        f.write(modulate(bits, args.baud, args.sample_rate, noise=args.noise))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,729 @@
+#!/usr/bin/env python3
+"""
+NoxFeed benchmark suite.
+
+Runs against a local API stub (api_stub.py), so no server, RTL-SDR or
+network access is needed:
+
+    parser     multimon-ng lines/s (bench_parser.py)
+    decoder    native NumPy POCSAG decoder vs. multimon-ng on synthetic
+               audio: pages decoded, samples/s (bench_decoder.py)
+    wideband   rtl_sdr channelizer on synthetic multi-carrier I/Q: pages
+               decoded per channel, MS/s and cores per stream (bench_wideband.py)
+    autotune   gain/squelch auto-tuning against a simulated pipeline: pages
+               decoded tuned vs. fixed, restarts (bench_autotune.py)
+    storage    MessageStore appends/s and MB/s
+    api_send   LaravelAPIClient single POST and bulk POST throughput + latency
+    api_async  concurrent POSTs: LaravelAPIClient on a thread pool vs.
+               AsyncLaravelAPIClient and its SyncAPIFacade (needs aiohttp;
+               differences show with --latency-ms)
+    wire       HTTP bytes per message (single and bulk POSTs), plain vs.
+               gzip/zstd bodies and compact bulk format
+    websocket  /broadcasting/auth and client tracking round trips
+    e2e        line -> API acknowledgement latency through MessageHandler
+               and SendQueue (p50/p90/p99)
+
+The report is written as JSON. With --baseline, every metric is compared
+to a previous report and the exit code is 1 if one regressed by more than
+--tolerance.
+
+Usage:
+    python3 benchmarks/run_benchmarks.py --output report.json
+    python3 benchmarks/run_benchmarks.py --latency-ms 20 --failure-rate 0.01
+    python3 benchmarks/run_benchmarks.py --quick --baseline report.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.api_stub import ApiStub  # noqa: E402
+from benchmarks.bench_autotune import run as run_autotune  # noqa: E402
+from benchmarks.bench_decoder import run as run_decoder  # noqa: E402
+from benchmarks.bench_parser import DEFAULT_CORPUS  # noqa: E402
+from benchmarks.bench_parser import run as run_parser  # noqa: E402
+from benchmarks.bench_wideband import run as run_wideband  # noqa: E402
+from includes.api.async_api_client import aiohttp  # noqa: E402
+from includes.api.async_api_client import (  # noqa: E402
+    AsyncLaravelAPIClient,
+    SyncAPIFacade,
+)
+from includes.api.body_encoder import SUPPORTED_ENCODINGS  # noqa: E402
+from includes.api.laravel_api_client import LaravelAPIClient  # noqa: E402
+from includes.delivery import SendQueue  # noqa: E402
+from includes.handlers import MessageHandler, PocsagMessage  # noqa: E402
+from includes.realtime import LaravelWebSocketListener  # noqa: E402
+from includes.storage import MessageStore, StorageWriter  # noqa: E402
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """p50/p90/p99/max of latency samples (seconds) in milliseconds."""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def pick(q: float) -> float:
+        index = min(len(ordered) - 1, max(0, round(q * len(ordered)) - 1))
+        return round(ordered[index] * 1000, 3)
+
+    return {
+        "p50_ms": pick(0.50),
+        "p90_ms": pick(0.90),
+        "p99_ms": pick(0.99),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+def pocsag_line(n: int) -> str:
+    return (
+        f"POCSAG1200: Address: {1000000 + n % 500:7d}  Function: {n % 4}  "
+        f"Alpha:   BENCH {n:08d} Einsatz Brandmeldeanlage"
+    )
+
+
+def sample_message(n: int) -> Dict[str, Any]:
+    return {
+        "protocol": "POCSAG1200",
+        "address": str(1000000 + n % 500),
+        "function": str(n % 4),
+        "type": "alpha",
+        "message": f"BENCH {n:08d} Einsatz Brandmeldeanlage",
+        "timestamp": datetime.now().isoformat(),
+    }
+
+
+def make_client(stub: ApiStub) -> LaravelAPIClient:
+    # Short backoff: injected failures should cost retries, not sleeping
+    return LaravelAPIClient(
+        base_url=stub.base_url,
+        user="bench@example.com",
+        password="bench",
+        retry_delay=0.01,
+        max_retry_delay=0.1,
+    )
+
+
+def concurrent_result(
+    samples: List[float], errors: int, elapsed: float
+) -> Dict[str, Any]:
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "requests_per_sec": round(len(samples) / elapsed, 1),
+        **percentiles(samples),
+    }
+
+
+def timed_threads(
+    call: Callable[[Any], Any], items: List[Any], workers: int
+) -> Dict[str, Any]:
+    """Run call(item) for all items on a thread pool; throughput and latency."""
+    samples: List[float] = []
+    errors = 0
+
+    def run(item: Any) -> None:
+        nonlocal errors
+        t0 = time.perf_counter()
+        try:
+            call(item)
+        except Exception:
+            errors += 1
+        samples.append(time.perf_counter() - t0)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(workers) as pool:
+        list(pool.map(run, items))
+    return concurrent_result(samples, errors, time.perf_counter() - started)
+
+
+async def timed_tasks(call: Callable[[Any], Any], items: List[Any]) -> Dict[str, Any]:
+    """Await call(item) for all items at once; throughput and latency."""
+    samples: List[float] = []
+    errors = 0
+
+    async def run(item: Any) -> None:
+        nonlocal errors
+        t0 = time.perf_counter()
+        try:
+            await call(item)
+        except Exception:
+            errors += 1
+        samples.append(time.perf_counter() - t0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(run(item) for item in items))
+    return concurrent_result(samples, errors, time.perf_counter() - started)
+
+
+def timed(call: Callable[[], Any], count: int) -> Dict[str, Any]:
+    """Run call() count times; throughput and latency percentiles."""
+    samples = []
+    errors = 0
+    started = time.perf_counter()
+    for _ in range(count):
+        t0 = time.perf_counter()
+        try:
+            call()
+        except Exception:
+            errors += 1
+        samples.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": count,
+        "errors": errors,
+        "requests_per_sec": round(count / elapsed, 1),
+        **percentiles(samples),
+    }
+
+
+# ----------------------------------------------------------------------
+# Benchmarks
+# ----------------------------------------------------------------------
+
+
+def bench_parser(sizes: Dict[str, int]) -> Dict[str, Any]:
+    result = run_parser(DEFAULT_CORPUS, sizes["parser_lines"], sizes["parser_rounds"])
+    return {
+        "lines_per_sec": result["all"]["single_pass_lines_per_sec"],
+        "reject_lines_per_sec": result.get("reject", {}).get(
+            "single_pass_lines_per_sec"
+        ),
+        "legacy_speedup": result["all"]["speedup"],
+    }
+
+
+def bench_decoder(sizes: Dict[str, int]) -> Dict[str, Any]:
+    result = run_decoder(pages=sizes["decoder_pages"])
+    summary: Dict[str, Any] = {"multimon": result["multimon"]}
+    for key, entry in result.items():
+        if not key.startswith("pocsag"):
+            continue
+        for path in ("native", "multimon"):
+            if path in entry:
+                summary[f"{key}_{path}"] = {
+                    "decode_rate": entry[path]["decode_rate"],
+                    "samples_per_sec": entry[path]["samples_per_sec"],
+                    "realtime_factor": entry[path]["realtime_factor"],
+                }
+    return summary
+
+
+def bench_wideband(sizes: Dict[str, int]) -> Dict[str, Any]:
+    result = run_wideband(channels=4, pages=sizes["wideband_pages"])
+    summary: Dict[str, Any] = {
+        key: {
+            "msps": result[key]["msps"],
+            "realtime_factor": result[key]["realtime_factor"],
+        }
+        for key in ("channelizer", "total")
+    }
+    for name, entry in result["per_channel"].items():
+        summary[f"{name}_decode_rate"] = entry["decode_rate"]
+    return summary
+
+
+def bench_autotune(sizes: Dict[str, int]) -> Dict[str, Any]:
+    result = run_autotune(hours=sizes["autotune_hours"])
+    return {
+        name: {
+            key: result[name][key]
+            for key in ("decode_rate", "oracle_rate", "restarts", "downtime_share")
+        }
+        for name in ("fixed", "tuned")
+    }
+
+
+def bench_storage(sizes: Dict[str, int]) -> Dict[str, Any]:
+    count = sizes["storage_messages"]
+    messages = [sample_message(n) for n in range(count)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = MessageStore(directory)
+        started = time.perf_counter()
+        for message in messages:
+            store.append(message)
+        store.close()
+        elapsed = time.perf_counter() - started
+        written = sum(
+            os.path.getsize(os.path.join(directory, name))
+            for name in os.listdir(directory)
+        )
+
+    # Write-behind: cost seen by the decode loop, then until everything is on disk
+    with tempfile.TemporaryDirectory() as directory:
+        writer = StorageWriter(MessageStore(directory), fsync="interval")
+        writer.start()
+        started = time.perf_counter()
+        for message in messages:
+            writer.put(message)
+        enqueued = time.perf_counter() - started
+        writer.stop(timeout=60)
+        drained = time.perf_counter() - started
+
+    return {
+        "messages": count,
+        "appends_per_sec": round(count / elapsed, 1),
+        "mb_per_sec": round(written / elapsed / 1e6, 2),
+        "writer": {
+            "enqueue_per_sec": round(count / enqueued, 1),
+            "written_per_sec": round(count / drained, 1),
+            "batches": writer.batches,
+            "syncs": writer.syncs,
+        },
+    }
+
+
+def bench_api_send(stub: ApiStub, sizes: Dict[str, int]) -> Dict[str, Any]:
+    client = make_client(stub)
+    client.login()
+    handler = MessageHandler(
+        storage_dir=tempfile.mkdtemp(),
+        api_client=client,
+        api_endpoint="/message",
+        bulk_endpoint="/message/bulk",
+    )
+
+    count = sizes["api_requests"]
+    payloads = [
+        PocsagMessage.from_dict(sample_message(n)).to_api_payload()
+        for n in range(count)
+    ]
+    single_iter = iter(payloads)
+    single = timed(lambda: handler.post_payload(next(single_iter)), count)
+
+    batch_size = sizes["batch_size"]
+    batches = [payloads[i : i + batch_size] for i in range(0, count, batch_size)]
+    batch_iter = iter(batches)
+    bulk = timed(lambda: handler.post_batch(next(batch_iter)), len(batches))
+    bulk["batch_size"] = batch_size
+    bulk["messages_per_sec"] = round(bulk["requests_per_sec"] * batch_size, 1)
+
+    handler.close()
+    # Login and all requests should share one keep-alive connection
+    return {
+        "single": single,
+        "bulk": bulk,
+        "connections": client.stats()["connections"],
+    }
+
+
+def bench_api_async(stub: ApiStub, sizes: Dict[str, int]) -> Dict[str, Any]:
+    """Same POSTs, api_concurrency at a time: threads vs. one event loop."""
+    if aiohttp is None:
+        return {"skipped": "aiohttp not installed"}
+
+    count = sizes["api_requests"]
+    concurrency = sizes["api_concurrency"]
+    payloads = [
+        PocsagMessage.from_dict(sample_message(n)).to_api_payload()
+        for n in range(count)
+    ]
+    options = dict(
+        base_url=stub.base_url,
+        user="bench@example.com",
+        password="bench",
+        retry_delay=0.01,
+        max_retry_delay=0.1,
+    )
+
+    client = LaravelAPIClient(pool_size=concurrency, **options)
+    client.login()
+    sync = timed_threads(
+        lambda payload: client.post("/message", payload), payloads, concurrency
+    )
+    sync["connections"] = client.stats()["connections"]
+    client.close()
+
+    # Coroutines awaited directly (no thread per request)
+    async_client = AsyncLaravelAPIClient(concurrency=concurrency, **options)
+    facade = SyncAPIFacade(async_client)
+    facade.login()
+    native = facade.submit(
+        timed_tasks(lambda payload: async_client.post("/message", payload), payloads)
+    ).result()
+    native["connections"] = async_client.stats()["connections"]
+
+    # Existing synchronous callers (send queue workers) through the facade
+    threaded = timed_threads(
+        lambda payload: facade.post("/message", payload), payloads, concurrency
+    )
+    threaded["connections"] = async_client.stats()["connections"]
+    facade.close()
+
+    return {
+        "concurrency": concurrency,
+        "sync_threads": sync,
+        "async": native,
+        "facade_threads": threaded,
+    }
+
+
+def bench_wire(stub: ApiStub, sizes: Dict[str, int]) -> Dict[str, Any]:
+    """Bytes on the wire per message for each body encoding."""
+    # Recorded pages: realistic texts compress far worse than sample_message()
+    with tempfile.TemporaryDirectory() as directory:
+        parser = MessageHandler(storage_dir=directory)
+        with open(DEFAULT_CORPUS, encoding="utf-8", errors="replace") as corpus:
+            pages = [parser.parse_pocsag_line(line) for line in corpus]
+        parser.close()
+    pages = [page.to_api_payload() for page in pages if page]
+    count = sizes["wire_messages"]
+    payloads = [pages[n % len(pages)] for n in range(count)]
+    batch_size = sizes["batch_size"]
+    batches = [payloads[i : i + batch_size] for i in range(0, count, batch_size)]
+
+    def measure(compression: str, compact: bool, bulk: bool) -> Dict[str, Any]:
+        client = LaravelAPIClient(
+            base_url=stub.base_url,
+            user="bench@example.com",
+            password="bench",
+            compression=compression,
+        )
+        client.login()
+        handler = MessageHandler(
+            storage_dir=tempfile.mkdtemp(),
+            api_client=client,
+            api_endpoint="/message",
+            bulk_endpoint="/message/bulk" if bulk else None,
+            compact_batches=compact,
+        )
+        started = time.perf_counter()
+        if bulk:
+            for batch in batches:
+                handler.post_batch(batch)
+        else:
+            for payload in payloads:
+                handler.post_payload(payload)
+        elapsed = time.perf_counter() - started
+        delivery = handler.stats()
+        handler.close()
+        client.close()
+        return {
+            "messages_per_sec": round(count / elapsed, 1),
+            "sent_bytes_per_message": delivery["sent_bytes_per_message"],
+            "bytes_per_message": delivery["bytes_per_message"],
+            "body_ratio": client.encoder.stats()["ratio"],
+        }
+
+    results: Dict[str, Any] = {}
+    for compression in ("off",) + SUPPORTED_ENCODINGS:
+        # Single bodies are below compression_min_bytes; the compact
+        # format only applies to bulk bodies
+        results[compression] = {
+            "single": measure(compression, False, False),
+            "bulk": measure(compression, False, True),
+            "bulk_compact": measure(compression, True, True),
+        }
+    return results
+
+
+def bench_websocket(stub: ApiStub, sizes: Dict[str, int]) -> Dict[str, Any]:
+    client = make_client(stub)
+    client.login()
+    listener = LaravelWebSocketListener(
+        app_key="bench",
+        channel="private-config",
+        event_name="config.updated",
+        on_event=lambda payload: None,
+        api_client=client,
+        host="127.0.0.1",
+    )
+
+    count = sizes["websocket_requests"]
+    return {
+        "channel_auth": timed(
+            lambda: listener._get_channel_auth("1234.5678", "private-config"), count
+        ),
+        "track_client": timed(lambda: listener._track_noxfeed_client(), count),
+        "connections": client.stats()["connections"],
+    }
+
+
+def bench_e2e(stub: ApiStub, sizes: Dict[str, int]) -> Dict[str, Any]:
+    """Line handed to process_line() -> 2xx response received."""
+    client = make_client(stub)
+    client.login()
+
+    started_at: Dict[str, float] = {}
+    latencies: List[float] = []
+    lock = threading.Lock()
+
+    with tempfile.TemporaryDirectory() as directory:
+        handler = MessageHandler(
+            storage_dir=directory,
+            api_client=client,
+            api_endpoint="/message",
+            bulk_endpoint="/message/bulk",
+        )
+
+        def acked(messages) -> None:
+            now = time.perf_counter()
+            with lock:
+                for message in messages:
+                    latencies.append(now - started_at[message.message])
+
+        def sender(item) -> bool:
+            ok = handler.deliver(item)
+            if ok:
+                acked([item])
+            return ok
+
+        def batch_sender(items) -> bool:
+            ok = handler.deliver_many(items)
+            if ok:
+                acked(items)
+            return ok
+
+        handler.send_queue = SendQueue(
+            sender=sender,
+            max_size=sizes["e2e_lines"],
+            workers=2,
+            batch_sender=batch_sender,
+            batch_size=sizes["batch_size"],
+            batch_linger=0.01,
+            sizer=handler.estimate_size,
+            name="bench",
+        )
+        handler.send_queue.start()
+
+        count = sizes["e2e_lines"]
+        interval = 1.0 / sizes["e2e_rate"] if sizes["e2e_rate"] else 0.0
+        started = time.perf_counter()
+        for n in range(count):
+            line = pocsag_line(n)
+            started_at[line.split("Alpha:", 1)[1].strip()] = time.perf_counter()
+            handler.process_line(line)
+            if interval:
+                delay = started + (n + 1) * interval - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+        handler.send_queue.stop(timeout=60)
+        elapsed = time.perf_counter() - started
+        handler.close()
+
+    return {
+        "lines": count,
+        "acked": len(latencies),
+        "offered_rate": sizes["e2e_rate"],
+        "lines_per_sec": round(count / elapsed, 1),
+        **percentiles(latencies),
+    }
+
+
+# ----------------------------------------------------------------------
+# Report
+# ----------------------------------------------------------------------
+
+
+def flatten(data: Dict[str, Any], prefix: str = "") -> Dict[str, float]:
+    flat = {}
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare(
+    results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float
+) -> List[Dict[str, Any]]:
+    """Metrics that got worse than the baseline by more than tolerance."""
+    current = flatten(results)
+    regressions = []
+    for name, before in flatten(baseline).items():
+        after = current.get(name)
+        if after is None or not before:
+            continue
+        if name.endswith("_per_sec"):
+            change = (after - before) / before
+            worse = change < -tolerance
+        elif name.endswith("_ms"):
+            change = (after - before) / before
+            worse = change > tolerance
+        else:
+            continue
+        if worse:
+            regressions.append(
+                {
+                    "metric": name,
+                    "baseline": before,
+                    "current": after,
+                    "change": round(change, 3),
+                }
+            )
+    return regressions
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+SIZES = {
+    "parser_lines": 200000,
+    "parser_rounds": 5,
+    "decoder_pages": 100,
+    "wideband_pages": 8,
+    "autotune_hours": 24,
+    "storage_messages": 50000,
+    "api_requests": 2000,
+    "websocket_requests": 200,
+    "api_concurrency": 16,
+    "wire_messages": 1000,
+    "batch_size": 50,
+    "e2e_lines": 2000,
+    "e2e_rate": 500,
+}
+
+QUICK_SIZES = {
+    "parser_lines": 20000,
+    "parser_rounds": 2,
+    "decoder_pages": 20,
+    "wideband_pages": 3,
+    "autotune_hours": 6,
+    "storage_messages": 5000,
+    "api_requests": 200,
+    "websocket_requests": 20,
+    "api_concurrency": 16,
+    "wire_messages": 200,
+    "batch_size": 50,
+    "e2e_lines": 200,
+    "e2e_rate": 500,
+}
+
+BENCHMARKS = (
+    "parser",
+    "decoder",
+    "wideband",
+    "autotune",
+    "storage",
+    "api_send",
+    "api_async",
+    "wire",
+    "websocket",
+    "e2e",
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="NoxFeed benchmark suite")
+    parser.add_argument("--output", default="benchmark-report.json", help="Report path")
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, help="Run a subset")
+    parser.add_argument("--quick", action="store_true", help="Small sample sizes")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Stub latency")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Stub jitter")
+    parser.add_argument(
+        "--failure-rate", type=float, default=0.0, help="Share of failed requests"
+    )
+    parser.add_argument("--e2e-rate", type=float, help="Offered lines/s (0 = max)")
+    parser.add_argument("--baseline", help="Previous report to compare against")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.10, help="Allowed regression (0.10 = 10%%)"
+    )
+    args = parser.parse_args()
+
+    sizes = dict(QUICK_SIZES if args.quick else SIZES)
+    if args.e2e_rate is not None:
+        sizes["e2e_rate"] = args.e2e_rate
+    selected = args.only or BENCHMARKS
+
+    stub = ApiStub(
+        latency=args.latency_ms / 1000.0,
+        jitter=args.jitter_ms / 1000.0,
+        failure_rate=args.failure_rate,
+    ).start()
+
+    results: Dict[str, Any] = {}
+    try:
+        for name in selected:
+            print(f"Running {name}...", file=sys.stderr)
+            if name == "parser":
+                results[name] = bench_parser(sizes)
+            elif name == "decoder":
+                results[name] = bench_decoder(sizes)
+            elif name == "wideband":
+                results[name] = bench_wideband(sizes)
+            elif name == "autotune":
+                results[name] = bench_autotune(sizes)
+            elif name == "storage":
+                results[name] = bench_storage(sizes)
+            elif name == "api_send":
+                results[name] = bench_api_send(stub, sizes)
+            elif name == "api_async":
+                results[name] = bench_api_async(stub, sizes)
+            elif name == "wire":
+                results[name] = bench_wire(stub, sizes)
+            elif name == "websocket":
+                results[name] = bench_websocket(stub, sizes)
+            elif name == "e2e":
+                results[name] = bench_e2e(stub, sizes)
+    finally:
+        stub_stats = stub.stats()
+        stub.stop()
+
+    report = {
+        "meta": {
+            "created_at": datetime.now().isoformat(),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sizes": sizes,
+            "stub": {
+                "latency_ms": args.latency_ms,
+                "jitter_ms": args.jitter_ms,
+                "failure_rate": args.failure_rate,
+                **stub_stats,
+            },
+        },
+        "results": results,
+    }
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline.get("results", {}), args.tolerance)
+        report["regressions"] = regressions
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print(json.dumps(results, indent=2))
+    print(f"Report written to {args.output}", file=sys.stderr)
+
+    if regressions:
+        for regression in regressions:
+            print(
+                "REGRESSION {metric}: {baseline} -> {current} ({change:+.1%})".format(
+                    **regression
+                ),
+                file=sys.stderr,
+            )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,23 @@
 from .laravel_api_client import LaravelAPIClient
+from .async_api_client import AsyncLaravelAPIClient, SyncAPIFacade
+from .circuit_breaker import CircuitBreaker
+from .body_encoder import BodyEncoder
+from .connection_pool import ConnectionStats, PooledAdapter, TrafficStats
+from .errors import CircuitOpenError
 from .data_api import DataAPI
 from .logging_api import LoggingAPI
 from .configuration_api import ConfigurationAPI
 
 __all__ = [
     "LaravelAPIClient",
+    "AsyncLaravelAPIClient",
+    "SyncAPIFacade",
+    "CircuitBreaker",
+    "BodyEncoder",
+    "ConnectionStats",
+    "PooledAdapter",
+    "TrafficStats",
+    "CircuitOpenError",
     "DataAPI",
     "LoggingAPI",
     "ConfigurationAPI",
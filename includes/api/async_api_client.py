@@ -0,0 +1,892 @@
+import asyncio
+import concurrent.futures
+import random
+import threading
+import time
+import requests
+from requests.structures import CaseInsensitiveDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit
+import logging
+
+try:
+    import aiohttp
+except ImportError:  # Optional: only the asyncio API client needs aiohttp
+    aiohttp = None
+
+from .body_encoder import BodyEncoder
+from .circuit_breaker import CircuitBreaker
+from .connection_pool import ConnectionStats, TrafficStats
+from .laravel_api_client import (
+    IDEMPOTENT_METHODS,
+    POST_RETRY_STATUS_CODES,
+    REFRESH_RETRY_INTERVAL,
+    RETRY_STATUS_CODES,
+    LaravelAPIClient,
+)
+
+T = TypeVar("T")
+
+
+class AsyncLaravelAPIClient:
+    """
+    asyncio counterpart of LaravelAPIClient (requires aiohttp).
+
+    Same authentication, renewal, retry and circuit breaker rules as the
+    synchronous client, and the same ``on_token_updated`` callback, but
+    requests are coroutines: many can be in flight over one keep-alive
+    connection pool without a thread each. At most ``concurrency``
+    requests run at a time; the pool keeps up to as many connections open.
+
+    Responses are returned as ``requests.Response`` objects and errors
+    raised as ``requests`` exceptions (ConnectionError, Timeout,
+    HTTPError, CircuitOpenError), so callers handle both clients alike.
+
+    All coroutines must run in one event loop; the aiohttp session is
+    created on first use in that loop. SyncAPIFacade provides that loop
+    for synchronous callers.
+
+    Usage:
+        client = AsyncLaravelAPIClient(
+            base_url="https://api.example.com",
+            user="user@example.com",
+            password="password",
+            concurrency=16,
+        )
+        results = await asyncio.gather(
+            *(client.post("/message", payload) for payload in payloads)
+        )
+        await client.close()
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_token: Optional[str] = None,
+        token_expires_at: Optional[str] = None,
+        user: Optional[str] = None,
+        password: Optional[str] = None,
+        timeout: float = 30.0,
+        connect_timeout: float = 5.0,
+        max_retries: int = 3,
+        retry_delay: float = 5.0,
+        max_retry_delay: float = 60.0,
+        circuit_failures: int = 5,
+        circuit_reset: float = 30.0,
+        concurrency: int = 16,
+        refresh_before: float = 7200.0,
+        compression: str = "off",
+        compression_min_bytes: int = 256,
+        logger: Optional[logging.Logger] = None,
+    ):
+        """
+        Initializes the API client.
+
+        Args:
+            base_url: Base URL of the Laravel API (e.g. 'https://api.example.com')
+            api_token: Optional bearer token for authentication
+            token_expires_at: Optional ISO 8601 expiry of ``api_token``
+            user: Optional username/email for login authentication
+            password: Optional password for login authentication
+            timeout: Read timeout in seconds
+            connect_timeout: Connect timeout in seconds
+            max_retries: Retries per request (0 = none)
+            retry_delay: Backoff before the first retry in seconds, doubled per retry
+            max_retry_delay: Upper bound for one backoff or Retry-After wait;
+                a longer Retry-After is not waited for
+            circuit_failures: Failed requests in a row that open the circuit (0 = never)
+            circuit_reset: Seconds the circuit stays open before a probe request
+            concurrency: Requests in flight at a time (and pooled connections);
+                further requests wait
+            refresh_before: The refresh task renews the token this many
+                seconds before it expires
+            compression: Request body compression: 'off', 'auto' (when the
+                server lists the coding in Accept-Encoding), 'gzip' or 'zstd'
+            compression_min_bytes: Smaller bodies are sent uncompressed
+            logger: Optional logger instance
+
+        Raises:
+            RuntimeError: If aiohttp is not installed
+            ValueError: If the compression mode is unknown or unavailable
+        """
+        if aiohttp is None:
+            raise RuntimeError(
+                "The asyncio API client requires aiohttp (pip install aiohttp)"
+            )
+
+        self.base_url = base_url.rstrip("/")
+        self.user = user
+        self.password = password
+        self.timeout = (connect_timeout, timeout)
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.concurrency = max(1, concurrency)
+        self.circuit = CircuitBreaker(
+            circuit_failures, circuit_reset, name=self.base_url, logger=logger
+        )
+        self.connection_stats = ConnectionStats()
+        self.encoder = BodyEncoder(compression, compression_min_bytes, logger=logger)
+        self.traffic = TrafficStats()
+        self.logger = logger
+        self.refresh_before = refresh_before
+        self.token: Optional[str] = None
+        self.token_expires_at: Optional[datetime] = None
+
+        # Called with (token, expires_at) after a login or renewal
+        self.on_token_updated: Optional[Callable[[str, Optional[datetime]], None]] = (
+            None
+        )
+
+        # Created in the event loop on first use
+        self._session: Optional["aiohttp.ClientSession"] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        # Login/renewal run one at a time; waiting tasks reuse the result
+        self._auth_lock: Optional[asyncio.Lock] = None
+        self._token_changed: Optional[asyncio.Event] = None
+        self._refresh_task: Optional["asyncio.Task[None]"] = None
+        self._in_flight = 0
+
+        # Counters
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.logins = 0
+        self.renewals = 0
+        self.max_in_flight = 0
+
+        if api_token:
+            self.set_token(api_token, token_expires_at)
+
+    # ------------------------------------------------------------------
+    # Session
+    # ------------------------------------------------------------------
+
+    def _setup(self) -> "aiohttp.ClientSession":
+        """Session, semaphore and locks, bound to the running event loop."""
+        if self._session is not None and not self._session.closed:
+            return self._session
+
+        # Time every new connection (DNS, TCP, TLS) like PooledAdapter
+        trace = aiohttp.TraceConfig()
+
+        async def connect_started(session, context, params) -> None:
+            context.started = time.monotonic()
+
+        async def connect_finished(session, context, params) -> None:
+            self.connection_stats.record(time.monotonic() - context.started)
+
+        trace.on_connection_create_start.append(connect_started)
+        trace.on_connection_create_end.append(connect_finished)
+
+        connect_timeout, read_timeout = self.timeout
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=self.concurrency, limit_per_host=self.concurrency
+            ),
+            timeout=aiohttp.ClientTimeout(
+                connect=connect_timeout, sock_read=read_timeout
+            ),
+            headers={"Accept": "application/json"},
+            trace_configs=[trace],
+        )
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._auth_lock = asyncio.Lock()
+        self._token_changed = asyncio.Event()
+        return self._session
+
+    def _headers(self, authorized: bool = True) -> Dict[str, str]:
+        if authorized and self.token:
+            return {"Authorization": f"Bearer {self.token}"}
+        return {}
+
+    async def _fetch(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict] = None,
+        json: Any = None,
+        data: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Any = None,
+        endpoint: Optional[str] = None,
+    ) -> requests.Response:
+        """
+        One HTTP exchange, as a requests.Response.
+
+        Its bytes are counted in ``traffic`` under ``endpoint`` (default:
+        the URL path).
+
+        Raises:
+            requests.ConnectTimeout: If no connection could be opened in time
+            requests.Timeout: If the server did not answer in time
+            requests.ConnectionError: On other connection errors
+        """
+        session = self._setup()
+        options: Dict[str, Any] = {}
+        if timeout is not None:
+            if isinstance(timeout, tuple):
+                connect_timeout, read_timeout = timeout
+            else:
+                connect_timeout = read_timeout = timeout
+            options["timeout"] = aiohttp.ClientTimeout(
+                connect=connect_timeout, sock_read=read_timeout
+            )
+
+        self.requests += 1
+        async with self._slots:
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+            try:
+                async with session.request(
+                    method,
+                    url,
+                    params=params,
+                    json=json,
+                    data=data,
+                    headers=headers,
+                    allow_redirects=False,
+                    **options,
+                ) as reply:
+                    body = await reply.read()
+            except getattr(aiohttp, "ConnectionTimeoutError", ()) as e:
+                raise requests.ConnectTimeout(f"{method} {url}: {e}") from e
+            except asyncio.TimeoutError as e:
+                raise requests.Timeout(f"{method} {url}: read timed out") from e
+            except aiohttp.ClientError as e:
+                raise requests.ConnectionError(f"{method} {url}: {e}") from e
+            finally:
+                self._in_flight -= 1
+
+        response = requests.Response()
+        response.status_code = reply.status
+        response.reason = reply.reason
+        response.url = str(reply.url)
+        response.headers = CaseInsensitiveDict(reply.headers)
+        response.encoding = reply.charset
+        response._content = body
+
+        sent = reply.request_info.headers
+        self.encoder.negotiate(response.headers)
+        self.traffic.record(
+            endpoint or urlsplit(url).path,
+            TrafficStats.request_size(
+                method, url, sent, int(sent.get("Content-Length") or 0)
+            ),
+            TrafficStats.response_size(
+                reply.status, reply.reason, reply.headers, len(body)
+            ),
+        )
+        return response
+
+    # ------------------------------------------------------------------
+    # Authentication
+    # ------------------------------------------------------------------
+
+    def set_token(self, token: str, expires_at: Optional[str] = None) -> None:
+        """
+        Set or update the bearer token.
+
+        Args:
+            token: Bearer token string
+            expires_at: Optional ISO 8601 datetime string for token expiry
+        """
+        self.token = token
+        if expires_at:
+            try:
+                self.token_expires_at = datetime.fromisoformat(
+                    expires_at.replace("Z", "+00:00")
+                )
+            except (ValueError, AttributeError):
+                self.token_expires_at = None
+                if self.logger:
+                    self.logger.warning("Failed to parse token expiry: %s", expires_at)
+        # Reschedule the refresh task
+        if self._token_changed is not None:
+            self._token_changed.set()
+
+    async def _authenticate(self, endpoint: str, body: Any) -> Dict[str, Any]:
+        response = await self._fetch(
+            "POST",
+            f"{self.base_url}{endpoint}",
+            json=body,
+            headers=self._headers(authorized=body is None),
+            timeout=self.timeout,
+            endpoint=endpoint,
+        )
+        response.raise_for_status()
+        data = response.json()
+
+        # Update token and expiry
+        self.set_token(data.get("token"), data.get("expires_at"))
+
+        # Callback for token updates (can be used to persist token)
+        if self.on_token_updated:
+            self.on_token_updated(self.token, self.token_expires_at)
+        return data
+
+    async def login(self, token_name: str = "python-client") -> Dict[str, Any]:
+        """
+        Authenticate with username/password and obtain a bearer token.
+
+        Args:
+            token_name: Name for the generated token
+
+        Returns:
+            Login response with token, expires_at, and user info
+
+        Raises:
+            ValueError: If user/password not configured
+            requests.HTTPError: If authentication fails
+        """
+        self._setup()
+        async with self._auth_lock:
+            return await self._login(token_name)
+
+    async def _login(self, token_name: str = "python-client") -> Dict[str, Any]:
+        if not self.user or not self.password:
+            raise ValueError("User and password must be configured for login")
+
+        if self.logger:
+            self.logger.info("Authenticating with API as %s", self.user)
+
+        data = await self._authenticate(
+            "/auth/token",
+            {"user": self.user, "password": self.password, "token_name": token_name},
+        )
+        self.logins += 1
+
+        if self.logger:
+            self.logger.info(
+                "Successfully authenticated. Token expires at: %s",
+                self.token_expires_at,
+            )
+        return data
+
+    async def renew_token(self) -> Dict[str, Any]:
+        """
+        Renew the current bearer token before it expires.
+
+        Returns:
+            Renewal response with new token and expiry
+
+        Raises:
+            requests.HTTPError: If renewal fails
+        """
+        self._setup()
+        async with self._auth_lock:
+            return await self._renew_token()
+
+    async def _renew_token(self) -> Dict[str, Any]:
+        if self.logger:
+            self.logger.info("Renewing authentication token")
+
+        data = await self._authenticate("/auth/renew", None)
+        self.renewals += 1
+
+        if self.logger:
+            self.logger.info(
+                "Token renewed successfully. New expiry: %s", self.token_expires_at
+            )
+        return data
+
+    def is_token_expired(self, buffer_seconds: int = 3600) -> bool:
+        """
+        Check if the token is expired or will expire soon.
+
+        Args:
+            buffer_seconds: Renew token if it expires within this many seconds (default: 1 hour)
+
+        Returns:
+            True if token is missing, expired, or expires within buffer time
+        """
+        if not self.token or not self.token_expires_at:
+            return True
+
+        now = datetime.now(self.token_expires_at.tzinfo)
+        return self.token_expires_at <= now + timedelta(seconds=buffer_seconds)
+
+    async def ensure_authenticated(self, buffer_seconds: int = 3600) -> None:
+        """
+        Ensure we have a valid authentication token.
+        Logs in if no token exists, or renews if token is expired/expiring soon.
+
+        Single flight: if several tasks find the token expiring, one renews
+        it while the others wait and then use the new token.
+
+        Args:
+            buffer_seconds: Renew if the token expires within this many seconds
+
+        Raises:
+            ValueError: If authentication is not configured
+            requests.HTTPError: If authentication fails
+        """
+        if not self.is_token_expired(buffer_seconds):
+            return
+        self._setup()
+        async with self._auth_lock:
+            # Renewed by another task while this one waited
+            if not self.is_token_expired(buffer_seconds):
+                return
+            if not self.token:
+                await self._login()
+                return
+            try:
+                await self._renew_token()
+            except requests.HTTPError as e:
+                # If renewal fails (e.g., token already expired), try login
+                if self.logger:
+                    self.logger.warning(
+                        "Token renewal failed (%s), attempting fresh login", e
+                    )
+                await self._login()
+
+    async def start_token_refresh(self) -> None:
+        """
+        Renew the token in a background task ``refresh_before`` seconds
+        before it expires, so no request has to wait for a renewal.
+        """
+        if self._refresh_task and not self._refresh_task.done():
+            return
+        self._setup()
+        self._refresh_task = asyncio.get_running_loop().create_task(
+            self._refresh_loop()
+        )
+
+    def _refresh_delay(self) -> Optional[float]:
+        """Seconds until the next renewal (None = wait for a token)."""
+        if not self.token or not self.token_expires_at:
+            # Unknown expiry: authenticate now if we can
+            return 0.0 if self.user and self.password else None
+        now = datetime.now(self.token_expires_at.tzinfo)
+        renew_at = self.token_expires_at - timedelta(seconds=self.refresh_before)
+        return (renew_at - now).total_seconds()
+
+    async def _wait_token_changed(self, delay: Optional[float]) -> bool:
+        try:
+            await asyncio.wait_for(self._token_changed.wait(), delay)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            self._token_changed.clear()
+            delay = self._refresh_delay()
+            if delay is None or delay > 0:
+                # Woken early by a new token (login, renewal, set_token)
+                if await self._wait_token_changed(delay):
+                    continue
+
+            try:
+                await self.ensure_authenticated(buffer_seconds=self.refresh_before)
+            except Exception as e:
+                if self.logger:
+                    self.logger.warning(
+                        "Background token refresh failed, retrying in %.0fs: %s",
+                        REFRESH_RETRY_INTERVAL,
+                        e,
+                    )
+            else:
+                delay = self._refresh_delay()
+                if delay is None or delay > 0:
+                    continue
+            # Failed, or the new token is already due (short lifetime)
+            await asyncio.sleep(REFRESH_RETRY_INTERVAL)
+
+    async def close(self) -> None:
+        """Cancel the refresh task and close the connection pool."""
+        if self._refresh_task and not self._refresh_task.done():
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+        if self._session is not None:
+            await self._session.close()
+
+    # ------------------------------------------------------------------
+    # Transport
+    # ------------------------------------------------------------------
+
+    async def request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        data: Optional[Dict[str, Any]] = None,
+        idempotent: Optional[bool] = None,
+    ) -> Dict[str, Any]:
+        """
+        Send a request through the transport layer.
+
+        Retries and circuit breaker as LaravelAPIClient.request().
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint
+            params: Optional query parameters
+            data: Optional JSON body
+            idempotent: Override the retry rules of the method
+
+        Returns:
+            JSON response as a dictionary
+
+        Raises:
+            CircuitOpenError: If the circuit breaker is open
+            requests.RequestException: If the request fails
+        """
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+
+        self.circuit.before_call()
+        try:
+            # Ensure we have a valid token if user/password configured
+            if self.user and self.password:
+                await self.ensure_authenticated()
+            response = await self._send(method, endpoint, params, data, idempotent)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            self.failures += 1
+            self.circuit.record_failure(e)
+            raise
+        except requests.HTTPError as e:
+            # Login/renewal failed
+            self._record_status(getattr(e.response, "status_code", 0), e)
+            raise
+        except BaseException:
+            self.circuit.release()
+            raise
+
+        self._record_status(response.status_code, response.reason)
+        response.raise_for_status()
+        return response.json()
+
+    def _record_status(self, status: int, reason: Any) -> None:
+        if status >= 500:
+            self.failures += 1
+            self.circuit.record_failure(f"HTTP {status} {reason}")
+        elif status == 429 or not status:
+            # Alive but busy: neither closes nor opens the circuit
+            self.circuit.release()
+        else:
+            self.circuit.record_success()
+
+    async def _send(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict],
+        data: Optional[Dict[str, Any]],
+        idempotent: bool,
+    ) -> requests.Response:
+        url = f"{self.base_url}{endpoint}"
+        retry_codes = RETRY_STATUS_CODES if idempotent else POST_RETRY_STATUS_CODES
+        body, headers = self.encoder.encode(data) if data is not None else (None, {})
+        attempt = 0
+        while True:
+            try:
+                response = await self._fetch(
+                    method,
+                    url,
+                    params=params,
+                    data=body,
+                    headers={**self._headers(), **headers},
+                    endpoint=endpoint,
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                # A connect timeout never reached the server
+                if attempt >= self.max_retries or not (
+                    idempotent or isinstance(e, requests.ConnectTimeout)
+                ):
+                    raise
+                delay = self._backoff(attempt)
+                cause: Any = e
+            else:
+                if response.status_code == 415 and "Content-Encoding" in headers:
+                    # Compressed body refused (and not processed): resend plain
+                    self.encoder.reject()
+                    body, headers = self.encoder.encode(data, compress=False)
+                    continue
+                if (
+                    response.status_code not in retry_codes
+                    or attempt >= self.max_retries
+                ):
+                    return response
+                delay = LaravelAPIClient._retry_after(response)
+                if delay is None:
+                    delay = self._backoff(attempt)
+                elif delay > self.max_retry_delay:
+                    # Not worth waiting for; the caller retries later
+                    return response
+                cause = f"HTTP {response.status_code}"
+
+            attempt += 1
+            self.retries += 1
+            if self.logger:
+                self.logger.warning(
+                    "%s %s failed (%s), retry %d/%d in %.1fs",
+                    method,
+                    endpoint,
+                    cause,
+                    attempt,
+                    self.max_retries,
+                    delay,
+                )
+            await asyncio.sleep(delay)
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with jitter (half fixed, half random)."""
+        delay = min(self.max_retry_delay, self.retry_delay * 2**attempt)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    async def raw_request(
+        self,
+        method: str,
+        url: str,
+        json: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Any = None,
+    ) -> requests.Response:
+        """
+        Send a request through the shared connection pool, without retries.
+
+        Args:
+            method: HTTP method
+            url: Absolute URL, or an endpoint relative to ``base_url``
+            json: Optional JSON body
+            headers: Headers replacing the default Authorization header
+            timeout: Seconds or (connect, read) tuple (default: client timeouts)
+
+        Returns:
+            The response, whatever its status
+        """
+        endpoint = url if url.startswith("/") else urlsplit(url).path
+        if url.startswith("/"):
+            url = f"{self.base_url}{url}"
+        return await self._fetch(
+            method,
+            url,
+            json=json,
+            headers=headers if headers is not None else self._headers(),
+            timeout=timeout,
+            endpoint=endpoint,
+        )
+
+    async def warm_up(self) -> bool:
+        """
+        Open the first pooled connection (DNS, TCP, TLS) before it is needed.
+
+        Returns:
+            True if the server answered (any status), False on a connection error
+        """
+        started = time.monotonic()
+        try:
+            await self._fetch("HEAD", self.base_url, timeout=self.timeout, endpoint="/")
+        except requests.RequestException as e:
+            if self.logger:
+                self.logger.warning("API connection warm-up failed: %s", e)
+            return False
+        if self.logger:
+            self.logger.info(
+                "API connection warmed up in %.0f ms",
+                (time.monotonic() - started) * 1000,
+            )
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "failures": self.failures,
+            "logins": self.logins,
+            "renewals": self.renewals,
+            "concurrency": self.concurrency,
+            "max_in_flight": self.max_in_flight,
+            "circuit": self.circuit.stats(),
+            # Connections opened; in steady state this stops growing
+            **self.connection_stats.stats(),
+            "compression": self.encoder.stats(),
+            "traffic": self.traffic.stats(),
+        }
+
+    async def get(self, endpoint: str, params: Optional[Dict] = None) -> Dict[str, Any]:
+        """GET request to the API; returns the JSON response."""
+        return await self.request("GET", endpoint, params=params)
+
+    async def post(self, endpoint: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """POST request to the API; returns the JSON response."""
+        return await self.request("POST", endpoint, data=data)
+
+    async def put(self, endpoint: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """PUT request to the API; returns the JSON response."""
+        return await self.request("PUT", endpoint, data=data)
+
+    async def delete(self, endpoint: str) -> Dict[str, Any]:
+        """DELETE request to the API; returns the JSON response."""
+        return await self.request("DELETE", endpoint)
+
+    async def post_many(
+        self, endpoint: str, payloads: List[Dict[str, Any]]
+    ) -> List[Any]:
+        """
+        POST every payload, up to ``concurrency`` at a time.
+
+        Returns:
+            Per payload the JSON response or the exception it raised
+        """
+        return await asyncio.gather(
+            *(self.post(endpoint, payload) for payload in payloads),
+            return_exceptions=True,
+        )
+
+
+class SyncAPIFacade:
+    """
+    Blocking LaravelAPIClient interface over an AsyncLaravelAPIClient.
+
+    Runs the client's event loop in a background thread; every call is
+    handed to that loop and waits for its result. Any number of threads
+    (send queue workers, outbox replay, WebSocket listener) can call it at
+    once: their requests overlap in the one loop, limited by the client's
+    ``concurrency``, instead of each holding a pooled connection.
+
+    DataAPI, ConfigurationAPI, LoggingAPI, MessageHandler and the
+    WebSocket listener take it in place of a LaravelAPIClient.
+    """
+
+    def __init__(self, client: AsyncLaravelAPIClient) -> None:
+        """
+        Args:
+            client: The asyncio client; all its coroutines run in this facade's loop
+        """
+        self.client = client
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="api-event-loop", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, coroutine: Awaitable[T]) -> "concurrent.futures.Future[T]":
+        """Schedule a coroutine in the client's loop without waiting."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+
+    def _run(self, coroutine: Awaitable[T]) -> T:
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("SyncAPIFacade called from its own event loop")
+        return self.submit(coroutine).result()
+
+    # Attributes shared with LaravelAPIClient (read by noxfeed and the
+    # WebSocket listener)
+
+    @property
+    def base_url(self) -> str:
+        return self.client.base_url
+
+    @property
+    def user(self) -> Optional[str]:
+        return self.client.user
+
+    @property
+    def password(self) -> Optional[str]:
+        return self.client.password
+
+    @property
+    def traffic(self) -> TrafficStats:
+        return self.client.traffic
+
+    @property
+    def token(self) -> Optional[str]:
+        return self.client.token
+
+    @property
+    def token_expires_at(self) -> Optional[datetime]:
+        return self.client.token_expires_at
+
+    @property
+    def on_token_updated(self) -> Optional[Callable[[str, Optional[datetime]], None]]:
+        return self.client.on_token_updated
+
+    @on_token_updated.setter
+    def on_token_updated(
+        self, callback: Optional[Callable[[str, Optional[datetime]], None]]
+    ) -> None:
+        # Runs in the event loop thread
+        self.client.on_token_updated = callback
+
+    def set_token(self, token: str, expires_at: Optional[str] = None) -> None:
+        async def update() -> None:
+            self.client.set_token(token, expires_at)
+
+        self._run(update())
+
+    def is_token_expired(self, buffer_seconds: int = 3600) -> bool:
+        return self.client.is_token_expired(buffer_seconds)
+
+    def login(self, token_name: str = "python-client") -> Dict[str, Any]:
+        return self._run(self.client.login(token_name))
+
+    def renew_token(self) -> Dict[str, Any]:
+        return self._run(self.client.renew_token())
+
+    def ensure_authenticated(self, buffer_seconds: int = 3600) -> None:
+        self._run(self.client.ensure_authenticated(buffer_seconds))
+
+    def start_token_refresh(self) -> None:
+        self._run(self.client.start_token_refresh())
+
+    def request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        data: Optional[Dict[str, Any]] = None,
+        idempotent: Optional[bool] = None,
+    ) -> Dict[str, Any]:
+        return self._run(
+            self.client.request(method, endpoint, params, data, idempotent)
+        )
+
+    def get(self, endpoint: str, params: Optional[Dict] = None) -> Dict[str, Any]:
+        return self._run(self.client.get(endpoint, params))
+
+    def post(self, endpoint: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        return self._run(self.client.post(endpoint, data))
+
+    def put(self, endpoint: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        return self._run(self.client.put(endpoint, data))
+
+    def delete(self, endpoint: str) -> Dict[str, Any]:
+        return self._run(self.client.delete(endpoint))
+
+    def post_many(self, endpoint: str, payloads: List[Dict[str, Any]]) -> List[Any]:
+        return self._run(self.client.post_many(endpoint, payloads))
+
+    def raw_request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        return self._run(self.client.raw_request(method, url, **kwargs))
+
+    def warm_up(self, wait: bool = True) -> bool:
+        """
+        Args:
+            wait: False returns right away while the loop opens the connection
+        """
+        if not wait:
+            self.submit(self.client.warm_up())
+            return True
+        return self._run(self.client.warm_up())
+
+    def stats(self) -> Dict[str, Any]:
+        return self.client.stats()
+
+    def close(self) -> None:
+        """Close the client and stop the event loop thread."""
+        if not self._thread.is_alive():
+            return
+        try:
+            self.submit(self.client.close()).result(5.0)
+        except Exception as e:
+            if self.client.logger:
+                self.client.logger.warning("Closing the API client failed: %s", e)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(5.0)
+        self._loop.close()
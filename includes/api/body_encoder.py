@@ -0,0 +1,182 @@
+import gzip
+import json
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional, Tuple
+import logging
+
+try:
+    import zstandard
+except ImportError:  # Optional: zstd request bodies need the zstandard package
+    zstandard = None
+
+# Request body codings in order of preference
+SUPPORTED_ENCODINGS = ("zstd", "gzip") if zstandard is not None else ("gzip",)
+COMPRESSION_MODES = ("off", "auto") + SUPPORTED_ENCODINGS
+# Ask again after a server rejected compressed bodies (415)
+RENEGOTIATE_INTERVAL = 3600.0
+
+
+class BodyEncoder:
+    """
+    Encodes JSON request bodies, compressed when the server accepts it.
+
+    Bodies are compact UTF-8 JSON (no spaces after separators, no
+    ``\\uXXXX`` escapes). With compression enabled, bodies of at least
+    ``min_bytes`` are sent with ``Content-Encoding: zstd`` or ``gzip``.
+
+    Negotiation (mode ``auto``): HTTP has no request to ask a server which
+    request codings it accepts, but a server may list them in an
+    ``Accept-Encoding`` response header (RFC 7694). The encoder watches
+    responses for that header and compresses only with a coding listed
+    there; until one arrives, bodies go out uncompressed. A named coding
+    (``gzip``, ``zstd``) is used without negotiation. Either way a ``415
+    Unsupported Media Type`` answer to a compressed body turns compression
+    off for an hour (``reject()``); the request is not processed by the
+    server and can be sent again uncompressed.
+    """
+
+    def __init__(
+        self,
+        compression: str = "off",
+        min_bytes: int = 256,
+        level: Optional[int] = None,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """
+        Args:
+            compression: 'off', 'auto' (negotiated), 'gzip' or 'zstd'
+            min_bytes: Smaller bodies are sent uncompressed
+            level: Compression level (default: gzip 6, zstd 3)
+            logger: Optional logger instance
+
+        Raises:
+            ValueError: Unknown mode, or 'zstd' without the zstandard package
+        """
+        if compression == "zstd" and zstandard is None:
+            raise ValueError("API compression 'zstd' requires pip install zstandard")
+        if compression not in COMPRESSION_MODES:
+            raise ValueError(
+                f"Unknown API compression '{compression}' "
+                f"(one of: {', '.join(COMPRESSION_MODES)})"
+            )
+        self.compression = compression
+        self.min_bytes = min_bytes
+        self.level = level
+        self.logger = logger
+
+        self._lock = threading.Lock()
+        # Coding in use (None = uncompressed)
+        self.encoding: Optional[str] = (
+            compression if compression in SUPPORTED_ENCODINGS else None
+        )
+        self._rejected_until = 0.0
+        self._zstd = (
+            zstandard.ZstdCompressor(level=level or 3)
+            if zstandard is not None
+            else None
+        )
+
+        # Counters
+        self.bodies = 0
+        self.compressed = 0
+        self.raw_bytes = 0
+        self.body_bytes = 0
+        self.rejected = 0
+
+    def encode(self, data: Any, compress: bool = True) -> Tuple[bytes, Dict[str, str]]:
+        """
+        Args:
+            data: JSON-serializable body
+            compress: False forces an uncompressed body
+
+        Returns:
+            (body, headers) with Content-Type and, if compressed, Content-Encoding
+        """
+        body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode(
+            "utf-8"
+        )
+        headers = {"Content-Type": "application/json"}
+        raw_length = len(body)
+
+        encoding = self.current_encoding() if compress else None
+        if encoding and raw_length >= self.min_bytes:
+            if encoding == "zstd":
+                body = self._zstd.compress(body)
+            else:
+                body = gzip.compress(body, compresslevel=self.level or 6, mtime=0)
+            headers["Content-Encoding"] = encoding
+
+        with self._lock:
+            self.bodies += 1
+            self.raw_bytes += raw_length
+            self.body_bytes += len(body)
+            if "Content-Encoding" in headers:
+                self.compressed += 1
+        return body, headers
+
+    def current_encoding(self) -> Optional[str]:
+        if self.encoding is None or time.monotonic() < self._rejected_until:
+            return None
+        return self.encoding
+
+    def negotiate(self, headers: Mapping[str, str]) -> None:
+        """Pick up the request codings a server lists in Accept-Encoding."""
+        if self.compression != "auto":
+            return
+        value = headers.get("Accept-Encoding")
+        if value is None:
+            return
+
+        accepted = set()
+        for entry in value.split(","):
+            coding, _, params = entry.partition(";")
+            params = params.replace(" ", "").lower()
+            if params.startswith("q="):
+                try:
+                    if float(params[2:]) == 0:
+                        continue
+                except ValueError:
+                    continue
+            accepted.add(coding.strip().lower())
+        encoding = next(
+            (coding for coding in SUPPORTED_ENCODINGS if coding in accepted), None
+        )
+        if encoding == self.encoding:
+            return
+
+        self.encoding = encoding
+        if self.logger:
+            if encoding:
+                self.logger.info("API accepts %s request bodies", encoding)
+            else:
+                self.logger.info("API no longer accepts compressed request bodies")
+
+    def reject(self) -> None:
+        """The server answered 415 to a compressed body."""
+        with self._lock:
+            self.rejected += 1
+            self._rejected_until = time.monotonic() + RENEGOTIATE_INTERVAL
+        if self.logger:
+            self.logger.warning(
+                "API rejected %s request body (415), sending uncompressed for %.0fs",
+                self.encoding,
+                RENEGOTIATE_INTERVAL,
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "mode": self.compression,
+                "encoding": self.current_encoding(),
+                "bodies": self.bodies,
+                "compressed": self.compressed,
+                "raw_bytes": self.raw_bytes,
+                "body_bytes": self.body_bytes,
+                "ratio": (
+                    round(self.body_bytes / self.raw_bytes, 3)
+                    if self.raw_bytes
+                    else 1.0
+                ),
+                "rejected": self.rejected,
+            }
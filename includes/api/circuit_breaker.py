@@ -0,0 +1,116 @@
+import threading
+import time
+from typing import Any, Dict, Optional
+import logging
+
+from .errors import CircuitOpenError
+
+# Circuit states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Fails fast while a backend is down.
+
+    After ``failure_threshold`` failed calls in a row the circuit opens and
+    ``before_call()`` raises CircuitOpenError for ``reset_timeout`` seconds,
+    so callers do not queue up behind timeouts. Then one probe call is let
+    through (half open): success closes the circuit, failure opens it again.
+    Thread-safe; the API client is shared by several threads.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        name: str = "api",
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """
+        Args:
+            failure_threshold: Failed calls in a row that open the circuit (0 = never)
+            reset_timeout: Seconds the circuit stays open before a probe
+            name: Name used in log messages
+            logger: Optional logger instance
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.name = name
+        self.logger = logger
+
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+        # Counters
+        self.opened = 0
+        self.rejected = 0
+
+    def before_call(self) -> None:
+        """
+        Raises:
+            CircuitOpenError: If the circuit is open (or a probe is already running)
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            if self.state == OPEN:
+                remaining = self._opened_at + self.reset_timeout - time.monotonic()
+                if remaining > 0:
+                    self.rejected += 1
+                    raise CircuitOpenError(
+                        f"Circuit {self.name} open, retry in {remaining:.0f}s"
+                    )
+                self.state = HALF_OPEN
+            if self._probing:
+                self.rejected += 1
+                raise CircuitOpenError(f"Circuit {self.name} half open, probe running")
+            self._probing = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._probing = False
+            self._failures = 0
+            if self.state != CLOSED:
+                self.state = CLOSED
+                if self.logger:
+                    self.logger.info("Circuit %s closed, backend reachable", self.name)
+
+    def record_failure(self, error: Any = None) -> None:
+        with self._lock:
+            self._probing = False
+            self._failures += 1
+            if self.state == HALF_OPEN or (
+                self.failure_threshold and self._failures >= self.failure_threshold
+            ):
+                if self.state != OPEN:
+                    self.opened += 1
+                    if self.logger:
+                        self.logger.warning(
+                            "Circuit %s open for %.0fs after %d failures: %s",
+                            self.name,
+                            self.reset_timeout,
+                            self._failures,
+                            error,
+                        )
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """End a call that neither succeeded nor failed (e.g. a client error)."""
+        with self._lock:
+            self._probing = False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self._failures,
+                "opened": self.opened,
+                "rejected": self.rejected,
+            }
@@ -0,0 +1,162 @@
+import threading
+import time
+from typing import Any, Dict, Iterable, Mapping, Type
+from urllib.parse import urlsplit
+
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+
+class ConnectionStats:
+    """New connections (DNS + TCP + TLS handshakes) opened by a PooledAdapter."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+
+        # Counters
+        self.connections = 0
+        self.connect_seconds = 0.0
+        self.max_connect_seconds = 0.0
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self.connections += 1
+            self.connect_seconds += seconds
+            self.max_connect_seconds = max(self.max_connect_seconds, seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "connections": self.connections,
+                "connect_ms_total": round(self.connect_seconds * 1000, 1),
+                "connect_ms_avg": (
+                    round(self.connect_seconds * 1000 / self.connections, 1)
+                    if self.connections
+                    else 0.0
+                ),
+                "connect_ms_max": round(self.max_connect_seconds * 1000, 1),
+            }
+
+
+class TrafficStats:
+    """
+    HTTP bytes sent and received, per endpoint.
+
+    Counts request and status lines, headers and bodies as sent (after
+    compression). TCP/IP and TLS framing, handshakes and retransmissions
+    come on top, so a data plan needs some headroom beyond these numbers.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # endpoint -> [requests, sent bytes, received bytes]
+        self._endpoints: Dict[str, list] = {}
+
+    @staticmethod
+    def request_size(
+        method: str, url: str, headers: Mapping[str, Any], body_length: int
+    ) -> int:
+        parts = urlsplit(url)
+        target = parts.path or "/"
+        if parts.query:
+            target += f"?{parts.query}"
+        size = len(f"{method} {target} HTTP/1.1\r\n") + 2 + body_length
+        if "Host" not in headers:
+            size += len(f"Host: {parts.netloc}\r\n")
+        for name, value in headers.items():
+            if value is not None:
+                size += len(name) + len(str(value)) + 4
+        return size
+
+    @staticmethod
+    def response_size(
+        status: int, reason: str, headers: Mapping[str, Any], body_length: int
+    ) -> int:
+        # Content-Length is the size on the wire (compressed bodies are
+        # decoded by the time the client sees them)
+        length = headers.get("Content-Length")
+        size = len(f"HTTP/1.1 {status} {reason or ''}\r\n") + 2
+        size += int(length) if length and length.isdigit() else body_length
+        for name, value in headers.items():
+            size += len(name) + len(str(value)) + 4
+        return size
+
+    def record(self, endpoint: str, sent: int, received: int) -> None:
+        with self._lock:
+            entry = self._endpoints.setdefault(endpoint, [0, 0, 0])
+            entry[0] += 1
+            entry[1] += sent
+            entry[2] += received
+
+    def totals(self, endpoints: Iterable[str]) -> Dict[str, int]:
+        """Requests and bytes summed over ``endpoints``."""
+        requests = sent = received = 0
+        with self._lock:
+            for endpoint in set(endpoints):
+                count, out, back = self._endpoints.get(endpoint, (0, 0, 0))
+                requests += count
+                sent += out
+                received += back
+        return {"requests": requests, "sent_bytes": sent, "received_bytes": received}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            endpoints = {
+                endpoint: {
+                    "requests": count,
+                    "sent_bytes": sent,
+                    "received_bytes": received,
+                }
+                for endpoint, (count, sent, received) in sorted(self._endpoints.items())
+            }
+        return {
+            "sent_bytes": sum(entry["sent_bytes"] for entry in endpoints.values()),
+            "received_bytes": sum(
+                entry["received_bytes"] for entry in endpoints.values()
+            ),
+            "endpoints": endpoints,
+        }
+
+
+class PooledAdapter(HTTPAdapter):
+    """
+    HTTPAdapter with one bounded keep-alive pool per host that counts handshakes.
+
+    ``pool_size`` connections are kept open and reused by all threads;
+    with ``pool_block`` a thread waits for a free connection instead of
+    opening one that is thrown away afterwards. Every new connection is
+    timed (name resolution, TCP connect and TLS handshake) in ``stats``,
+    so a steady state without new connections can be verified.
+    """
+
+    def __init__(self, pool_size: int, stats: ConnectionStats) -> None:
+        """
+        Args:
+            pool_size: Connections kept open per host
+            stats: Receives the connect time of every new connection
+        """
+        # init_poolmanager() runs inside HTTPAdapter.__init__
+        self.stats = stats
+        super().__init__(pool_connections=1, pool_maxsize=pool_size, pool_block=True)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": self._timed_pool(HTTPConnectionPool),
+            "https": self._timed_pool(HTTPSConnectionPool),
+        }
+
+    def _timed_pool(self, pool_class: Type[HTTPConnectionPool]) -> type:
+        stats = self.stats
+
+        class TimedConnection(pool_class.ConnectionCls):  # type: ignore[name-defined]
+            def connect(self) -> None:
+                started = time.monotonic()
+                super().connect()
+                stats.record(time.monotonic() - started)
+
+        return type(
+            f"Timed{pool_class.__name__}",
+            (pool_class,),
+            {"ConnectionCls": TimedConnection},
+        )
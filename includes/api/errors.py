@@ -0,0 +1,5 @@
+import requests
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised instead of sending a request while the API circuit breaker is open."""
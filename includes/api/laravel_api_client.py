@@ -1,8 +1,25 @@
+import random
+import threading
+import time
 import requests
-from typing import Optional, Dict, Any
-from datetime import datetime, timedelta
+from typing import Callable, Optional, Dict, Any
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
 import logging
 
+from .body_encoder import BodyEncoder
+from .circuit_breaker import CircuitBreaker
+from .connection_pool import ConnectionStats, PooledAdapter, TrafficStats
+
+# Responses worth another attempt: overload, gateway errors, rate limiting
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+# Pause between refresh attempts after a failure (or a too short token lifetime)
+REFRESH_RETRY_INTERVAL = 60.0
+# The server did not process these, so even a POST can be repeated safely
+POST_RETRY_STATUS_CODES = frozenset({429, 503})
+IDEMPOTENT_METHODS = frozenset({"GET", "PUT", "DELETE"})
+
 
 class LaravelAPIClient:
     """
@@ -11,9 +28,18 @@ class LaravelAPIClient:
     Features:
     - Initial authentication with username/password (POST /auth/token)
     - Automatic token management (10-day lifetime)
-    - Automatic token renewal before expiry (POST /auth/renew)
+    - Automatic token renewal before expiry (POST /auth/renew), single-flight
+      across threads, optionally ahead of time by a background refresh thread
+    - Thread-safe: bounded keep-alive connection pool shared by all threads,
+      also used by login and the WebSocket auth/tracking calls (raw_request)
+    - Connection warm-up (warm_up) and handshake counts in stats()
+    - Compact JSON bodies, gzip/zstd compressed if the server accepts it
+      (BodyEncoder); bytes on the wire per endpoint in stats()
     - Token persistence via callback
     - All HTTP methods (GET, POST, PUT, DELETE) with auto-authentication
+    - Connect/read timeouts on every request
+    - Retries with exponential backoff and jitter, honouring Retry-After
+    - Circuit breaker: fails fast with CircuitOpenError while the API is down
     - Error logging for failed requests
     - Compatible with Laravel Reverb WebSocket authentication
 
@@ -36,8 +62,20 @@ class LaravelAPIClient:
         self,
         base_url: str,
         api_token: Optional[str] = None,
+        token_expires_at: Optional[str] = None,
         user: Optional[str] = None,
         password: Optional[str] = None,
+        timeout: float = 30.0,
+        connect_timeout: float = 5.0,
+        max_retries: int = 3,
+        retry_delay: float = 5.0,
+        max_retry_delay: float = 60.0,
+        circuit_failures: int = 5,
+        circuit_reset: float = 30.0,
+        pool_size: int = 4,
+        refresh_before: float = 7200.0,
+        compression: str = "off",
+        compression_min_bytes: int = 256,
         logger: Optional[logging.Logger] = None,
     ):
         """
@@ -46,25 +84,84 @@ class LaravelAPIClient:
         Args:
             base_url: Base URL of the Laravel API (e.g. 'https://api.example.com')
             api_token: Optional bearer token for authentication
+            token_expires_at: Optional ISO 8601 expiry of ``api_token``
             user: Optional username/email for login authentication
             password: Optional password for login authentication
+            timeout: Read timeout in seconds
+            connect_timeout: Connect timeout in seconds
+            max_retries: Retries per request (0 = none)
+            retry_delay: Backoff before the first retry in seconds, doubled per retry
+            max_retry_delay: Upper bound for one backoff or Retry-After wait;
+                a longer Retry-After is not waited for
+            circuit_failures: Failed requests in a row that open the circuit (0 = never)
+            circuit_reset: Seconds the circuit stays open before a probe request
+            pool_size: Connections shared by all threads; further requests wait
+                for a free connection
+            refresh_before: The refresh thread renews the token this many
+                seconds before it expires
+            compression: Request body compression: 'off', 'auto' (when the
+                server lists the coding in Accept-Encoding), 'gzip' or 'zstd'
+            compression_min_bytes: Smaller bodies are sent uncompressed
             logger: Optional logger instance
+
+        Raises:
+            ValueError: If the compression mode is unknown or unavailable
         """
         self.base_url = base_url.rstrip("/")
         self.session = requests.Session()
+        # The main loop, send queue, WebSocket and monitoring threads share the
+        # session; pool_block makes them wait for a connection instead of
+        # opening (and discarding) extra ones
+        self.connection_stats = ConnectionStats()
+        adapter = PooledAdapter(pool_size, self.connection_stats)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.encoder = BodyEncoder(compression, compression_min_bytes, logger=logger)
+        self.traffic = TrafficStats()
         self.user = user
         self.password = password
+        self.timeout = (connect_timeout, timeout)
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.circuit = CircuitBreaker(
+            circuit_failures, circuit_reset, name=self.base_url, logger=logger
+        )
         self.logger = logger
+        self.refresh_before = refresh_before
         self.token: Optional[str] = None
         self.token_expires_at: Optional[datetime] = None
 
+        # Called with (token, expires_at) after a login or renewal
+        self.on_token_updated: Optional[Callable[[str, Optional[datetime]], None]] = (
+            None
+        )
+
+        # Login/renewal run one at a time; waiting threads reuse the result
+        self._auth_lock = threading.RLock()
+        self._token_changed = threading.Event()
+        self._stop_event = threading.Event()
+        self._refresh_thread: Optional[threading.Thread] = None
+
+        # Counters (the client is shared by several threads)
+        self._counter_lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.logins = 0
+        self.renewals = 0
+
         # Set default headers
         self.session.headers.update(
-            {"Content-Type": "application/json", "Accept": "application/json"}
+            {
+                "Content-Type": "application/json",
+                "Accept": "application/json",
+                "Connection": "keep-alive",
+            }
         )
 
         if api_token:
-            self.set_token(api_token)
+            self.set_token(api_token, token_expires_at)
 
     def set_token(self, token: str, expires_at: Optional[str] = None) -> None:
         """
@@ -74,19 +171,25 @@ class LaravelAPIClient:
             token: Bearer token string
             expires_at: Optional ISO 8601 datetime string for token expiry
         """
-        self.token = token
-        self.session.headers.update({"Authorization": f"Bearer {token}"})
+        with self._auth_lock:
+            # Read by every request (_auth_headers), never written to the
+            # shared session headers while other threads build requests
+            self.token = token
 
-        if expires_at:
-            try:
-                # Parse ISO 8601 datetime (e.g., "2026-03-17T10:00:00+00:00")
-                self.token_expires_at = datetime.fromisoformat(
-                    expires_at.replace("Z", "+00:00")
-                )
-            except (ValueError, AttributeError):
-                self.token_expires_at = None
-                if self.logger:
-                    self.logger.warning("Failed to parse token expiry: %s", expires_at)
+            if expires_at:
+                try:
+                    # Parse ISO 8601 datetime (e.g., "2026-03-17T10:00:00+00:00")
+                    self.token_expires_at = datetime.fromisoformat(
+                        expires_at.replace("Z", "+00:00")
+                    )
+                except (ValueError, AttributeError):
+                    self.token_expires_at = None
+                    if self.logger:
+                        self.logger.warning(
+                            "Failed to parse token expiry: %s", expires_at
+                        )
+        # Reschedule the refresh thread
+        self._token_changed.set()
 
     def login(self, token_name: str = "python-client") -> Dict[str, Any]:
         """
@@ -102,44 +205,45 @@ class LaravelAPIClient:
             ValueError: If user/password not configured
             requests.HTTPError: If authentication fails
         """
-        if not self.user or not self.password:
-            raise ValueError("User and password must be configured for login")
-
-        if self.logger:
-            self.logger.info("Authenticating with API as %s", self.user)
-
-        # Don't use Bearer token for login request
-        headers = self.session.headers.copy()
-        if "Authorization" in headers:
-            del headers["Authorization"]
-
-        response = requests.post(
-            f"{self.base_url}/auth/token",
-            json={
-                "user": self.user,
-                "password": self.password,
-                "token_name": token_name,
-            },
-            headers=headers,
-        )
-        response.raise_for_status()
+        with self._auth_lock:
+            if not self.user or not self.password:
+                raise ValueError("User and password must be configured for login")
+
+            if self.logger:
+                self.logger.info("Authenticating with API as %s", self.user)
+
+            # No Bearer token for the login request; the pooled connection
+            # is reused afterwards
+            response = self.session.post(
+                f"{self.base_url}/auth/token",
+                json={
+                    "user": self.user,
+                    "password": self.password,
+                    "token_name": token_name,
+                },
+                timeout=self.timeout,
+            )
+            self._account("/auth/token", response)
+            response.raise_for_status()
 
-        data = response.json()
+            data = response.json()
 
-        # Update token and expiry
-        self.set_token(data.get("token"), data.get("expires_at"))
+            # Update token and expiry
+            self.set_token(data.get("token"), data.get("expires_at"))
+            with self._counter_lock:
+                self.logins += 1
 
-        if self.logger:
-            self.logger.info(
-                "Successfully authenticated. Token expires at: %s",
-                self.token_expires_at,
-            )
+            if self.logger:
+                self.logger.info(
+                    "Successfully authenticated. Token expires at: %s",
+                    self.token_expires_at,
+                )
 
-        # Callback for token updates (can be used to persist token)
-        if hasattr(self, "on_token_updated") and callable(self.on_token_updated):
-            self.on_token_updated(self.token, self.token_expires_at)
+            # Callback for token updates (can be used to persist token)
+            if self.on_token_updated:
+                self.on_token_updated(self.token, self.token_expires_at)
 
-        return data
+            return data
 
     def renew_token(self) -> Dict[str, Any]:
         """
@@ -151,27 +255,40 @@ class LaravelAPIClient:
         Raises:
             requests.HTTPError: If renewal fails
         """
-        if self.logger:
-            self.logger.info("Renewing authentication token")
+        with self._auth_lock:
+            if self.logger:
+                self.logger.info("Renewing authentication token")
+
+            response = self.session.post(
+                f"{self.base_url}/auth/renew",
+                headers=self._auth_headers(),
+                timeout=self.timeout,
+            )
+            self._account("/auth/renew", response)
+            response.raise_for_status()
 
-        response = self.session.post(f"{self.base_url}/auth/renew")
-        response.raise_for_status()
+            data = response.json()
 
-        data = response.json()
+            # Update token and expiry
+            self.set_token(data.get("token"), data.get("expires_at"))
+            with self._counter_lock:
+                self.renewals += 1
 
-        # Update token and expiry
-        self.set_token(data.get("token"), data.get("expires_at"))
+            if self.logger:
+                self.logger.info(
+                    "Token renewed successfully. New expiry: %s", self.token_expires_at
+                )
 
-        if self.logger:
-            self.logger.info(
-                "Token renewed successfully. New expiry: %s", self.token_expires_at
-            )
+            # Callback for token updates (can be used to persist token)
+            if self.on_token_updated:
+                self.on_token_updated(self.token, self.token_expires_at)
 
-        # Callback for token updates (can be used to persist token)
-        if hasattr(self, "on_token_updated") and callable(self.on_token_updated):
-            self.on_token_updated(self.token, self.token_expires_at)
+            return data
 
-        return data
+    def _auth_headers(self) -> Dict[str, str]:
+        """Authorization header for the current token (empty without one)."""
+        token = self.token
+        return {"Authorization": f"Bearer {token}"} if token else {}
 
     def is_token_expired(self, buffer_seconds: int = 3600) -> bool:
         """
@@ -192,16 +309,27 @@ class LaravelAPIClient:
 
         return expires_soon
 
-    def ensure_authenticated(self) -> None:
+    def ensure_authenticated(self, buffer_seconds: int = 3600) -> None:
         """
         Ensure we have a valid authentication token.
         Logs in if no token exists, or renews if token is expired/expiring soon.
 
+        Single flight: if several threads find the token expiring, one
+        renews it while the others wait and then use the new token.
+
+        Args:
+            buffer_seconds: Renew if the token expires within this many seconds
+
         Raises:
             ValueError: If authentication is not configured
             requests.HTTPError: If authentication fails
         """
-        if self.is_token_expired():
+        if not self.is_token_expired(buffer_seconds):
+            return
+        with self._auth_lock:
+            # Renewed by another thread while this one waited
+            if not self.is_token_expired(buffer_seconds):
+                return
             if not self.token:
                 # No token yet, perform initial login
                 self.login()
@@ -217,6 +345,320 @@ class LaravelAPIClient:
                         )
                     self.login()
 
+    def start_token_refresh(self) -> None:
+        """
+        Renew the token in the background ``refresh_before`` seconds before
+        it expires, so no request has to wait for a renewal.
+        """
+        if self._refresh_thread and self._refresh_thread.is_alive():
+            return
+        self._refresh_thread = threading.Thread(
+            target=self._refresh_loop, name="token-refresh", daemon=True
+        )
+        self._refresh_thread.start()
+
+    def _refresh_delay(self) -> Optional[float]:
+        """Seconds until the next renewal (None = wait for a token)."""
+        with self._auth_lock:
+            if not self.token or not self.token_expires_at:
+                # Unknown expiry: authenticate now if we can
+                return 0.0 if self.user and self.password else None
+            now = datetime.now(self.token_expires_at.tzinfo)
+            renew_at = self.token_expires_at - timedelta(seconds=self.refresh_before)
+            return (renew_at - now).total_seconds()
+
+    def _refresh_loop(self) -> None:
+        while not self._stop_event.is_set():
+            self._token_changed.clear()
+            delay = self._refresh_delay()
+            if delay is None or delay > 0:
+                # Woken early by a new token (login, renewal, set_token)
+                if self._token_changed.wait(delay) or self._stop_event.is_set():
+                    continue
+
+            try:
+                self.ensure_authenticated(buffer_seconds=self.refresh_before)
+            except Exception as e:
+                if self.logger:
+                    self.logger.warning(
+                        "Background token refresh failed, retrying in %.0fs: %s",
+                        REFRESH_RETRY_INTERVAL,
+                        e,
+                    )
+            else:
+                delay = self._refresh_delay()
+                if delay is None or delay > 0:
+                    continue
+            # Failed, or the new token is already due (short lifetime)
+            self._stop_event.wait(REFRESH_RETRY_INTERVAL)
+
+    def close(self) -> None:
+        """Stop the refresh thread and close the connection pool."""
+        self._stop_event.set()
+        self._token_changed.set()
+        if (
+            self._refresh_thread
+            and self._refresh_thread is not threading.current_thread()
+        ):
+            self._refresh_thread.join(5.0)
+        self.session.close()
+
+    def request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        data: Optional[Dict[str, Any]] = None,
+        idempotent: Optional[bool] = None,
+    ) -> Dict[str, Any]:
+        """
+        Send a request through the transport layer.
+
+        Connection errors, timeouts and 429/5xx responses are retried up to
+        ``max_retries`` times with exponential backoff and jitter (or after
+        the server's Retry-After). Non-idempotent requests (POST) are only
+        repeated when the server certainly did not process them: connect
+        timeouts, 429 and 503. Failed requests count towards the circuit
+        breaker.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint
+            params: Optional query parameters
+            data: Optional JSON body
+            idempotent: Override the retry rules of the method
+
+        Returns:
+            JSON response as a dictionary
+
+        Raises:
+            CircuitOpenError: If the circuit breaker is open
+            requests.RequestException: If the request fails
+        """
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+
+        self.circuit.before_call()
+        try:
+            # Ensure we have a valid token if user/password configured
+            if self.user and self.password:
+                self.ensure_authenticated()
+            response = self._send(method, endpoint, params, data, idempotent)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            with self._counter_lock:
+                self.failures += 1
+            self.circuit.record_failure(e)
+            raise
+        except requests.HTTPError as e:
+            # Login/renewal failed
+            self._record_status(getattr(e.response, "status_code", 0), e)
+            raise
+        except BaseException:
+            self.circuit.release()
+            raise
+
+        self._record_status(response.status_code, response.reason)
+        response.raise_for_status()
+        return response.json()
+
+    def _record_status(self, status: int, reason: Any) -> None:
+        if status >= 500:
+            with self._counter_lock:
+                self.failures += 1
+            self.circuit.record_failure(f"HTTP {status} {reason}")
+        elif status == 429 or not status:
+            # Alive but busy: neither closes nor opens the circuit
+            self.circuit.release()
+        else:
+            self.circuit.record_success()
+
+    def _send(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict],
+        data: Optional[Dict[str, Any]],
+        idempotent: bool,
+    ) -> requests.Response:
+        url = f"{self.base_url}{endpoint}"
+        retry_codes = RETRY_STATUS_CODES if idempotent else POST_RETRY_STATUS_CODES
+        body, headers = self.encoder.encode(data) if data is not None else (None, {})
+        attempt = 0
+        while True:
+            with self._counter_lock:
+                self.requests += 1
+            try:
+                # Token taken per attempt: a retry uses a renewed token
+                response = self.session.request(
+                    method,
+                    url,
+                    params=params,
+                    data=body,
+                    headers={**self._auth_headers(), **headers},
+                    timeout=self.timeout,
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                # A connect timeout never reached the server
+                if attempt >= self.max_retries or not (
+                    idempotent or isinstance(e, requests.ConnectTimeout)
+                ):
+                    raise
+                delay = self._backoff(attempt)
+                cause: Any = e
+            else:
+                self._account(endpoint, response)
+                if response.status_code == 415 and "Content-Encoding" in headers:
+                    # Compressed body refused (and not processed): resend plain
+                    self.encoder.reject()
+                    body, headers = self.encoder.encode(data, compress=False)
+                    continue
+                if (
+                    response.status_code not in retry_codes
+                    or attempt >= self.max_retries
+                ):
+                    return response
+                delay = self._retry_after(response)
+                if delay is None:
+                    delay = self._backoff(attempt)
+                elif delay > self.max_retry_delay:
+                    # Not worth blocking for; the caller retries later
+                    return response
+                cause = f"HTTP {response.status_code}"
+
+            attempt += 1
+            with self._counter_lock:
+                self.retries += 1
+            if self.logger:
+                self.logger.warning(
+                    "%s %s failed (%s), retry %d/%d in %.1fs",
+                    method,
+                    endpoint,
+                    cause,
+                    attempt,
+                    self.max_retries,
+                    delay,
+                )
+            time.sleep(delay)
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with jitter (half fixed, half random)."""
+        delay = min(self.max_retry_delay, self.retry_delay * 2**attempt)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    @staticmethod
+    def _retry_after(response: requests.Response) -> Optional[float]:
+        """Seconds from a Retry-After header (delta seconds or HTTP date)."""
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+    def raw_request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """
+        Send a request through the shared connection pool, without retries.
+
+        For calls outside the API prefix on the same host (e.g.
+        /broadcasting/auth) whose caller handles the response itself.
+
+        Args:
+            method: HTTP method
+            url: Absolute URL, or an endpoint relative to ``base_url``
+            **kwargs: Passed to requests (json, headers, timeout, ...)
+
+        Returns:
+            The response, whatever its status
+        """
+        endpoint = url if url.startswith("/") else urlsplit(url).path
+        if url.startswith("/"):
+            url = f"{self.base_url}{url}"
+        kwargs.setdefault("timeout", self.timeout)
+        # Explicit headers (e.g. another Authorization) take precedence
+        kwargs["headers"] = {**self._auth_headers(), **(kwargs.get("headers") or {})}
+        with self._counter_lock:
+            self.requests += 1
+        response = self.session.request(method, url, **kwargs)
+        self._account(endpoint, response)
+        return response
+
+    def _account(self, endpoint: str, response: requests.Response) -> None:
+        """Count the exchange's bytes; note request codings the server accepts."""
+        request = response.request
+        self.encoder.negotiate(response.headers)
+        self.traffic.record(
+            endpoint,
+            TrafficStats.request_size(
+                request.method, request.url, request.headers, len(request.body or b"")
+            ),
+            TrafficStats.response_size(
+                response.status_code,
+                response.reason,
+                response.headers,
+                len(response.content or b""),
+            ),
+        )
+
+    def warm_up(self, wait: bool = True) -> bool:
+        """
+        Open the first pooled connection (DNS, TCP, TLS) before it is needed.
+
+        Args:
+            wait: False runs the warm-up in a background thread
+
+        Returns:
+            True if the server answered (any status), False on a connection error
+        """
+        if not wait:
+            threading.Thread(
+                target=self.warm_up, name="api-warm-up", daemon=True
+            ).start()
+            return True
+
+        started = time.monotonic()
+        try:
+            # Any answer will do; the connection stays in the pool
+            response = self.session.head(
+                self.base_url, timeout=self.timeout, allow_redirects=False
+            )
+        except requests.RequestException as e:
+            if self.logger:
+                self.logger.warning("API connection warm-up failed: %s", e)
+            return False
+        self._account("/", response)
+        if self.logger:
+            self.logger.info(
+                "API connection warmed up in %.0f ms",
+                (time.monotonic() - started) * 1000,
+            )
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._counter_lock:
+            counters = {
+                "requests": self.requests,
+                "retries": self.retries,
+                "failures": self.failures,
+                "logins": self.logins,
+                "renewals": self.renewals,
+            }
+        return {
+            **counters,
+            "circuit": self.circuit.stats(),
+            # Connections opened; in steady state this stops growing
+            **self.connection_stats.stats(),
+            "compression": self.encoder.stats(),
+            "traffic": self.traffic.stats(),
+        }
+
     def get(self, endpoint: str, params: Optional[Dict] = None) -> Dict[str, Any]:
         """
         GET request to the API.
@@ -228,14 +670,7 @@ class LaravelAPIClient:
         Returns:
             JSON response as a dictionary
         """
-        # Ensure we have a valid token if user/password configured
-        if self.user and self.password:
-            self.ensure_authenticated()
-
-        url = f"{self.base_url}{endpoint}"
-        response = self.session.get(url, params=params)
-        response.raise_for_status()
-        return response.json()
+        return self.request("GET", endpoint, params=params)
 
     def post(self, endpoint: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -248,14 +683,7 @@ class LaravelAPIClient:
         Returns:
             JSON response as a dictionary
         """
-        # Ensure we have a valid token if user/password configured
-        if self.user and self.password:
-            self.ensure_authenticated()
-
-        url = f"{self.base_url}{endpoint}"
-        response = self.session.post(url, json=data)
-        response.raise_for_status()
-        return response.json()
+        return self.request("POST", endpoint, data=data)
 
     def put(self, endpoint: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -268,14 +696,7 @@ class LaravelAPIClient:
         Returns:
             JSON response as a dictionary
         """
-        # Ensure we have a valid token if user/password configured
-        if self.user and self.password:
-            self.ensure_authenticated()
-
-        url = f"{self.base_url}{endpoint}"
-        response = self.session.put(url, json=data)
-        response.raise_for_status()
-        return response.json()
+        return self.request("PUT", endpoint, data=data)
 
     def delete(self, endpoint: str) -> Dict[str, Any]:
         """
@@ -287,11 +708,4 @@ class LaravelAPIClient:
         Returns:
             JSON response as a dictionary
         """
-        # Ensure we have a valid token if user/password configured
-        if self.user and self.password:
-            self.ensure_authenticated()
-
-        url = f"{self.base_url}{endpoint}"
-        response = self.session.delete(url)
-        response.raise_for_status()
-        return response.json()
+        return self.request("DELETE", endpoint)
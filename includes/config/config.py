@@ -100,6 +100,56 @@ class Config:
         """Delay between retries in seconds."""
         return self.get("api.retry_delay", 5)
 
+    @property
+    def api_connect_timeout(self) -> int:
+        """API connect timeout in seconds."""
+        return self.get("api.connect_timeout", 5)
+
+    @property
+    def api_max_retry_delay(self) -> int:
+        """Upper bound for one retry delay in seconds."""
+        return self.get("api.max_retry_delay", 60)
+
+    @property
+    def api_circuit_failures(self) -> int:
+        """Failed requests in a row that open the circuit breaker."""
+        return self.get("api.circuit_failures", 5)
+
+    @property
+    def api_circuit_reset(self) -> int:
+        """Seconds the circuit breaker stays open."""
+        return self.get("api.circuit_reset", 30)
+
+    @property
+    def api_pool_size(self) -> int:
+        """Connections shared by all API client threads."""
+        return self.get("api.pool_size", 4)
+
+    @property
+    def api_token_refresh_before(self) -> int:
+        """Seconds before token expiry the background refresh renews it."""
+        return self.get("api.token_refresh_before", 7200)
+
+    @property
+    def api_async(self) -> bool:
+        """Use the asyncio API client (requires aiohttp)."""
+        return self.get("api.async", False)
+
+    @property
+    def api_concurrency(self) -> int:
+        """API requests in flight at a time with the asyncio client."""
+        return self.get("api.concurrency", 16)
+
+    @property
+    def api_compression(self) -> str:
+        """Request body compression: off, auto, gzip or zstd."""
+        return self.get("api.compression", "off")
+
+    @property
+    def api_compression_min_bytes(self) -> int:
+        """Request bodies below this size are sent uncompressed."""
+        return self.get("api.compression_min_bytes", 256)
+
     @property
     def logging_enabled(self) -> bool:
         """Logging enabled."""
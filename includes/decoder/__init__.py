@@ -0,0 +1,5 @@
+from .pocsag_decoder import PocsagDecoder
+from .channelizer import Channelizer
+from .wideband_decoder import WidebandDecoder
+
+__all__ = ["PocsagDecoder", "Channelizer", "WidebandDecoder"]
@@ -0,0 +1,104 @@
+from typing import Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Optional: only the native decoder needs NumPy
+    np = None
+
+# POCSAG codeword (32 bits, MSB first on air):
+#   bit 31      flag (0 = address, 1 = message)
+#   bits 30-11  20 data bits (address/function or message content)
+#   bits 10-1   BCH(31,21) check bits
+#   bit 0       even parity over the whole codeword
+GENERATOR = 0x769  # x^10 + x^9 + x^8 + x^6 + x^5 + x^3 + 1
+CHECK_BITS = 10
+CODE_BITS = 31
+
+SYNC_CODEWORD = 0x7CD215D8
+IDLE_CODEWORD = 0x7A89C197
+
+
+def _remainder(value: int) -> int:
+    """Remainder of a 31 bit polynomial divided by the generator."""
+    for bit in range(CODE_BITS - 1, CHECK_BITS - 1, -1):
+        if value & (1 << bit):
+            value ^= GENERATOR << (bit - CHECK_BITS)
+    return value
+
+
+def encode(data: int) -> int:
+    """
+    Build a complete codeword from its 21 information bits (flag + 20 data bits).
+
+    Returns:
+        32 bit codeword with BCH check bits and even parity
+    """
+    data &= 0x1FFFFF
+    word = (data << CHECK_BITS) | _remainder(data << CHECK_BITS)
+    word <<= 1
+    return word | (bin(word).count("1") & 1)
+
+
+def _build_error_table() -> "np.ndarray":
+    """Map each syndrome to its 1 or 2 bit error pattern (-1 = uncorrectable)."""
+    table = np.full(1 << CHECK_BITS, -1, dtype=np.int64)
+    table[0] = 0
+    single = [_remainder(1 << bit) for bit in range(CODE_BITS)]
+    for bit, syndrome in enumerate(single):
+        table[syndrome] = 1 << bit
+    for first in range(CODE_BITS):
+        for second in range(first + 1, CODE_BITS):
+            syndrome = single[first] ^ single[second]
+            if table[syndrome] < 0:
+                table[syndrome] = (1 << first) | (1 << second)
+    return table
+
+
+ERROR_TABLE = _build_error_table() if np is not None else None
+
+
+def popcount(values: "np.ndarray") -> "np.ndarray":
+    """Number of set bits of each uint32."""
+    values = values.astype(np.uint32)
+    values = values - ((values >> 1) & 0x55555555)
+    values = (values & 0x33333333) + ((values >> 2) & 0x33333333)
+    values = (values + (values >> 4)) & 0x0F0F0F0F
+    return ((values * np.uint32(0x01010101)) & 0xFFFFFFFF) >> 24
+
+
+def syndromes(codewords: "np.ndarray") -> "np.ndarray":
+    """BCH syndromes of many codewords at once (0 = valid)."""
+    values = (codewords.astype(np.uint32) >> 1) & 0x7FFFFFFF
+    for bit in range(CODE_BITS - 1, CHECK_BITS - 1, -1):
+        values ^= ((values >> bit) & 1) * np.uint32(GENERATOR << (bit - CHECK_BITS))
+    return values
+
+
+def correct(codewords: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Correct up to two bit errors per codeword (plus a wrong parity bit).
+
+    Args:
+        codewords: uint32 array of received codewords
+
+    Returns:
+        (corrected codewords, corrected bits per codeword); the bit count is
+        -1 for codewords that could not be corrected
+    """
+    codewords = codewords.astype(np.uint32)
+    patterns = ERROR_TABLE[syndromes(codewords)]
+    correctable = patterns >= 0
+
+    fixed = codewords ^ (np.where(correctable, patterns, 0).astype(np.uint32) << 1)
+    errors = np.where(
+        correctable, popcount(np.maximum(patterns, 0)).astype(np.int64), -1
+    )
+
+    # Parity covers all 32 bits; a mismatch after two corrections means a
+    # third error, otherwise only the parity bit itself was wrong
+    parity_error = (popcount(fixed) & 1).astype(bool)
+    fixed = np.where(parity_error, fixed ^ np.uint32(1), fixed)
+    errors = np.where(parity_error & correctable, errors + 1, errors)
+    errors = np.where(parity_error & (errors > 2), -1, errors)
+
+    return fixed.astype(np.uint32), errors.astype(np.int64)
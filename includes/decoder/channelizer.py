@@ -0,0 +1,227 @@
+import math
+from typing import Any, Dict, List, Optional
+import logging
+
+from .bch import np
+
+# rtl_sdr output: interleaved unsigned 8 bit I/Q, zero at 127.5
+IQ_ZERO = 127.5
+
+# Peak level of the audio for a carrier at full ``deviation`` (like rtl_fm)
+AUDIO_LEVEL = 8000.0
+
+# Smoothing of the per-channel power estimate (per block)
+POWER_SMOOTHING = 0.2
+
+
+class Channelizer:
+    """
+    Splits a wideband rtl_sdr IQ stream into narrowband FM audio channels.
+
+    FFT overlap-save filter bank: every block of ``fft_size`` input
+    samples is transformed once. Per channel, the bins around the channel
+    frequency are multiplied with the spectrum of a low-pass FIR (channel
+    selection) and only ``fft_size / decimation`` of them are transformed
+    back, which is filtering and decimation in one step. One large FFT is
+    shared by all channels; each channel costs a small inverse FFT, so
+    3-4 channels cost little more than one.
+
+    The narrowband IQ of every channel is FM demodulated (phase difference
+    of consecutive samples) into s16le audio at ``channel_rate``, the same
+    format rtl_fm produces, ready for a PocsagDecoder.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        center_frequency: float,
+        channels: Dict[str, float],
+        channel_rate: int = 24000,
+        cutoff: float = 8000.0,
+        deviation: float = 4500.0,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """
+        Args:
+            sample_rate: rtl_sdr sample rate (-s), a multiple of ``channel_rate``
+            center_frequency: rtl_sdr tuning frequency (-f) in Hz
+            channels: Channel name -> frequency in Hz
+            channel_rate: Audio sample rate of every channel
+            cutoff: Channel filter bandwidth (one side) in Hz
+            deviation: FM deviation mapped to the full audio level in Hz
+            logger: Optional logger instance
+
+        Raises:
+            RuntimeError: NumPy is not installed
+            ValueError: Rates do not divide, the filter does not fit the
+                channel rate or a channel lies outside the captured band
+        """
+        if np is None:
+            raise RuntimeError(
+                "The wideband channelizer requires NumPy (pip install numpy)"
+            )
+        if not channels:
+            raise ValueError("No channels configured")
+        if channel_rate <= 0 or sample_rate % channel_rate:
+            raise ValueError(
+                f"Sample rate {sample_rate} is not a multiple of the channel "
+                f"rate {channel_rate}"
+            )
+        if not 0 < cutoff < channel_rate / 2:
+            raise ValueError(f"Cutoff {cutoff} Hz must be below {channel_rate / 2} Hz")
+
+        self.sample_rate = sample_rate
+        self.center_frequency = center_frequency
+        self.channel_rate = channel_rate
+        self.names: List[str] = list(channels)
+        self.logger = logger
+
+        self.decimation = sample_rate // channel_rate
+        offsets = [channels[name] - center_frequency for name in self.names]
+        for name, offset in zip(self.names, offsets):
+            if abs(offset) + cutoff >= sample_rate / 2:
+                raise ValueError(
+                    f"Channel {name} ({channels[name] / 1e6:.4f} MHz) is outside "
+                    f"the captured band of {center_frequency / 1e6:.4f} MHz "
+                    f"+/- {sample_rate / 2e6:.3f} MHz"
+                )
+
+        # Blackman windowed sinc, transition band from cutoff to channel_rate / 2;
+        # its length (minus one) is the overlap kept between blocks
+        transition = channel_rate / 2 - cutoff
+        taps = int(math.ceil(5.5 * sample_rate / transition))
+        self.overlap = -(-taps // self.decimation) * self.decimation
+        taps = self.overlap + 1
+
+        # Output bins per channel: a power of two, overlap below ~1/8 of a block
+        self.output_size = 64
+        while self.output_size * self.decimation < 8 * self.overlap:
+            self.output_size *= 2
+        self.fft_size = self.output_size * self.decimation
+        self.step = self.fft_size - self.overlap
+
+        n = np.arange(taps) - (taps - 1) / 2
+        fir = np.sinc(2 * cutoff / sample_rate * n) * np.blackman(taps)
+        fir /= fir.sum()
+        half = self.output_size // 2
+        base = np.concatenate(
+            (np.arange(half), np.arange(self.fft_size - half, self.fft_size))
+        )
+        # 1 / decimation: the short inverse FFT only normalizes by output_size
+        self._response = (
+            np.fft.fft(fir, self.fft_size)[base] / self.decimation
+        ).astype(np.complex64)
+
+        # Channels are shifted to baseband by whole bins, the remainder
+        # (< half a bin) is a small DC offset in the audio
+        self._bins = np.array(
+            [round(offset * self.fft_size / sample_rate) for offset in offsets],
+            dtype=np.int64,
+        )
+        self._index = (base[None, :] + self._bins[:, None]) % self.fft_size
+        # Phase of the bin shift at the start of the current block (in bins * samples mod N)
+        self._phase = np.zeros(len(self.names), dtype=np.int64)
+
+        self._lut = ((np.arange(256) - IQ_ZERO) / IQ_ZERO).astype(np.float32)
+        self._buffer = np.zeros(self.fft_size, dtype=np.complex64)
+        self._fill = self.overlap
+        self._odd = b""
+        self._last = np.ones(len(self.names), dtype=np.complex64)
+        self._scale = AUDIO_LEVEL / (2 * math.pi * deviation / channel_rate)
+        self._power = np.full(len(self.names), np.nan)
+
+        # Counters
+        self.blocks = 0
+        self.samples = 0
+
+        if self.logger:
+            self.logger.info(
+                "Channelizer: %d channels at %d Hz from %d S/s "
+                "(FFT %d, %d taps, %.1f ms blocks)",
+                len(self.names),
+                channel_rate,
+                sample_rate,
+                self.fft_size,
+                taps,
+                self.step / sample_rate * 1000,
+            )
+
+    def feed(self, data: bytes) -> Dict[str, Any]:
+        """
+        Add rtl_sdr output and return the audio completed by it.
+
+        Args:
+            data: Interleaved u8 I/Q bytes, any length
+
+        Returns:
+            Channel name -> s16le audio samples (int16 array, may be empty)
+        """
+        if self._odd:
+            data = self._odd + bytes(data)
+        raw = np.frombuffer(data, dtype=np.uint8)
+        if len(raw) % 2:
+            self._odd = bytes(raw[-1:])
+            raw = raw[:-1]
+        else:
+            self._odd = b""
+
+        count = len(raw) // 2
+        self.samples += count
+        audio: List[List[Any]] = [[] for _ in self.names]
+
+        offset = 0
+        while offset < count:
+            take = min(count - offset, self.fft_size - self._fill)
+            window = self._buffer[self._fill : self._fill + take]
+            pairs = raw[2 * offset : 2 * (offset + take)]
+            window.real = self._lut[pairs[0::2]]
+            window.imag = self._lut[pairs[1::2]]
+            self._fill += take
+            offset += take
+
+            if self._fill == self.fft_size:
+                for output, block in zip(audio, self._process()):
+                    output.append(block)
+
+        return {
+            name: (np.concatenate(blocks) if blocks else np.empty(0, dtype=np.int16))
+            for name, blocks in zip(self.names, audio)
+        }
+
+    def _process(self) -> Any:
+        spectrum = np.fft.fft(self._buffer)
+        selected = spectrum[self._index] * self._response
+        narrow = np.fft.ifft(selected, axis=1)[:, self.overlap // self.decimation :]
+
+        # Keep the bin shift phase continuous across blocks
+        narrow *= np.exp(-2j * np.pi * self._phase / self.fft_size)[:, None]
+        self._phase = (self._phase + self._bins * self.step) % self.fft_size
+
+        power = np.mean(np.abs(narrow) ** 2, axis=1)
+        level = 10 * np.log10(np.maximum(power, 1e-12))
+        self._power = np.where(
+            np.isnan(self._power),
+            level,
+            self._power + POWER_SMOOTHING * (level - self._power),
+        )
+
+        # FM discriminator
+        previous = np.concatenate((self._last[:, None], narrow[:, :-1]), axis=1)
+        phase = np.angle(narrow * np.conj(previous))
+        self._last = narrow[:, -1].astype(np.complex64)
+
+        self._buffer[: self.overlap] = self._buffer[self.step :]
+        self._fill = self.overlap
+        self.blocks += 1
+
+        return np.clip(phase * self._scale, -32768, 32767).astype(np.int16)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "blocks": self.blocks,
+            "samples": self.samples,
+            "power_dbfs": {
+                name: (None if math.isnan(level) else round(float(level), 1))
+                for name, level in zip(self.names, self._power)
+            },
+        }
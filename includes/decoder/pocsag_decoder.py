@@ -0,0 +1,445 @@
+import math
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import logging
+
+from includes.handlers import PocsagMessage
+from . import bch
+from .bch import np, SYNC_CODEWORD, IDLE_CODEWORD
+
+CHARSET_AUTO = "auto"
+CHARSET_ALPHA = "alpha"
+CHARSET_NUMERIC = "numeric"
+CHARSETS = (CHARSET_AUTO, CHARSET_ALPHA, CHARSET_NUMERIC)
+
+# 4 bit BCD characters of numeric messages
+NUMERIC_CHARS = "0123456789*U -)("
+
+# A batch is the sync codeword followed by 8 frames of 2 codewords
+BATCH_CODEWORDS = 16
+CODEWORD_BITS = 32
+
+# Frame decoder states: searching sync, inside a batch, expecting the next sync
+HUNT, BATCH, SYNC = range(3)
+
+# Sync words with up to this many wrong bits are accepted
+SYNC_MAX_ERRORS = 2
+
+# Bit periods used for DC removal (FM discriminator offset / tuning error)
+DC_WINDOW_BITS = 64
+
+# Characters of typical numeric pages (used by charset 'auto')
+NUMERIC_DIGITS = set("0123456789 -")
+
+# Alpha terminators (ETX, EOT, ETB) and padding left at the end of a message
+ALPHA_TERMINATORS = ("\x03", "\x04", "\x17")
+ALPHA_TRAILER = "\x00\x03\x04\x17 "
+
+
+def _pack(bits: "np.ndarray") -> "np.ndarray":
+    """Pack rows of 32 bits (MSB first) into uint32 codewords."""
+    words = np.zeros(bits.shape[0], dtype=np.uint32)
+    for column in range(CODEWORD_BITS):
+        words = (words << 1) | bits[:, column].astype(np.uint32)
+    return words
+
+
+def _sliding_words(bits: "np.ndarray") -> "np.ndarray":
+    """uint32 value of every 32 bit window (one per start position)."""
+    count = len(bits) - CODEWORD_BITS + 1
+    words = np.zeros(count, dtype=np.uint32)
+    for offset in range(CODEWORD_BITS):
+        words = (words << 1) | bits[offset : offset + count].astype(np.uint32)
+    return words
+
+
+class _Message:
+    """Codewords collected for one address until the next address or idle word."""
+
+    __slots__ = ("address", "function", "words", "corrected", "codewords")
+
+    def __init__(self, address: int, function: int, corrected: int) -> None:
+        self.address = address
+        self.function = function
+        self.words: List[int] = []
+        self.corrected = corrected
+        self.codewords = 1
+
+
+class _Channel:
+    """
+    Demodulator and frame decoder for one baud rate.
+
+    Slicing is done per block with NumPy: a moving average over one bit
+    period (matched filter for NRZ) minus a slow moving average (DC), bit
+    timing from the circular mean of the zero crossings, then one sample per
+    bit. Sync words are searched with a sliding 32 bit correlation in both
+    polarities, so an inverted discriminator output decodes as well.
+    """
+
+    def __init__(self, baud: int, sample_rate: int, decoder: "PocsagDecoder") -> None:
+        self.baud = baud
+        self.protocol = f"POCSAG{baud}"
+        self.decoder = decoder
+        self.samples_per_bit = sample_rate / baud
+        self.bit_window = max(1, int(round(self.samples_per_bit)))
+        self.dc_window = max(
+            self.bit_window, int(DC_WINDOW_BITS * self.samples_per_bit)
+        )
+        self.history = max(self.bit_window, self.dc_window) // 2 + 2
+
+        self._samples = np.zeros(0, dtype=np.float64)
+        self._next = 0.0
+        self._bits = np.zeros(0, dtype=np.uint8)
+        self._state = HUNT
+        self._inverted = False
+        self._message: Optional[_Message] = None
+
+        # Counters
+        self.batches = 0
+        self.codewords = 0
+        self.corrected_bits = 0
+        self.uncorrectable = 0
+        self.messages = 0
+
+    # ------------------------------------------------------------------
+    # Demodulation
+    # ------------------------------------------------------------------
+
+    def feed(self, samples: "np.ndarray") -> None:
+        self._samples = np.concatenate((self._samples, samples))
+        bits = self._slice()
+        if len(bits):
+            self._bits = np.concatenate((self._bits, bits))
+            self._frame()
+
+    def _slice(self) -> "np.ndarray":
+        samples = self._samples
+        total = len(samples)
+        bit_window, dc_window = self.bit_window, self.dc_window
+        if total < dc_window + bit_window:
+            return np.zeros(0, dtype=np.uint8)
+
+        # Centered moving averages via one cumulative sum
+        cumsum = np.concatenate(([0.0], np.cumsum(samples)))
+        low = max(bit_window // 2, dc_window // 2)
+        high = total - max(bit_window - bit_window // 2, dc_window - dc_window // 2)
+        centers = np.arange(low, high + 1)
+        level = (
+            cumsum[centers - bit_window // 2 + bit_window]
+            - cumsum[centers - bit_window // 2]
+        ) / bit_window
+        level -= (
+            cumsum[centers - dc_window // 2 + dc_window]
+            - cumsum[centers - dc_window // 2]
+        ) / dc_window
+
+        self._next = max(self._next, float(low))
+        self._next += self._timing_offset(level, low)
+
+        count = int(math.floor((high - self._next) / self.samples_per_bit)) + 1
+        if count <= 0:
+            return np.zeros(0, dtype=np.uint8)
+        positions = self._next + np.arange(count) * self.samples_per_bit
+        index = np.clip(np.rint(positions).astype(np.int64) - low, 0, len(level) - 1)
+        # Binary 1 is the lower FSK tone, i.e. negative discriminator output
+        bits = (level[index] < 0).astype(np.uint8)
+
+        self._next = positions[-1] + self.samples_per_bit
+        drop = max(0, int(self._next) - self.history)
+        self._samples = self._samples[drop:]
+        self._next -= drop
+        return bits
+
+    def _timing_offset(self, level: "np.ndarray", low: int) -> float:
+        """Shift that moves the sampling points to the middle of the bits."""
+        signs = np.signbit(level)
+        crossings = np.flatnonzero(signs[1:] != signs[:-1])
+        if len(crossings) < 8:
+            return 0.0
+
+        before, after = level[crossings], level[crossings + 1]
+        slope = np.abs(before - after)
+        where = low + crossings + before / (before - after)
+
+        # Bit edges should sit half a bit away from the sampling points;
+        # steep crossings (signal) outweigh the many shallow ones (noise)
+        angle = 2 * np.pi * (where - self._next) / self.samples_per_bit
+        x = np.sum(slope * np.cos(angle))
+        y = np.sum(slope * np.sin(angle))
+        if math.hypot(x, y) < 0.3 * np.sum(slope):
+            return 0.0
+
+        phase = math.atan2(y, x) - math.pi
+        phase = (phase + math.pi) % (2 * math.pi) - math.pi
+        return phase / (2 * math.pi) * self.samples_per_bit
+
+    # ------------------------------------------------------------------
+    # Framing
+    # ------------------------------------------------------------------
+
+    def _frame(self) -> None:
+        while True:
+            if self._state == HUNT:
+                if not self._hunt():
+                    return
+            elif self._state == SYNC:
+                # Another batch follows directly, otherwise the transmission ended
+                if len(self._bits) < CODEWORD_BITS:
+                    return
+                if self._sync_at_start():
+                    self._bits = self._bits[CODEWORD_BITS:]
+                    self._state = BATCH
+                else:
+                    self.finish()
+                    self._state = HUNT
+            else:
+                size = BATCH_CODEWORDS * CODEWORD_BITS
+                if len(self._bits) < size:
+                    return
+                batch, self._bits = self._bits[:size], self._bits[size:]
+                if self._inverted:
+                    batch = 1 - batch
+                self._batch(_pack(batch.reshape(BATCH_CODEWORDS, CODEWORD_BITS)))
+                self._state = SYNC
+
+    def _sync_at_start(self) -> bool:
+        word = _pack(self._bits[np.newaxis, :CODEWORD_BITS])
+        if self._inverted:
+            word = ~word
+        return int(bch.popcount(word ^ np.uint32(SYNC_CODEWORD))[0]) <= SYNC_MAX_ERRORS
+
+    def _hunt(self) -> bool:
+        """Search the first sync word (either polarity); False if none yet."""
+        if len(self._bits) < CODEWORD_BITS:
+            return False
+
+        words = _sliding_words(self._bits)
+        errors = bch.popcount(words ^ np.uint32(SYNC_CODEWORD))
+        inverted = bch.popcount(~words ^ np.uint32(SYNC_CODEWORD))
+        found = np.flatnonzero(
+            (errors <= SYNC_MAX_ERRORS) | (inverted <= SYNC_MAX_ERRORS)
+        )
+        if not len(found):
+            self._bits = self._bits[-(CODEWORD_BITS - 1) :]
+            return False
+
+        start = int(found[0])
+        self._inverted = bool(inverted[start] <= SYNC_MAX_ERRORS)
+        self._bits = self._bits[start + CODEWORD_BITS :]
+        self._state = BATCH
+        return True
+
+    def _batch(self, codewords: "np.ndarray") -> None:
+        fixed, errors = bch.correct(codewords)
+        self.batches += 1
+        self.codewords += len(fixed)
+
+        for index, (word, corrected) in enumerate(zip(fixed.tolist(), errors.tolist())):
+            if corrected < 0:
+                # Unusable codeword: end the message instead of guessing
+                self.uncorrectable += 1
+                self.finish()
+                continue
+
+            self.corrected_bits += corrected
+            if word == IDLE_CODEWORD:
+                self.finish()
+            elif word & 0x80000000:
+                if self._message is not None:
+                    self._message.words.append((word >> 11) & 0xFFFFF)
+                    self._message.corrected += corrected
+                    self._message.codewords += 1
+            else:
+                self.finish()
+                # The frame (codeword pair) carries the lowest 3 address bits
+                self._message = _Message(
+                    (((word >> 13) & 0x3FFFF) << 3) | (index // 2),
+                    (word >> 11) & 0x3,
+                    corrected,
+                )
+
+    def finish(self) -> None:
+        """Emit the message being collected, if any."""
+        message, self._message = self._message, None
+        if message is not None:
+            self.messages += 1
+            self.decoder.emit(self, message)
+
+    def flush(self) -> None:
+        """Push the remaining samples through the filters and end the message."""
+        self.feed(np.zeros(self.dc_window + self.bit_window, dtype=np.float64))
+        self.finish()
+        self._state = HUNT
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "batches": self.batches,
+            "codewords": self.codewords,
+            "corrected_bits": self.corrected_bits,
+            "uncorrectable": self.uncorrectable,
+            "messages": self.messages,
+        }
+
+
+class PocsagDecoder:
+    """
+    In-process POCSAG decoder for rtl_fm audio (signed 16 bit mono PCM).
+
+    Replaces the multimon-ng subprocess: PCM is demodulated with NumPy for
+    every configured baud rate in parallel, codewords are corrected with
+    BCH(31,21) and the result is handed out as PocsagMessage records, the
+    same records MessageHandler builds from multimon-ng lines. Unlike the
+    text output of multimon-ng, the decoder also reports how many bit
+    errors were corrected.
+
+    Audio is buffered and processed in blocks of ``block_size`` samples.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 22050,
+        baud_rates: Iterable[int] = (512, 1200, 2400),
+        charset: str = CHARSET_AUTO,
+        block_size: int = 8192,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """
+        Args:
+            sample_rate: Sample rate of the PCM input (rtl_fm -s)
+            baud_rates: POCSAG baud rates to decode
+            charset: 'alpha', 'numeric' or 'auto' (chosen from the content)
+            block_size: Samples buffered before a block is demodulated
+            logger: Optional logger instance
+
+        Raises:
+            RuntimeError: NumPy is not installed
+            ValueError: Unknown charset or a baud rate above sample_rate / 4
+        """
+        if np is None:
+            raise RuntimeError(
+                "The native POCSAG decoder requires NumPy (pip install numpy)"
+            )
+        if charset not in CHARSETS:
+            raise ValueError(f"Unknown charset: {charset}")
+        for baud in baud_rates:
+            if baud <= 0 or sample_rate / baud < 4:
+                raise ValueError(
+                    f"Baud rate {baud} is not supported at {sample_rate} Hz"
+                )
+
+        self.sample_rate = sample_rate
+        self.charset = charset
+        self.block_size = max(256, block_size)
+        self.logger = logger
+
+        self._channels = [_Channel(baud, sample_rate, self) for baud in baud_rates]
+        self._pending = bytearray()
+        self._output: List[PocsagMessage] = []
+
+        # Counters
+        self.samples = 0
+
+    def feed(self, data: bytes) -> List[PocsagMessage]:
+        """
+        Add PCM data and return the messages completed by it.
+
+        Args:
+            data: s16le samples, any length
+        """
+        self._pending += data
+        if len(self._pending) >= self.block_size * 2:
+            self._process(len(self._pending) & ~1)
+        return self._take()
+
+    def flush(self) -> List[PocsagMessage]:
+        """Decode everything still buffered (end of stream)."""
+        self._process(len(self._pending) & ~1)
+        for channel in self._channels:
+            channel.flush()
+        return self._take()
+
+    def _process(self, size: int) -> None:
+        if size <= 0:
+            return
+        samples = np.frombuffer(bytes(self._pending[:size]), dtype="<i2").astype(
+            np.float64
+        )
+        del self._pending[:size]
+        self.samples += len(samples)
+        for channel in self._channels:
+            channel.feed(samples)
+
+    def _take(self) -> List[PocsagMessage]:
+        output, self._output = self._output, []
+        return output
+
+    def emit(self, channel: _Channel, message: _Message) -> None:
+        message_type, text = self._decode_content(message)
+        record = PocsagMessage(
+            channel.protocol,
+            str(message.address),
+            str(message.function),
+            message_type,
+            text,
+            decoded_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        )
+        self._output.append(record)
+
+        if self.logger:
+            self.logger.debug(
+                "%s: address %s, %d codewords, %d bits corrected",
+                channel.protocol,
+                record.address,
+                message.codewords,
+                message.corrected,
+            )
+
+    def _decode_content(self, message: _Message) -> Tuple[str, str]:
+        if not message.words:
+            return "tone", ""
+
+        bits = "".join(f"{word:020b}" for word in message.words)
+        if self.charset == CHARSET_ALPHA:
+            return "alpha", self.decode_alpha(bits)
+        numeric = self.decode_numeric(bits)
+        if self.charset == CHARSET_NUMERIC:
+            return "numeric", numeric
+
+        # Like multimon-ng -f auto: digits-only content without an alpha
+        # terminator is numeric, printable text is alpha
+        raw = self._alpha_chars(bits)
+        terminated = raw.rstrip("\x00 ").endswith(ALPHA_TERMINATORS)
+        if not terminated and set(numeric) <= NUMERIC_DIGITS:
+            return "numeric", numeric
+        alpha = self.decode_alpha(bits)
+        if alpha and all(char.isprintable() or char in "\r\n" for char in alpha):
+            return "alpha", alpha
+        return "numeric", numeric
+
+    @staticmethod
+    def _alpha_chars(bits: str) -> str:
+        return "".join(
+            chr(int(bits[offset : offset + 7][::-1], 2))
+            for offset in range(0, len(bits) - 6, 7)
+        )
+
+    @classmethod
+    def decode_alpha(cls, bits: str) -> str:
+        """7 bit ASCII characters, each sent least significant bit first."""
+        return cls._alpha_chars(bits).rstrip(ALPHA_TRAILER).replace("\x00", "")
+
+    @staticmethod
+    def decode_numeric(bits: str) -> str:
+        """4 bit BCD characters, each sent least significant bit first."""
+        chars = (
+            NUMERIC_CHARS[int(bits[offset : offset + 4][::-1], 2)]
+            for offset in range(0, len(bits) - 3, 4)
+        )
+        return "".join(chars).rstrip()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "samples": self.samples,
+            **{channel.protocol: channel.stats() for channel in self._channels},
+        }
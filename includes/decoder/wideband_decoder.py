@@ -0,0 +1,96 @@
+from typing import Any, Dict, Iterable, List, Optional
+import logging
+
+from includes.handlers import PocsagMessage
+from .channelizer import Channelizer
+from .pocsag_decoder import PocsagDecoder, CHARSET_AUTO
+
+
+class WidebandDecoder:
+    """
+    POCSAG on several frequencies from one rtl_sdr stream.
+
+    A Channelizer turns the u8 I/Q into one FM audio stream per channel,
+    each feeding its own PocsagDecoder. Same interface as PocsagDecoder
+    (feed/flush/stats); the messages carry the channel name as ``source``.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        center_frequency: float,
+        channels: Dict[str, float],
+        channel_rate: int = 24000,
+        baud_rates: Iterable[int] = (512, 1200, 2400),
+        charset: str = CHARSET_AUTO,
+        block_size: int = 8192,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """
+        Args:
+            sample_rate: rtl_sdr sample rate (-s), a multiple of ``channel_rate``
+            center_frequency: rtl_sdr tuning frequency (-f) in Hz
+            channels: Channel name -> frequency in Hz
+            channel_rate: Audio sample rate of every channel
+            baud_rates: POCSAG baud rates to decode on every channel
+            charset: 'alpha', 'numeric' or 'auto'
+            block_size: Audio samples buffered per channel before decoding
+            logger: Optional logger instance
+
+        Raises:
+            RuntimeError: NumPy is not installed
+            ValueError: Invalid rates or a channel outside the captured band
+        """
+        self.channelizer = Channelizer(
+            sample_rate,
+            center_frequency,
+            channels,
+            channel_rate=channel_rate,
+            logger=logger,
+        )
+        self.decoders = {
+            name: PocsagDecoder(
+                sample_rate=channel_rate,
+                baud_rates=baud_rates,
+                charset=charset,
+                block_size=block_size,
+                logger=logger,
+            )
+            for name in channels
+        }
+
+    def feed(self, data: bytes) -> List[PocsagMessage]:
+        """
+        Add rtl_sdr output and return the messages completed by it.
+
+        Args:
+            data: Interleaved u8 I/Q bytes, any length
+        """
+        messages: List[PocsagMessage] = []
+        for name, audio in self.channelizer.feed(data).items():
+            if len(audio):
+                messages.extend(
+                    self._tag(name, self.decoders[name].feed(audio.tobytes()))
+                )
+        return messages
+
+    def flush(self) -> List[PocsagMessage]:
+        """Decode everything still buffered (end of stream)."""
+        messages: List[PocsagMessage] = []
+        for name, decoder in self.decoders.items():
+            messages.extend(self._tag(name, decoder.flush()))
+        return messages
+
+    @staticmethod
+    def _tag(name: str, messages: List[PocsagMessage]) -> List[PocsagMessage]:
+        for message in messages:
+            message.source = name
+        return messages
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "channelizer": self.channelizer.stats(),
+            "channels": {
+                name: decoder.stats() for name, decoder in self.decoders.items()
+            },
+        }
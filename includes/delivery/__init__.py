@@ -0,0 +1,5 @@
+from .send_queue import SendQueue, DEFERRED
+from .outbox import Outbox
+from .errors import BulkNotSupportedError
+
+__all__ = ["SendQueue", "Outbox", "BulkNotSupportedError", "DEFERRED"]
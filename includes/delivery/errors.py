@@ -0,0 +1,2 @@
+class BulkNotSupportedError(Exception):
+    """Raised when the API has no bulk message endpoint; send single messages instead."""
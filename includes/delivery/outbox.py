@@ -0,0 +1,472 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
+import logging
+
+from .errors import BulkNotSupportedError
+from .send_queue import DEFERRED
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at REAL NOT NULL,
+    payload TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    delivered_at REAL,
+    dead INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS outbox_pending
+    ON outbox (id) WHERE delivered_at IS NULL AND dead = 0;
+"""
+
+# Responses that will never succeed on retry (validation errors, oversized payload)
+PERMANENT_STATUS_CODES = (400, 413, 422)
+
+
+class Outbox:
+    """
+    Durable store-and-forward outbox for API delivery.
+
+    Every payload is committed to a SQLite database (WAL mode) before the
+    first delivery attempt and marked delivered once the API accepted it.
+    Anything that could not be delivered - API down, process restarted,
+    item dropped from the send queue - stays pending and is replayed in
+    insertion order, at a limited rate, by a background thread.
+
+    While a backlog exists, live deliveries are deferred to the replay
+    thread so messages reach the API in the order they were received.
+
+    Replay uses bulk requests of up to batch_size messages when a
+    batch_sender is configured.
+
+    Payloads the API rejects as invalid (400, 413, 422) are marked dead
+    instead of blocking the replay forever.
+
+    A row is only sent while it is pending and not in flight on another
+    thread, so a live delivery whose claim expired does not send a row
+    again that the replay thread has delivered meanwhile (and vice versa).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        sender: Optional[Callable[[Dict[str, Any]], Any]] = None,
+        batch_sender: Optional[Callable[[List[Dict[str, Any]]], Any]] = None,
+        batch_size: int = 1,
+        replay_rate: float = 5.0,
+        retry_delay: float = 5.0,
+        max_retry_delay: float = 300.0,
+        claim_timeout: float = 60.0,
+        retention: float = 86400.0,
+        synchronous: str = "NORMAL",
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """
+        Args:
+            path: Path of the SQLite database file
+            sender: Callable posting one payload, raises on failure
+            batch_sender: Callable posting a list of payloads in one request, raises
+                BulkNotSupportedError if the API has no bulk endpoint
+            batch_size: Maximum payloads per replayed bulk request
+            replay_rate: Maximum replayed messages per second
+            retry_delay: Initial delay after a failed replay attempt (seconds)
+            max_retry_delay: Upper bound for the exponential retry delay (seconds)
+            claim_timeout: Seconds a live delivery owns a row before replay may take it
+            retention: Seconds delivered rows are kept before they are purged
+            synchronous: SQLite synchronous mode ('NORMAL' or 'FULL')
+            logger: Optional logger instance
+        """
+        self.path = path
+        self.sender = sender
+        self.batch_sender = batch_sender
+        self.batch_size = max(1, batch_size)
+        self.replay_rate = replay_rate
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.claim_timeout = claim_timeout
+        self.retention = retention
+        self.logger = logger
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._claimed: Dict[int, float] = {}
+        # Rows being sent right now (live delivery or replay)
+        self._sending: Set[int] = set()
+        # stop() left closing the database to a replay thread still sending
+        self._close_on_exit = False
+        self._last_purge = 0.0
+
+        # Counters
+        self.added = 0
+        self.delivered = 0
+        self.deferred = 0
+        self.failed = 0
+        self.dead = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._db: Optional[sqlite3.Connection] = sqlite3.connect(
+            path, check_same_thread=False
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(f"PRAGMA synchronous={synchronous}")
+        self._db.executescript(SCHEMA)
+        self._db.commit()
+
+        self._backlog = self.pending_count() > 0
+
+    # ------------------------------------------------------------------
+    # Live path
+    # ------------------------------------------------------------------
+
+    def add(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Persist a payload before delivery.
+
+        Returns:
+            Outbox item ({"id": ..., "payload": ...}) to hand to deliver()
+        """
+        encoded = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            if self._db is None:
+                raise sqlite3.ProgrammingError("Outbox is closed")
+            cursor = self._db.execute(
+                "INSERT INTO outbox (created_at, payload) VALUES (?, ?)",
+                (time.time(), encoded),
+            )
+            self._db.commit()
+            row_id = cursor.lastrowid
+            self._claimed[row_id] = time.monotonic()
+            self.added += 1
+        return {"id": row_id, "payload": payload}
+
+    def deliver(self, item: Dict[str, Any]) -> Union[bool, str]:
+        """
+        Deliver an item returned by add().
+
+        Returns:
+            True if the item was delivered, DEFERRED if it was handed over
+            to the replay thread, False if the delivery attempt failed
+        """
+        return self.deliver_many([item])
+
+    def deliver_many(self, items: List[Dict[str, Any]]) -> Union[bool, str]:
+        """
+        Deliver items returned by add(), as one bulk request if possible.
+
+        Returns:
+            True if the items were delivered, DEFERRED if they were handed
+            over to the replay thread, False if the backend is unavailable
+        """
+        row_ids = [item["id"] for item in items]
+
+        if self._backlog:
+            # Older messages are still pending: keep order, let replay send them
+            self._release(row_ids)
+            with self._lock:
+                self.deferred += len(items)
+            self._wake.set()
+            return DEFERRED
+
+        try:
+            return self._send_rows([(item["id"], item["payload"]) for item in items])
+        finally:
+            self._release(row_ids)
+
+    def _send_rows(self, rows: List[Tuple[int, Dict[str, Any]]]) -> bool:
+        """
+        Send rows as one bulk request, falling back to single requests.
+
+        Rows already delivered, dead or in flight on another thread are
+        skipped.
+
+        Returns:
+            False if the backend is unavailable (rows stay pending)
+        """
+        taken = self._take([row_id for row_id, _ in rows])
+        try:
+            return self._post_rows([row for row in rows if row[0] in taken])
+        finally:
+            with self._lock:
+                self._sending -= taken
+
+    def _take(self, row_ids: List[int]) -> Set[int]:
+        """Mark the rows that are still pending and not in flight as being sent."""
+        if not row_ids:
+            return set()
+        placeholders = ",".join("?" * len(row_ids))
+        with self._lock:
+            if self._db is None:
+                return set()
+            pending = {
+                row_id
+                for (row_id,) in self._db.execute(
+                    f"SELECT id FROM outbox WHERE id IN ({placeholders}) "
+                    "AND delivered_at IS NULL AND dead = 0",
+                    row_ids,
+                )
+            }
+            taken = pending - self._sending
+            self._sending |= taken
+        return taken
+
+    def _post_rows(self, rows: List[Tuple[int, Dict[str, Any]]]) -> bool:
+        if not rows:
+            return True
+
+        if len(rows) > 1 and self.batch_sender:
+            row_ids = [row_id for row_id, _ in rows]
+            try:
+                self.batch_sender([payload for _, payload in rows])
+            except BulkNotSupportedError:
+                pass
+            except Exception as e:
+                if not self._is_permanent(e):
+                    self._record_failure(row_ids, e)
+                    return False
+                # Rejected batch: send one by one to isolate the invalid message
+            else:
+                self.mark_delivered(row_ids)
+                return True
+
+        for row_id, payload in rows:
+            try:
+                self.sender(payload)
+            except Exception as e:
+                self._record_failure([row_id], e)
+                if self._is_permanent(e):
+                    continue
+                return False
+            self.mark_delivered([row_id])
+        return True
+
+    def _release(self, row_ids: List[int]) -> None:
+        with self._lock:
+            for row_id in row_ids:
+                self._claimed.pop(row_id, None)
+
+    def mark_delivered(self, row_ids: List[int]) -> None:
+        now = time.time()
+        with self._lock:
+            if self._db is None:
+                return
+            self._db.executemany(
+                "UPDATE outbox SET delivered_at = ? WHERE id = ?",
+                [(now, row_id) for row_id in row_ids],
+            )
+            self._db.commit()
+            self.delivered += len(row_ids)
+
+    def _record_failure(self, row_ids: List[int], error: Exception) -> None:
+        permanent = self._is_permanent(error)
+        with self._lock:
+            if self._db is None:
+                return
+            self._db.executemany(
+                "UPDATE outbox SET attempts = attempts + 1, last_error = ?, dead = ? "
+                "WHERE id = ?",
+                [
+                    (str(error)[:500], 1 if permanent else 0, row_id)
+                    for row_id in row_ids
+                ],
+            )
+            self._db.commit()
+            if permanent:
+                self.dead += len(row_ids)
+            else:
+                self.failed += len(row_ids)
+                self._backlog = True
+
+        if permanent:
+            if self.logger:
+                self.logger.error(
+                    "Outbox message %s rejected permanently: %s", row_ids, error
+                )
+        else:
+            if self.logger:
+                self.logger.warning(
+                    "Outbox: %d message(s) not delivered, will replay: %s",
+                    len(row_ids),
+                    error,
+                )
+            self._wake.set()
+
+    @staticmethod
+    def _is_permanent(error: Exception) -> bool:
+        response = getattr(error, "response", None)
+        status = getattr(response, "status_code", None)
+        return status in PERMANENT_STATUS_CODES
+
+    # ------------------------------------------------------------------
+    # Replay
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start the replay thread."""
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._replay_loop, name="outbox-replay", daemon=True
+        )
+        self._thread.start()
+
+        if self.logger:
+            self.logger.info(
+                "Outbox started (%s, %d pending)", self.path, self.pending_count()
+            )
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Stop the replay thread and close the database.
+
+        A replay request still in flight after ``timeout`` seconds is left
+        to finish; the replay thread records its result and closes the
+        database when it exits.
+        """
+        self._stop_event.set()
+        self._wake.set()
+        thread, self._thread = self._thread, None
+        if thread:
+            thread.join(timeout)
+        with self._lock:
+            if thread and thread.is_alive():
+                self._close_on_exit = True
+                if self.logger:
+                    self.logger.warning(
+                        "Outbox replay request still in flight, closing the "
+                        "database when it completes"
+                    )
+            else:
+                self._close()
+
+    def _close(self) -> None:
+        """Close the database (lock held). Later writes are skipped."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def pending(self, limit: int = 100) -> List[Tuple[int, Dict[str, Any]]]:
+        """Oldest undelivered payloads that are not owned by a live delivery."""
+        now = time.monotonic()
+        with self._lock:
+            if self._db is None:
+                return []
+            rows = self._db.execute(
+                "SELECT id, payload FROM outbox "
+                "WHERE delivered_at IS NULL AND dead = 0 ORDER BY id LIMIT ?",
+                (limit,),
+            ).fetchall()
+            claimed = {
+                row_id
+                for row_id, since in self._claimed.items()
+                if now - since < self.claim_timeout
+            } | self._sending
+
+        return [
+            (row_id, json.loads(payload))
+            for row_id, payload in rows
+            if row_id not in claimed
+        ]
+
+    def pending_count(self) -> int:
+        with self._lock:
+            if self._db is None:
+                return 0
+            return self._db.execute(
+                "SELECT COUNT(*) FROM outbox WHERE delivered_at IS NULL AND dead = 0"
+            ).fetchone()[0]
+
+    def _replay_loop(self) -> None:
+        try:
+            self._replay()
+        finally:
+            with self._lock:
+                if self._close_on_exit:
+                    self._close()
+
+    def _replay(self) -> None:
+        delay = self.retry_delay
+        interval = 1.0 / self.replay_rate if self.replay_rate > 0 else 0.0
+
+        while not self._stop_event.is_set():
+            self._maybe_purge()
+
+            batch = self.pending()
+            if not batch:
+                # Rows may still be owned by live deliveries; only clear the
+                # backlog once nothing at all is pending
+                if self._backlog and self.pending_count() == 0:
+                    self._backlog = False
+                    if self.logger:
+                        self.logger.info("Outbox backlog replayed")
+                self._wake.wait(self.claim_timeout if not self._backlog else 1.0)
+                self._wake.clear()
+                continue
+
+            if not self._backlog:
+                # Abandoned rows (e.g. dropped from the send queue)
+                self._backlog = True
+
+            if self.logger:
+                self.logger.info(
+                    "Outbox replaying %d pending messages (rate %.1f/s)",
+                    self.pending_count(),
+                    self.replay_rate,
+                )
+
+            for start in range(0, len(batch), self.batch_size):
+                if self._stop_event.is_set():
+                    return
+
+                rows = batch[start : start + self.batch_size]
+                started = time.monotonic()
+                if not self._send_rows(rows):
+                    # Backend still unavailable: back off and start over
+                    self._stop_event.wait(delay)
+                    delay = min(delay * 2, self.max_retry_delay)
+                    break
+
+                delay = self.retry_delay
+                remaining = interval * len(rows) - (time.monotonic() - started)
+                if remaining > 0:
+                    self._stop_event.wait(remaining)
+
+    def _maybe_purge(self) -> None:
+        """Delete delivered rows older than the retention period (hourly)."""
+        now = time.time()
+        if now - self._last_purge < 3600:
+            return
+        self._last_purge = now
+
+        with self._lock:
+            if self._db is None:
+                return
+            cursor = self._db.execute(
+                "DELETE FROM outbox WHERE delivered_at IS NOT NULL AND delivered_at < ?",
+                (now - self.retention,),
+            )
+            self._db.commit()
+
+        if cursor.rowcount and self.logger:
+            self.logger.info("Outbox purged %d delivered messages", cursor.rowcount)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending": self.pending_count(),
+            "backlog": self._backlog,
+            "added": self.added,
+            "delivered": self.delivered,
+            "deferred": self.deferred,
+            "failed": self.failed,
+            "dead": self.dead,
+        }
@@ -0,0 +1,455 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Union
+import logging
+
+POLICY_BLOCK = "block"
+POLICY_DROP_OLDEST = "drop_oldest"
+POLICY_SPILL = "spill"
+POLICIES = (POLICY_BLOCK, POLICY_DROP_OLDEST, POLICY_SPILL)
+
+# Sender result: the item was handed to another delivery path (the outbox
+# replay) and is not sent yet; counted as deferred, not as sent
+DEFERRED = "deferred"
+
+
+class SendQueue:
+    """
+    Bounded in-memory queue between the decode loop and the API.
+
+    Items are handed to ``sender`` by a pool of worker threads, so the
+    multimon-ng read loop never waits for an HTTP round trip. When the
+    queue is full, the backpressure policy decides what happens:
+
+    - block:       put() waits for a free slot (up to block_timeout, then drops)
+    - drop_oldest: the oldest queued item is discarded to make room
+    - spill:       the item is appended to a JSONL spill file and read back
+                   once the in-memory queue has drained
+
+    Items must be JSON serializable when the spill policy is used, or an
+    encoder/decoder pair must convert them to and from JSON values.
+
+    With a batch_sender and batch_size > 1, workers coalesce queued items
+    into batches closed by count, estimated byte size or a linger deadline.
+    """
+
+    def __init__(
+        self,
+        sender: Callable[[Any], Union[bool, str]],
+        max_size: int = 1000,
+        workers: int = 2,
+        policy: str = POLICY_BLOCK,
+        block_timeout: Optional[float] = None,
+        spill_dir: Optional[str] = None,
+        stats_interval: int = 60,
+        batch_sender: Optional[Callable[[List[Any]], Union[bool, str]]] = None,
+        batch_size: int = 1,
+        batch_max_bytes: int = 0,
+        batch_linger: float = 0.0,
+        sizer: Optional[Callable[[Any], int]] = None,
+        encoder: Optional[Callable[[Any], Any]] = None,
+        decoder: Optional[Callable[[Any], Any]] = None,
+        name: str = "send-queue",
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """
+        Args:
+            sender: Callable delivering one item, returns True on success or
+                DEFERRED if another path delivers it later
+            max_size: Maximum number of items held in memory
+            workers: Number of sender threads
+            policy: Backpressure policy ('block', 'drop_oldest' or 'spill')
+            block_timeout: Max seconds put() blocks with the 'block' policy (None = forever)
+            spill_dir: Directory for the spill file (required for 'spill')
+            stats_interval: Log queue statistics every N seconds while busy (0 = off)
+            batch_sender: Callable delivering a list of items, returns like sender
+            batch_size: Maximum items per batch (1 = no batching)
+            batch_max_bytes: Maximum estimated batch size in bytes (0 = no limit)
+            batch_linger: Max seconds to wait for more items after the first one
+            sizer: Callable estimating the encoded size of one item in bytes
+            encoder: Callable turning an item into a JSON value for the spill file
+            decoder: Callable restoring an item from its spilled JSON value
+            name: Name used for threads and the spill file
+            logger: Optional logger instance
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown send queue policy: {policy}")
+        if policy == POLICY_SPILL and not spill_dir:
+            raise ValueError("spill_dir is required for the 'spill' policy")
+
+        self.sender = sender
+        self.max_size = max(1, max_size)
+        self.workers = max(1, workers)
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.stats_interval = stats_interval
+        self.batch_sender = batch_sender
+        self.batch_size = max(1, batch_size)
+        self.batch_max_bytes = batch_max_bytes
+        self.batch_linger = batch_linger
+        self.sizer = sizer
+        self.encoder = encoder
+        self.decoder = decoder
+        self.name = name
+        self.logger = logger
+
+        self._queue: Deque[Any] = deque()
+        self._cond = threading.Condition()
+        self._not_full = threading.Condition(self._cond)
+        self._threads: List[threading.Thread] = []
+        self._stopping = False
+        self._in_flight = 0
+
+        # Spill file: items beyond max_size, read back in FIFO order
+        self.spill_path = (
+            os.path.join(spill_dir, f"{name}.spill.jsonl") if spill_dir else None
+        )
+        self._spill_offset = 0
+        self._spilled = 0
+
+        # Counters
+        self.enqueued = 0
+        self.sent = 0
+        self.deferred = 0
+        self.failed = 0
+        self.dropped = 0
+        self.batches = 0
+        self._completions: Deque[float] = deque()
+        self._rate_window = 60.0
+        self._last_stats = time.monotonic()
+
+        if self.spill_path:
+            os.makedirs(spill_dir, exist_ok=True)
+            self._spilled = self._count_spilled()
+
+    def start(self) -> None:
+        """Start the sender worker threads."""
+        if self._threads:
+            return
+
+        self._stopping = False
+        for index in range(self.workers):
+            thread = threading.Thread(
+                target=self._worker_loop,
+                name=f"{self.name}-{index}",
+                daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+
+        if self.logger:
+            self.logger.info(
+                "Send queue started (workers=%d, max_size=%d, policy=%s, spilled=%d)",
+                self.workers,
+                self.max_size,
+                self.policy,
+                self._spilled,
+            )
+
+    def put(self, item: Any) -> bool:
+        """
+        Queue an item for delivery.
+
+        Returns:
+            True if the item was queued (or spilled), False if it was dropped
+        """
+        with self._cond:
+            if self._stopping:
+                return False
+
+            if len(self._queue) >= self.max_size or (
+                self.policy == POLICY_SPILL and self._spilled
+            ):
+                if not self._handle_full(item):
+                    return False
+                if self.policy == POLICY_SPILL:
+                    return True
+
+            self._queue.append(item)
+            self.enqueued += 1
+            self._cond.notify()
+            return True
+
+    def _handle_full(self, item: Any) -> bool:
+        """Apply the backpressure policy. Called with the lock held."""
+        if self.policy == POLICY_DROP_OLDEST:
+            if len(self._queue) >= self.max_size:
+                self._queue.popleft()
+                self.dropped += 1
+                if self.logger:
+                    self.logger.warning("Send queue full, dropped oldest item")
+            return True
+
+        if self.policy == POLICY_SPILL:
+            # Keep FIFO order: once something is spilled, new items follow it
+            try:
+                self._spill(item)
+                self.enqueued += 1
+                self._cond.notify()
+                return True
+            except (IOError, TypeError, ValueError) as e:
+                self.dropped += 1
+                if self.logger:
+                    self.logger.error("Failed to spill item to disk, dropped: %s", e)
+                return False
+
+        deadline = (
+            time.monotonic() + self.block_timeout
+            if self.block_timeout is not None
+            else None
+        )
+        while len(self._queue) >= self.max_size and not self._stopping:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                self.dropped += 1
+                if self.logger:
+                    self.logger.warning(
+                        "Send queue full for %.1fs, dropped item", self.block_timeout
+                    )
+                return False
+            self._not_full.wait(remaining)
+        return not self._stopping
+
+    def _worker_loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._stopping:
+                    if self._spilled:
+                        self._refill_from_spill()
+                        if self._queue:
+                            break
+                    self._cond.wait(1.0)
+                    self._maybe_log_stats()
+
+                if not self._queue:
+                    return
+
+                batch = self._collect_batch()
+                self._in_flight += len(batch)
+                self._not_full.notify(len(batch))
+
+            result: Union[bool, str] = False
+            try:
+                if len(batch) == 1:
+                    result = self.sender(batch[0])
+                else:
+                    result = self.batch_sender(batch)
+            except Exception as e:
+                if self.logger:
+                    self.logger.error("Send queue worker error: %s", e)
+
+            with self._cond:
+                self._in_flight -= len(batch)
+                if len(batch) > 1:
+                    self.batches += 1
+                if result == DEFERRED:
+                    self.deferred += len(batch)
+                elif result:
+                    self.sent += len(batch)
+                    now = time.monotonic()
+                    self._completions.extend([now] * len(batch))
+                    self._prune_completions(now)
+                else:
+                    self.failed += len(batch)
+                self._maybe_log_stats()
+                self._cond.notify_all()
+
+    def _collect_batch(self) -> List[Any]:
+        """
+        Take the next item, plus more while batching is enabled.
+
+        A batch is closed when it reaches batch_size items, batch_max_bytes
+        or when batch_linger seconds passed since its first item. Called
+        with the lock held and at least one item queued.
+        """
+        batch = [self._queue.popleft()]
+        if self.batch_size <= 1 or not self.batch_sender:
+            return batch
+
+        size = self.sizer(batch[0]) if self.sizer else 0
+        deadline = time.monotonic() + self.batch_linger
+
+        while len(batch) < self.batch_size:
+            if not self._queue:
+                if self._spilled:
+                    self._refill_from_spill()
+                remaining = deadline - time.monotonic()
+                if not self._queue and (remaining <= 0 or self._stopping):
+                    break
+                if not self._queue:
+                    self._cond.wait(remaining)
+                    continue
+
+            if self.sizer and self.batch_max_bytes:
+                item_size = self.sizer(self._queue[0])
+                if size + item_size > self.batch_max_bytes:
+                    break
+                size += item_size
+
+            batch.append(self._queue.popleft())
+
+        return batch
+
+    # ------------------------------------------------------------------
+    # Spill file
+    # ------------------------------------------------------------------
+
+    def _encode(self, item: Any) -> str:
+        if self.encoder:
+            item = self.encoder(item)
+        return json.dumps(item, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+    def _decode(self, line: str) -> Any:
+        item = json.loads(line)
+        return self.decoder(item) if self.decoder else item
+
+    def _spill(self, item: Any) -> None:
+        line = self._encode(item)
+        with open(self.spill_path, "a", encoding="utf-8") as f:
+            f.write(line)
+        self._spilled += 1
+
+    def _refill_from_spill(self) -> None:
+        """Move spilled items back into memory. Called with the lock held."""
+        if not os.path.exists(self.spill_path):
+            self._spilled = 0
+            return
+
+        with open(self.spill_path, "r", encoding="utf-8") as f:
+            f.seek(self._spill_offset)
+            while len(self._queue) < self.max_size:
+                line = f.readline()
+                if not line.endswith("\n"):
+                    break
+                try:
+                    self._queue.append(self._decode(line))
+                except (ValueError, KeyError, TypeError):
+                    pass
+                self._spilled -= 1
+            self._spill_offset = f.tell()
+
+        if self._spilled <= 0:
+            # Everything read back: start over with an empty spill file
+            os.remove(self.spill_path)
+            self._spill_offset = 0
+            self._spilled = 0
+
+    def _count_spilled(self) -> int:
+        """Count items left in the spill file by a previous run."""
+        if not os.path.exists(self.spill_path):
+            return 0
+        with open(self.spill_path, "r", encoding="utf-8") as f:
+            return sum(1 for line in f if line.endswith("\n"))
+
+    # ------------------------------------------------------------------
+    # Statistics
+    # ------------------------------------------------------------------
+
+    def depth(self) -> int:
+        """Number of items waiting (in memory and spilled)."""
+        with self._cond:
+            return len(self._queue) + self._spilled
+
+    def drain_rate(self) -> float:
+        """Successfully sent items per second over the last minute."""
+        with self._cond:
+            return self._drain_rate()
+
+    def _drain_rate(self) -> float:
+        self._prune_completions(time.monotonic())
+        return len(self._completions) / self._rate_window
+
+    def _prune_completions(self, now: float) -> None:
+        while self._completions and self._completions[0] < now - self._rate_window:
+            self._completions.popleft()
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of queue depth, drain rate and counters."""
+        with self._cond:
+            return self._stats()
+
+    def _stats(self) -> Dict[str, Any]:
+        return {
+            "depth": len(self._queue) + self._spilled,
+            "in_memory": len(self._queue),
+            "spilled": self._spilled,
+            "in_flight": self._in_flight,
+            "enqueued": self.enqueued,
+            "sent": self.sent,
+            "deferred": self.deferred,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "drain_rate": round(self._drain_rate(), 3),
+        }
+
+    def _maybe_log_stats(self) -> None:
+        if not self.stats_interval or not self.logger:
+            return
+        now = time.monotonic()
+        if now - self._last_stats < self.stats_interval:
+            return
+        self._last_stats = now
+        if self._queue or self._spilled or self._completions:
+            self.logger.info("Send queue stats: %s", self._stats())
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """
+        Stop the workers after draining the queue for up to ``timeout`` seconds.
+
+        With the spill policy, items still in memory are written to the spill
+        file so they are picked up on the next start.
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while (self._queue or self._in_flight) and time.monotonic() < deadline:
+                self._cond.wait(min(0.5, max(0.0, deadline - time.monotonic())))
+
+            self._stopping = True
+            leftover = list(self._queue)
+            self._queue.clear()
+            self._cond.notify_all()
+            # Wake put() calls blocked on a full queue
+            self._not_full.notify_all()
+
+        for thread in self._threads:
+            thread.join(max(0.0, deadline - time.monotonic()) or 0.1)
+        self._threads = []
+
+        if self.policy == POLICY_SPILL:
+            with self._cond:
+                self._persist_leftover(leftover)
+        elif leftover and self.logger:
+            self.logger.warning(
+                "Send queue stopped with %d undelivered items", len(leftover)
+            )
+
+    def _persist_leftover(self, leftover: List[Any]) -> None:
+        """Rewrite the spill file as leftover items followed by the unread spill tail."""
+        if not leftover and not self._spill_offset:
+            return
+
+        tail = ""
+        if os.path.exists(self.spill_path):
+            with open(self.spill_path, "r", encoding="utf-8") as f:
+                f.seek(self._spill_offset)
+                tail = f.read()
+
+        tmp_path = f"{self.spill_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for item in leftover:
+                f.write(self._encode(item))
+            f.write(tail)
+        os.replace(tmp_path, self.spill_path)
+        self._spill_offset = 0
+        self._spilled += len(leftover)
+
+        if self.logger and self._spilled:
+            self.logger.info(
+                "Send queue stopped, %d items kept in %s",
+                self._spilled,
+                self.spill_path,
+            )
@@ -1,4 +1,14 @@
 from .message_handler import MessageHandler
 from .command_handler import CommandHandler
+from .duplicate_filter import DuplicateFilter
+from .pocsag_message import PocsagMessage
+from .compact_batch import decode_compact_batch, encode_compact_batch
 
-__all__ = ["MessageHandler", "CommandHandler"]
+__all__ = [
+    "MessageHandler",
+    "CommandHandler",
+    "DuplicateFilter",
+    "PocsagMessage",
+    "decode_compact_batch",
+    "encode_compact_batch",
+]
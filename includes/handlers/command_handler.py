@@ -1,12 +1,13 @@
 import os
 import sys
 import subprocess
-from typing import Optional, Dict, Any
+from datetime import datetime
+from typing import Callable, List, Optional, Dict, Any
 import logging
 
 
 class CommandHandler:
-    """Handler for processing remote commands (restart, update)."""
+    """Handler for processing remote commands (restart, update, audio_snapshot)."""
 
     def __init__(
         self,
@@ -16,6 +17,12 @@ class CommandHandler:
         self.install_dir = install_dir
         self.logger = logger
 
+        # Set by noxfeed.py when the audio recording is enabled:
+        # (timestamp, before, after) -> written WAV files
+        self.on_audio_snapshot: Optional[
+            Callable[[datetime, float, float], List[str]]
+        ] = None
+
     def handle_command(
         self, command: str, params: Optional[Dict[str, Any]] = None
     ) -> bool:
@@ -26,6 +33,8 @@ class CommandHandler:
         - restart: Restart the application
         - update: Pull latest changes and restart
         - reload_config: Reload configuration
+        - audio_snapshot: Save the recorded audio around a point in time as WAV
+          (params: timestamp (ISO 8601, default now), before, after in seconds)
         """
         if self.logger:
             self.logger.info("Received command: %s with params: %s", command, params)
@@ -37,6 +46,8 @@ class CommandHandler:
                 return self._update()
             elif command == "reload_config":
                 return True  # Handled by config update mechanism
+            elif command == "audio_snapshot":
+                return self._audio_snapshot(params or {})
             else:
                 if self.logger:
                     self.logger.warning("Unknown command: %s", command)
@@ -64,6 +75,26 @@ class CommandHandler:
                 self.logger.error("Restart failed: %s", e)
             return False
 
+    def _audio_snapshot(self, params: Dict[str, Any]) -> bool:
+        """Save the audio around a message from the rolling recording."""
+        if self.on_audio_snapshot is None:
+            if self.logger:
+                self.logger.warning(
+                    "Audio snapshot requested, but audio_tee is disabled"
+                )
+            return False
+
+        timestamp = params.get("timestamp")
+        when = datetime.fromisoformat(timestamp) if timestamp else datetime.now()
+
+        kwargs = {
+            key: float(params[key]) for key in ("before", "after") if key in params
+        }
+        paths = self.on_audio_snapshot(when, **kwargs)
+        if self.logger:
+            self.logger.info("Audio snapshot for %s: %s", when, paths or "no audio")
+        return bool(paths)
+
     def _update(self) -> bool:
         """Execute update script and restart."""
         if self.logger:
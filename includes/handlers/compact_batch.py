@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+# Value of "format" in a compact bulk body
+COMPACT_FORMAT = "compact-v1"
+# Leading columns; further payload keys (source, frequency) follow in order of appearance
+BASE_COLUMNS = ("timestamp", "ric", "subric", "message")
+
+
+def encode_compact_batch(payloads: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Bulk request body with the field names sent once instead of per message.
+
+    Every message becomes a row of values in ``columns`` order; trailing
+    empty values are left out. Timestamps are whole milliseconds relative
+    to ``base_time`` (the first message's timestamp, millisecond
+    precision). Falls back to the plain ``{"messages": [...]}`` body if a
+    timestamp can not be parsed or naive and aware timestamps are mixed.
+
+    Example:
+        {"format": "compact-v1", "base_time": "2026-03-08T14:23:45.123",
+         "columns": ["timestamp", "ric", "subric", "message"],
+         "rows": [[0, "1234567", "3", "Test"], [333, "1234568", "0", "Second"]]}
+    """
+    columns = list(BASE_COLUMNS)
+    for payload in payloads:
+        for key in payload:
+            if key not in columns:
+                columns.append(key)
+
+    try:
+        times = [datetime.fromisoformat(payload["timestamp"]) for payload in payloads]
+        base = times[0].replace(microsecond=times[0].microsecond // 1000 * 1000)
+        offsets = [round((when - base) / timedelta(milliseconds=1)) for when in times]
+    except (KeyError, IndexError, TypeError, ValueError):
+        return {"messages": payloads}
+
+    rows = []
+    for offset, payload in zip(offsets, payloads):
+        row = [offset] + [payload.get(column) for column in columns[1:]]
+        while row[-1] is None:
+            row.pop()
+        rows.append(row)
+
+    return {
+        "format": COMPACT_FORMAT,
+        "base_time": base.isoformat(timespec="milliseconds"),
+        "columns": columns,
+        "rows": rows,
+    }
+
+
+def decode_compact_batch(body: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Messages of a bulk request body, compact or plain (reference for the server).
+
+    Raises:
+        ValueError: Unknown format or malformed rows
+    """
+    if body.get("format") is None:
+        return list(body.get("messages") or [])
+    if body["format"] != COMPACT_FORMAT:
+        raise ValueError(f"Unknown bulk format: {body['format']}")
+
+    columns = body["columns"]
+    base = datetime.fromisoformat(body["base_time"])
+    messages = []
+    for row in body["rows"]:
+        if not row or len(row) > len(columns):
+            raise ValueError(f"Malformed compact row: {row}")
+        message = {
+            column: value
+            for column, value in zip(columns[1:], row[1:])
+            if value is not None
+        }
+        when = base + timedelta(milliseconds=row[0])
+        message = {"timestamp": when.isoformat(timespec="milliseconds"), **message}
+        messages.append(message)
+    return messages
@@ -0,0 +1,79 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+
+class DuplicateFilter:
+    """
+    Time-windowed duplicate suppression for repeated POCSAG transmissions.
+
+    Paging networks retransmit the same page several times within seconds,
+    often from several transmitters. A key (e.g. address, function,
+    message) seen again within ``window`` seconds of its first reception
+    is reported as a duplicate.
+
+    Keys are kept in insertion order, so expired entries are dropped from
+    the front and the table never holds more than ``max_entries`` keys;
+    memory stays constant however busy the channel is.
+    """
+
+    def __init__(
+        self,
+        window: float = 30.0,
+        max_entries: int = 4096,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            window: Seconds after the first reception in which copies are suppressed
+            max_entries: Maximum number of remembered keys
+            clock: Monotonic time source
+        """
+        self.window = window
+        self.max_entries = max(1, max_entries)
+        self.clock = clock
+        self._seen: "OrderedDict[int, float]" = OrderedDict()
+
+        # Counters
+        self.checked = 0
+        self.suppressed = 0
+        self.evicted = 0
+
+    def is_duplicate(self, *key: Hashable) -> bool:
+        """
+        Check a key and remember it.
+
+        Returns:
+            True if the same key was first seen less than ``window`` seconds ago
+        """
+        now = self.clock()
+        self.checked += 1
+        self._expire(now)
+
+        # Store the hash only: constant size per entry whatever the message length
+        digest = hash(key)
+        if digest in self._seen:
+            self.suppressed += 1
+            return True
+
+        self._seen[digest] = now
+        if len(self._seen) > self.max_entries:
+            self._seen.popitem(last=False)
+            self.evicted += 1
+        return False
+
+    def _expire(self, now: float) -> None:
+        seen = self._seen
+        while seen:
+            digest, first_seen = next(iter(seen.items()))
+            if now - first_seen < self.window:
+                break
+            seen.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "checked": self.checked,
+            "suppressed": self.suppressed,
+            "evicted": self.evicted,
+            "tracked": len(self._seen),
+        }
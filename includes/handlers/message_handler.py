@@ -1,9 +1,17 @@
-import json
-import os
-from datetime import datetime
-from typing import Optional, Dict, Any
+import threading
+import time
+from typing import Optional, Dict, Any, List, Union
 import logging
 
+from includes.storage import MessageStore
+from includes.delivery import BulkNotSupportedError
+from .compact_batch import encode_compact_batch
+from .pocsag_message import PocsagMessage
+from .pocsag_parser import parse_pocsag_fields
+
+# Re-check a missing bulk endpoint after this many seconds
+BULK_RETRY_INTERVAL = 3600
+
 
 class MessageHandler:
     """Handler for processing received POCSAG messages."""
@@ -13,97 +21,74 @@ class MessageHandler:
         storage_dir: str = "messages",
         api_client=None,
         api_endpoint: str = "/messages",
+        bulk_endpoint: Optional[str] = None,
+        compact_batches: bool = False,
+        store: Optional[MessageStore] = None,
+        send_queue=None,
+        outbox=None,
+        duplicate_filter=None,
+        keep_raw: bool = True,
+        storage_writer=None,
         logger: Optional[logging.Logger] = None,
     ) -> None:
         self.storage_dir = storage_dir
         self.api_client = api_client
         self.api_endpoint = api_endpoint
+        self.bulk_endpoint = bulk_endpoint
+        # Send bulk bodies in the compact format (compact_batch.py)
+        self.compact_batches = compact_batches
         self.logger = logger
-        self._ensure_storage_dir()
-
-    def _ensure_storage_dir(self) -> None:
-        """Ensure the storage directory exists."""
-        os.makedirs(self.storage_dir, exist_ok=True)
-
-    def parse_pocsag_line(self, line: str) -> Optional[Dict[str, Any]]:
+        self._bulk_unavailable_until = 0.0
+        self.store = store or MessageStore(storage_dir, logger=logger)
+        # Optional SendQueue; when set, API delivery happens on its workers
+        self.send_queue = send_queue
+        # Optional Outbox; when set, payloads are persisted before delivery
+        self.outbox = outbox
+        # Optional DuplicateFilter; suppresses retransmitted pages
+        self.duplicate_filter = duplicate_filter
+        # Keep the original multimon-ng line on each message (stored as "raw")
+        self.keep_raw = keep_raw
+        # Optional StorageWriter; when set, local saves are written behind
+        self.storage_writer = storage_writer
+
+        # Counters (updated by send queue workers and the outbox replay thread)
+        self._counter_lock = threading.Lock()
+        self.messages_sent = 0
+        self.bulk_requests = 0
+
+    def parse_pocsag_line(
+        self, line: str, source: Optional[str] = None
+    ) -> Optional[PocsagMessage]:
         """
         Parse a POCSAG line from multimon-ng output.
 
-        Example format:
+        Example format (optionally prefixed by multimon-ng --timestamp):
         POCSAG1200: Address: 1234567  Function: 3  Alpha:   This is a test message
-        """
-        if not line or "POCSAG" not in line:
-            return None
-
-        try:
-            parts = line.split(":", 1)
-            if len(parts) < 2:
-                return None
-
-            protocol = parts[0].strip()
-            content = parts[1].strip()
-
-            # Extract address
-            address = None
-            if "Address:" in content:
-                addr_parts = content.split("Address:", 1)[1].split("Function:", 1)
-                if addr_parts:
-                    address = addr_parts[0].strip()
-
-            # Extract function
-            function = None
-            if "Function:" in content:
-                func_parts = content.split("Function:", 1)[1].split("Alpha:", 1)
-                if not func_parts:
-                    func_parts = content.split("Function:", 1)[1].split("Numeric:", 1)
-                if func_parts:
-                    function = func_parts[0].strip()
-
-            # Extract message type and content
-            message_type = "alpha"
-            message = ""
-
-            if "Alpha:" in content:
-                message_type = "alpha"
-                message = content.split("Alpha:", 1)[1].strip()
-            elif "Numeric:" in content:
-                message_type = "numeric"
-                message = content.split("Numeric:", 1)[1].strip()
-
-            return {
-                "protocol": protocol,
-                "address": address,
-                "function": function,
-                "type": message_type,
-                "message": message,
-                "timestamp": datetime.now().isoformat(),
-                "raw": line,
-            }
 
-        except Exception as e:
-            if self.logger:
-                self.logger.error("Failed to parse POCSAG line: %s - %s", line, e)
+        Args:
+            line: multimon-ng output line
+            source: Name of the pipeline the line came from (optional)
+        """
+        fields = parse_pocsag_fields(line)
+        if fields is None:
             return None
 
-    def save_local(self, message_data: Dict[str, Any]) -> str:
-        """Save message to local JSON file."""
-        timestamp = datetime.now()
-        filename = f"{timestamp.strftime('%Y%m%d')}.json"
-        filepath = os.path.join(self.storage_dir, filename)
+        return PocsagMessage.from_fields(
+            fields, raw=line.rstrip("\n") if self.keep_raw else None, source=source
+        )
 
-        messages = []
-        if os.path.exists(filepath):
-            try:
-                with open(filepath, "r", encoding="utf-8") as f:
-                    messages = json.load(f)
-            except (json.JSONDecodeError, IOError):
-                messages = []
+    def save_local(self, message: PocsagMessage) -> Optional[str]:
+        """
+        Append message to the local JSONL message store.
 
-        messages.append(message_data)
+        With a storage writer the message is only queued and None is returned.
+        """
+        if self.storage_writer:
+            self.storage_writer.put(message)
+            return None
 
         try:
-            with open(filepath, "w", encoding="utf-8") as f:
-                json.dump(messages, f, indent=2, ensure_ascii=False)
+            filepath = self.store.append(message.to_storage_dict())
 
             if self.logger:
                 self.logger.debug("Message saved locally: %s", filepath)
@@ -114,7 +99,71 @@ class MessageHandler:
                 self.logger.error("Failed to save message locally: %s", e)
             raise
 
-    def send_to_api(self, message_data: Dict[str, Any]) -> bool:
+    @staticmethod
+    def to_api_payload(message: PocsagMessage) -> Dict[str, Any]:
+        """Transform to API format: timestamp, ric, subric, message."""
+        return message.to_api_payload()
+
+    def post_payload(self, api_payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        POST an API payload.
+
+        Raises:
+            requests.RequestException: If the request fails
+        """
+        response = self.api_client.post(self.api_endpoint, api_payload)
+        with self._counter_lock:
+            self.messages_sent += 1
+
+        if self.logger:
+            self.logger.info(
+                "Message sent to API: RIC=%s, SubRIC=%s",
+                api_payload.get("ric"),
+                api_payload.get("subric"),
+            )
+
+        return response
+
+    def post_batch(self, api_payloads: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        POST several API payloads in one request to the bulk endpoint.
+
+        Raises:
+            BulkNotSupportedError: If no bulk endpoint is available
+            requests.RequestException: If the request fails
+        """
+        if not self.bulk_endpoint or time.monotonic() < self._bulk_unavailable_until:
+            raise BulkNotSupportedError(self.bulk_endpoint)
+
+        body = (
+            encode_compact_batch(api_payloads)
+            if self.compact_batches
+            else {"messages": api_payloads}
+        )
+        try:
+            response = self.api_client.post(self.bulk_endpoint, body)
+        except Exception as e:
+            status = getattr(getattr(e, "response", None), "status_code", None)
+            if status in (404, 405):
+                self._bulk_unavailable_until = time.monotonic() + BULK_RETRY_INTERVAL
+                if self.logger:
+                    self.logger.warning(
+                        "Bulk endpoint %s not available (%s), sending single messages",
+                        self.bulk_endpoint,
+                        status,
+                    )
+                raise BulkNotSupportedError(self.bulk_endpoint) from e
+            raise
+
+        with self._counter_lock:
+            self.messages_sent += len(api_payloads)
+            self.bulk_requests += 1
+        if self.logger:
+            self.logger.info("Sent %d messages to API in bulk", len(api_payloads))
+
+        return response
+
+    def send_to_api(self, message: PocsagMessage) -> bool:
         """Send message to Laravel API."""
         if not self.api_client:
             if self.logger:
@@ -122,58 +171,192 @@ class MessageHandler:
             return False
 
         try:
-            # Transform to API format: timestamp, ric, subric, message
-            api_payload = {
-                "timestamp": message_data.get("timestamp"),
-                "ric": message_data.get(
-                    "address"
-                ),  # RIC = Receiver Identity Code (address)
-                "subric": message_data.get("function"),  # SubRIC = Function code
-                "message": message_data.get("message", ""),
-            }
+            self.post_payload(message.to_api_payload())
+            return True
+        except Exception as e:
+            if self.logger:
+                self.logger.error("Failed to send message to API: %s", e)
+            return False
 
-            response = self.api_client.post(self.api_endpoint, api_payload)
+    def deliver(self, item: Union[PocsagMessage, Dict[str, Any]]) -> Union[bool, str]:
+        """
+        Deliver a queued item: an outbox item if an outbox is configured,
+        otherwise a parsed message.
 
-            if self.logger:
-                self.logger.info(
-                    "Message sent to API: RIC=%s, SubRIC=%s",
-                    api_payload.get("ric"),
-                    api_payload.get("subric"),
-                )
+        Returns:
+            True if delivered, False on failure, DEFERRED if the outbox
+            replay delivers it later
+        """
+        if self.outbox:
+            return self.outbox.deliver(item)
+        return self.send_to_api(item)
+
+    def deliver_many(
+        self, items: List[Union[PocsagMessage, Dict[str, Any]]]
+    ) -> Union[bool, str]:
+        """Deliver a batch of queued items, as one bulk request if possible."""
+        if self.outbox:
+            return self.outbox.deliver_many(items)
 
+        try:
+            self.post_batch([item.to_api_payload() for item in items])
             return True
+        except BulkNotSupportedError:
+            pass
         except Exception as e:
             if self.logger:
-                self.logger.error("Failed to send message to API: %s", e)
+                self.logger.error("Failed to send message batch to API: %s", e)
             return False
 
-    def process_line(self, line: str) -> Optional[Dict[str, Any]]:
+        results = [self.send_to_api(item) for item in items]
+        return all(results)
+
+    @staticmethod
+    def estimate_size(item: Union[PocsagMessage, Dict[str, Any]]) -> int:
+        """Rough encoded size of a queued item in bytes, used for batch limits."""
+        if isinstance(item, PocsagMessage):
+            return len(item.message) + 96
+        return len(item["payload"].get("message") or "") + 96
+
+    @staticmethod
+    def encode_item(item: Union[PocsagMessage, Dict[str, Any]]) -> Dict[str, Any]:
+        """JSON form of a queued item for the send queue spill file."""
+        if isinstance(item, PocsagMessage):
+            return item.to_storage_dict()
+        return item
+
+    @staticmethod
+    def decode_item(data: Dict[str, Any]) -> Union[PocsagMessage, Dict[str, Any]]:
+        """Restore a queued item written by encode_item()."""
+        if "payload" in data:
+            return data
+        return PocsagMessage.from_dict(data)
+
+    def dispatch(self, message: PocsagMessage) -> None:
+        """Hand a message to the delivery path (outbox, send queue or inline)."""
+        if not self.api_client:
+            self.send_to_api(message)
+            return
+
+        item = message
+        if self.outbox:
+            try:
+                item = self.outbox.add(message.to_api_payload())
+            except Exception as e:
+                if self.logger:
+                    self.logger.error("Failed to store message in outbox: %s", e)
+                self.send_to_api(message)
+                return
+
+        if self.send_queue:
+            self.send_queue.put(item)
+        else:
+            self.deliver(item)
+
+    def process_line(
+        self,
+        line: str,
+        source: Optional[str] = None,
+        frequency: Optional[int] = None,
+    ) -> Optional[PocsagMessage]:
         """
         Process a line from multimon-ng output.
 
-        Returns the parsed message data if it was a POCSAG message, None otherwise.
+        ``source`` tags the message with the receiving pipeline, ``frequency``
+        with the frequency it was received on (scanner mode). Neither is part
+        of the duplicate key, so a message heard by two dongles is only
+        delivered once.
+
+        Returns the parsed message if it was a POCSAG message, None otherwise
+        (also for retransmissions suppressed by the duplicate filter).
         """
-        message_data = self.parse_pocsag_line(line)
+        message = self.parse_pocsag_line(line, source)
 
-        if not message_data:
+        if not message:
+            return None
+
+        return self.process_message(message, frequency=frequency)
+
+    def process_message(
+        self,
+        message: PocsagMessage,
+        source: Optional[str] = None,
+        frequency: Optional[int] = None,
+    ) -> Optional[PocsagMessage]:
+        """
+        Process an already decoded message (e.g. from the native decoder).
+
+        Returns the message, or None if the duplicate filter suppressed it.
+        """
+        if source:
+            message.source = source
+        if frequency:
+            message.frequency = frequency
+
+        if self.duplicate_filter and self.duplicate_filter.is_duplicate(
+            *message.dedup_key()
+        ):
+            if self.logger:
+                self.logger.debug(
+                    "Duplicate POCSAG message suppressed - Address: %s",
+                    message.address,
+                )
             return None
 
         if self.logger:
             self.logger.info(
                 "POCSAG message received - Address: %s, Type: %s, Message: %s",
-                message_data.get("address"),
-                message_data.get("type"),
-                message_data.get("message", "")[:50],  # First 50 chars
+                message.address,
+                message.type,
+                message.message[:50],  # First 50 chars
             )
 
         # Save locally
         try:
-            self.save_local(message_data)
+            self.save_local(message)
         except Exception as e:
             if self.logger:
                 self.logger.error("Failed to save message locally: %s", e)
 
-        # Send to API
-        self.send_to_api(message_data)
+        # Send to API (queued, so the decode loop never waits for HTTP)
+        self.dispatch(message)
+
+        return message
+
+    def stats(self) -> Dict[str, Any]:
+        """Messages delivered and the HTTP bytes they took (single and bulk POSTs)."""
+        with self._counter_lock:
+            messages_sent = self.messages_sent
+            result: Dict[str, Any] = {
+                "messages_sent": messages_sent,
+                "bulk_requests": self.bulk_requests,
+            }
+        traffic = getattr(self.api_client, "traffic", None)
+        if traffic is None:
+            return result
+
+        # Failed and retried requests count too: they used the link as well
+        endpoints = [self.api_endpoint]
+        if self.bulk_endpoint:
+            endpoints.append(self.bulk_endpoint)
+        totals = traffic.totals(endpoints)
+        result.update(totals)
+        if messages_sent:
+            result["sent_bytes_per_message"] = round(
+                totals["sent_bytes"] / messages_sent, 1
+            )
+            result["bytes_per_message"] = round(
+                (totals["sent_bytes"] + totals["received_bytes"]) / messages_sent,
+                1,
+            )
+        return result
 
-        return message_data
+    def close(self) -> None:
+        """Flush and close the local message store."""
+        if self.duplicate_filter and self.logger:
+            self.logger.info(
+                "Duplicate filter stats: %s", self.duplicate_filter.stats()
+            )
+        if self.storage_writer:
+            self.storage_writer.stop()
+        self.store.close()
@@ -0,0 +1,156 @@
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+
+class PocsagMessage:
+    """
+    Compact record for one decoded POCSAG message.
+
+    Uses __slots__ instead of a per-message dict, keeps the receive time as
+    a datetime and only builds the storage and API representations when
+    they are needed. The raw multimon-ng line is optional, so records held
+    in queues, dedup windows, outboxes or batches stay small.
+    """
+
+    __slots__ = (
+        "protocol",
+        "address",
+        "function",
+        "type",
+        "message",
+        "received_at",
+        "decoded_at",
+        "raw",
+        "source",
+        "frequency",
+    )
+
+    def __init__(
+        self,
+        protocol: str,
+        address: str,
+        function: str,
+        type: str,
+        message: str,
+        received_at: Optional[datetime] = None,
+        decoded_at: Optional[str] = None,
+        raw: Optional[str] = None,
+        source: Optional[str] = None,
+        frequency: Optional[int] = None,
+    ) -> None:
+        """
+        Args:
+            protocol: Decoder name (e.g. 'POCSAG1200')
+            address: RIC (Receiver Identity Code)
+            function: Function code / SubRIC (0-3)
+            type: 'alpha', 'numeric', 'skyper' or 'tone'
+            message: Message text
+            received_at: Local receive time (default: now)
+            decoded_at: multimon-ng --timestamp value, if present
+            raw: Original multimon-ng line (optional)
+            source: Name of the receiving pipeline (only with several pipelines)
+            frequency: Receive frequency in Hz (only in scanner mode)
+        """
+        self.protocol = protocol
+        self.address = address
+        self.function = function
+        self.type = type
+        self.message = message
+        self.received_at = received_at or datetime.now()
+        self.decoded_at = decoded_at
+        self.raw = raw
+        self.source = source
+        self.frequency = frequency
+
+    @classmethod
+    def from_fields(
+        cls,
+        fields: Tuple[str, str, str, str, str, Optional[str]],
+        raw: Optional[str] = None,
+        source: Optional[str] = None,
+    ) -> "PocsagMessage":
+        """Build a record from parse_pocsag_fields() output."""
+        protocol, address, function, message_type, message, decoded_at = fields
+        return cls(
+            protocol,
+            address,
+            function,
+            message_type,
+            message,
+            decoded_at=decoded_at,
+            raw=raw,
+            source=source,
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PocsagMessage":
+        """Build a record from its storage representation."""
+        timestamp = data.get("timestamp")
+        return cls(
+            data.get("protocol", ""),
+            data.get("address"),
+            data.get("function"),
+            data.get("type", "alpha"),
+            data.get("message", ""),
+            received_at=datetime.fromisoformat(timestamp) if timestamp else None,
+            decoded_at=data.get("decoded_at"),
+            raw=data.get("raw"),
+            source=data.get("source"),
+            frequency=data.get("frequency"),
+        )
+
+    @property
+    def timestamp(self) -> str:
+        """Receive time as ISO 8601 string."""
+        return self.received_at.isoformat()
+
+    def dedup_key(self) -> Tuple[str, str, str]:
+        return self.address, self.function, self.message
+
+    def to_storage_dict(self) -> Dict[str, Any]:
+        """Representation for the local message store."""
+        data = {
+            "protocol": self.protocol,
+            "address": self.address,
+            "function": self.function,
+            "type": self.type,
+            "message": self.message,
+            "timestamp": self.timestamp,
+        }
+        if self.decoded_at:
+            data["decoded_at"] = self.decoded_at
+        if self.raw is not None:
+            data["raw"] = self.raw
+        if self.source:
+            data["source"] = self.source
+        if self.frequency:
+            data["frequency"] = self.frequency
+        return data
+
+    def to_api_payload(self) -> Dict[str, Any]:
+        """API format: timestamp, ric, subric, message (plus source/frequency, if set)."""
+        payload = {
+            "timestamp": self.timestamp,
+            "ric": self.address,  # RIC = Receiver Identity Code (address)
+            "subric": self.function,  # SubRIC = Function code
+            "message": self.message,
+        }
+        if self.source:
+            payload["source"] = self.source
+        if self.frequency:
+            payload["frequency"] = self.frequency
+        return payload
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PocsagMessage):
+            return NotImplemented
+        return all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"PocsagMessage(protocol='{self.protocol}', address='{self.address}', "
+            f"function='{self.function}', type='{self.type}', "
+            f"message='{self.message[:50]}')"
+        )
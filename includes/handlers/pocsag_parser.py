@@ -0,0 +1,64 @@
+import re
+from typing import Optional, Tuple
+
+# One anchored pass over a multimon-ng POCSAG line, e.g.
+#   POCSAG1200: Address: 1234567  Function: 3  Alpha:   This is a test
+#   POCSAG512: Address:  123456  Function: 0  Numeric: 112
+#   POCSAG2400: Address:  123456  Function: 1            (tone only)
+POCSAG_LINE = re.compile(
+    r"(POCSAG\d+): Address: *(\d+) +Function: *(\d+)"
+    r"(?: +(Alpha|Numeric|Skyper): *(.*))?"
+)
+
+# multimon-ng --timestamp prefix: "YYYY-MM-DD HH:MM:SS: "
+TIMESTAMP_PREFIX_LEN = 21
+
+TYPE_NAMES = {"Alpha": "alpha", "Numeric": "numeric", "Skyper": "skyper"}
+
+# (protocol, address, function, type, message, decoded_at)
+PocsagFields = Tuple[str, str, str, str, str, Optional[str]]
+
+
+def parse_pocsag_fields(line: str) -> Optional[PocsagFields]:
+    """
+    Parse a multimon-ng output line into its POCSAG fields.
+
+    The protocol name must sit at the start of the line or right after the
+    --timestamp prefix; other lines are rejected before the regular
+    expression runs.
+
+    Returns:
+        (protocol, address, function, type, message, decoded_at) or None.
+        type is 'alpha', 'numeric', 'skyper' or 'tone' (no message part);
+        decoded_at is the multimon-ng --timestamp prefix if present.
+    """
+    # Substring test first: an operator, not a method call, so it is the
+    # cheapest possible reject for the common non-POCSAG line
+    if "POCSAG" not in line:
+        return None
+
+    if line.startswith("POCSAG"):
+        match = POCSAG_LINE.match(line)
+        decoded_at = None
+    elif line.startswith("POCSAG", TIMESTAMP_PREFIX_LEN):
+        match = POCSAG_LINE.match(line, TIMESTAMP_PREFIX_LEN)
+        decoded_at = line[: TIMESTAMP_PREFIX_LEN - 2]
+    else:
+        return None
+
+    if match is None:
+        return None
+
+    protocol, address, function, message_type, message = match.groups()
+
+    if message_type is None:
+        return protocol, address, function, "tone", "", decoded_at
+
+    return (
+        protocol,
+        address,
+        function,
+        TYPE_NAMES[message_type],
+        message.rstrip(),
+        decoded_at,
+    )
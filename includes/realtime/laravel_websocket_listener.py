@@ -272,7 +272,7 @@ class LaravelWebSocketListener:
             return None
 
         try:
-            # Use requests session from api_client
+            # Through the API client's connection pool (same host, no /api prefix)
             headers = {
                 "Authorization": f"Bearer {self.api_client.token}",
                 "Accept": "application/json",
@@ -283,7 +283,8 @@ class LaravelWebSocketListener:
             base_url = self.api_client.base_url.replace("/api", "")
             auth_url = f"{base_url}/broadcasting/auth"
 
-            response = self.api_client.session.post(
+            response = self.api_client.raw_request(
+                "POST",
                 auth_url,
                 json={"socket_id": socket_id, "channel_name": channel_name},
                 headers=headers,
@@ -330,8 +331,9 @@ class LaravelWebSocketListener:
                 },
             }
 
-            response = self.api_client.session.post(
-                f"{self.api_client.base_url}/websocket/track/noxfeed-client",
+            response = self.api_client.raw_request(
+                "POST",
+                "/websocket/track/noxfeed-client",
                 json=payload,
                 timeout=10,
             )
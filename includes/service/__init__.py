@@ -0,0 +1,3 @@
+from .systemd_notifier import SystemdNotifier
+
+__all__ = ["SystemdNotifier"]
@@ -0,0 +1,129 @@
+import os
+import socket
+import threading
+from typing import Callable, Optional
+import logging
+
+
+class SystemdNotifier:
+    """
+    sd_notify(3) client for ``Type=notify`` services, without libsystemd.
+
+    systemd passes a datagram socket in ``NOTIFY_SOCKET``; state changes
+    (READY=1, STATUS=..., STOPPING=1, WATCHDOG=1) are sent as plain text.
+    With ``WatchdogSec=`` set, systemd also passes ``WATCHDOG_USEC`` and
+    kills the service if no WATCHDOG=1 arrives within that time. The
+    watchdog thread only sends keepalives while a liveness check passes,
+    so a hung pipeline ends in a restart instead of a silent service.
+
+    Outside systemd (no ``NOTIFY_SOCKET``) every call is a no-op.
+    """
+
+    def __init__(self, logger: Optional[logging.Logger] = None) -> None:
+        self.logger = logger
+        self.address = self._address(os.environ.get("NOTIFY_SOCKET", ""))
+
+        # Watchdog timeout in seconds (None = no watchdog configured)
+        self.watchdog_timeout: Optional[float] = None
+        watchdog_usec = os.environ.get("WATCHDOG_USEC", "")
+        watchdog_pid = os.environ.get("WATCHDOG_PID", "")
+        if watchdog_usec.isdigit() and (
+            not watchdog_pid or watchdog_pid == str(os.getpid())
+        ):
+            self.watchdog_timeout = int(watchdog_usec) / 1_000_000
+
+        self._socket: Optional[socket.socket] = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _address(path: str) -> Optional[str]:
+        if not path:
+            return None
+        if path.startswith("@"):
+            # Abstract namespace socket
+            return "\0" + path[1:]
+        return path
+
+    @property
+    def enabled(self) -> bool:
+        return self.address is not None
+
+    def notify(self, *states: str) -> bool:
+        """Send state assignments, e.g. notify("READY=1", "STATUS=Running")."""
+        if not self.enabled:
+            return False
+        try:
+            if self._socket is None:
+                self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            self._socket.sendto("\n".join(states).encode("utf-8"), self.address)
+            return True
+        except OSError as e:
+            if self.logger:
+                self.logger.warning("sd_notify failed: %s", e)
+            return False
+
+    def ready(self, status: Optional[str] = None) -> bool:
+        """Startup is complete (systemctl start returns, dependents start)."""
+        if self.logger and self.enabled:
+            self.logger.info("Notifying systemd: ready")
+        return self.notify("READY=1", *([f"STATUS={status}"] if status else []))
+
+    def status(self, text: str) -> bool:
+        """Free-form status shown by systemctl status."""
+        return self.notify(f"STATUS={text}")
+
+    def stopping(self) -> bool:
+        return self.notify("STOPPING=1")
+
+    def start_watchdog(self, check: Callable[[], bool]) -> None:
+        """
+        Send WATCHDOG=1 every half watchdog timeout while ``check()`` passes.
+
+        Args:
+            check: Liveness check; once it fails, keepalives stop and
+                systemd restarts the service after the watchdog timeout
+        """
+        if not self.enabled or not self.watchdog_timeout or self._thread:
+            return
+        self._thread = threading.Thread(
+            target=self._run_watchdog, args=(check,), name="sd-watchdog", daemon=True
+        )
+        self._thread.start()
+        if self.logger:
+            self.logger.info(
+                "systemd watchdog enabled (%.0fs timeout)", self.watchdog_timeout
+            )
+
+    def _run_watchdog(self, check: Callable[[], bool]) -> None:
+        interval = self.watchdog_timeout / 2
+        healthy = True
+        while not self._stop_event.wait(interval):
+            try:
+                alive = check()
+            except Exception as e:
+                if self.logger:
+                    self.logger.error("Watchdog check failed: %s", e)
+                alive = False
+
+            if alive:
+                self.notify("WATCHDOG=1")
+                if not healthy and self.logger:
+                    self.logger.info(
+                        "Pipelines healthy again, watchdog keepalive resumed"
+                    )
+            elif healthy and self.logger:
+                self.logger.error(
+                    "Pipelines not healthy, withholding watchdog keepalive "
+                    "(systemd restarts the service after %.0fs)",
+                    self.watchdog_timeout,
+                )
+            healthy = alive
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(1.0)
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
@@ -0,0 +1,5 @@
+from .message_store import MessageStore
+from .storage_writer import StorageWriter
+from .audio_ring import AudioRing
+
+__all__ = ["MessageStore", "StorageWriter", "AudioRing"]
@@ -0,0 +1,282 @@
+import mmap
+import os
+import struct
+import threading
+import time
+import wave
+from datetime import datetime
+from typing import List, Optional, Tuple, Union
+import logging
+
+MAGIC = b"NOXRING1"
+
+# magic, sample_rate, checkpoint slots, capacity, total bytes written, checkpoints written
+HEADER = struct.Struct("<8sIIQQQ")
+HEADER_SIZE = 64
+CHECKPOINT = struct.Struct("<dQ")  # wall clock time, total bytes written at that time
+CHECKPOINT_INTERVAL = 1.0
+PAGE_SIZE = mmap.PAGESIZE
+
+SAMPLE_WIDTH = 2  # rtl_fm output: signed 16 bit mono
+
+
+class AudioRing:
+    """
+    Rolling recording of the raw rtl_fm audio in a memory-mapped ring file.
+
+    The file keeps the last ``seconds`` of PCM. Writes are plain memory
+    copies into the mapping (the kernel writes the pages back on its own),
+    so mirroring the audio costs no system calls per chunk. Once per
+    second a (wall clock, byte position) checkpoint is stored next to the
+    audio, which maps message timestamps to audio positions even across
+    rtl_fm restarts. The header and checkpoints live in the file, so a
+    ring can be read by another process (``noxfeed.py --snapshot``) or
+    after a crash.
+
+    Layout: 64 byte header | checkpoint table | audio (page aligned)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        sample_rate: int = 22050,
+        seconds: int = 600,
+        create: bool = True,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """
+        Args:
+            path: Ring file
+            sample_rate: Sample rate of the PCM (rtl_fm -s)
+            seconds: Audio kept in the ring
+            create: Create or resize the file (False = open an existing ring as is)
+            logger: Optional logger instance
+
+        Raises:
+            ValueError: create is False and the file is not a ring
+        """
+        self.path = path
+        self.logger = logger
+        self._lock = threading.Lock()
+        self._last_checkpoint = 0.0
+
+        if create:
+            self.sample_rate = sample_rate
+            self.capacity = max(1, int(seconds * sample_rate)) * SAMPLE_WIDTH
+            self.slots = int(seconds / CHECKPOINT_INTERVAL) + 64
+            self._open(create=True)
+        else:
+            with open(path, "rb") as f:
+                header = f.read(HEADER.size)
+            if len(header) < HEADER.size or header[:8] != MAGIC:
+                raise ValueError(f"Not an audio ring file: {path}")
+            _, self.sample_rate, self.slots, self.capacity, _, _ = HEADER.unpack(header)
+            self._open(create=False)
+
+    # ------------------------------------------------------------------
+    # File handling
+    # ------------------------------------------------------------------
+
+    def _open(self, create: bool) -> None:
+        table = self.slots * CHECKPOINT.size
+        self.data_offset = -(-(HEADER_SIZE + table) // PAGE_SIZE) * PAGE_SIZE
+        size = self.data_offset + self.capacity
+
+        if create:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | (os.O_CREAT if create else 0), 0o644)
+        try:
+            header = os.pread(fd, HEADER.size, 0)
+            reuse = (
+                len(header) == HEADER.size
+                and header[:8] == MAGIC
+                and HEADER.unpack(header)[1:4]
+                == (self.sample_rate, self.slots, self.capacity)
+            )
+            if create and not reuse:
+                os.ftruncate(fd, 0)
+                os.ftruncate(fd, size)
+            self._map = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+
+        if create and not reuse:
+            self._total = 0
+            self._checkpoints = 0
+            self._write_header()
+            if self.logger:
+                self.logger.info(
+                    "Audio ring created: %s (%.0f s, %d MB)",
+                    self.path,
+                    self.capacity / self.byte_rate,
+                    size // (1024 * 1024),
+                )
+        else:
+            _, _, _, _, self._total, self._checkpoints = HEADER.unpack_from(self._map)
+
+    def _write_header(self) -> None:
+        HEADER.pack_into(
+            self._map,
+            0,
+            MAGIC,
+            self.sample_rate,
+            self.slots,
+            self.capacity,
+            self._total,
+            self._checkpoints,
+        )
+
+    @property
+    def byte_rate(self) -> int:
+        return self.sample_rate * SAMPLE_WIDTH
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def write(self, data: Union[bytes, bytearray, memoryview]) -> None:
+        """Append PCM; the oldest audio is overwritten once the ring is full."""
+        view = memoryview(data)
+        size = len(view)
+        if not size:
+            return
+
+        with self._lock:
+            start = self._total
+            if size > self.capacity:
+                view = view[size - self.capacity :]
+                start += size - self.capacity
+            self._copy_in(start, view)
+            self._total += size
+
+            now = time.time()
+            if now - self._last_checkpoint >= CHECKPOINT_INTERVAL:
+                self._last_checkpoint = now
+                slot = self._checkpoints % self.slots
+                CHECKPOINT.pack_into(
+                    self._map, HEADER_SIZE + slot * CHECKPOINT.size, now, self._total
+                )
+                self._checkpoints += 1
+            self._write_header()
+
+    def _copy_in(self, start: int, view: memoryview) -> None:
+        position = start % self.capacity
+        first = min(len(view), self.capacity - position)
+        base = self.data_offset
+        self._map[base + position : base + position + first] = view[:first]
+        if first < len(view):
+            self._map[base : base + len(view) - first] = view[first:]
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def _read_checkpoints(self) -> List[Tuple[float, int]]:
+        count = min(self._checkpoints, self.slots)
+        first = self._checkpoints - count
+        return [
+            CHECKPOINT.unpack_from(
+                self._map, HEADER_SIZE + (index % self.slots) * CHECKPOINT.size
+            )
+            for index in range(first, self._checkpoints)
+        ]
+
+    def position_at(self, when: float) -> Optional[int]:
+        """Total byte position recorded at wall clock time ``when`` (None = no data)."""
+        with self._lock:
+            self._refresh()
+            checkpoints = self._read_checkpoints()
+            total = self._total
+        if not checkpoints:
+            return None
+
+        if when <= checkpoints[0][0]:
+            stamp, position = checkpoints[0]
+            return max(0, position - int((stamp - when) * self.byte_rate))
+
+        for index, (stamp, position) in enumerate(checkpoints):
+            following = checkpoints[index + 1] if index + 1 < len(checkpoints) else None
+            if following and when >= following[0]:
+                continue
+            # Continuous audio from here on, but never past the next checkpoint
+            limit = following[1] if following else total
+            return min(limit, position + int((when - stamp) * self.byte_rate))
+        return total
+
+    def _refresh(self) -> None:
+        # Another process may be writing (offline snapshots of a live ring)
+        _, _, _, _, self._total, self._checkpoints = HEADER.unpack_from(self._map)
+
+    def read(self, start: int, end: int) -> bytes:
+        """PCM between two total byte positions (clamped to what the ring holds)."""
+        with self._lock:
+            self._refresh()
+            start = max(start, self._total - self.capacity, 0)
+            end = min(end, self._total)
+            start -= start % SAMPLE_WIDTH
+            if end <= start:
+                return b""
+
+            position = start % self.capacity
+            size = end - start
+            first = min(size, self.capacity - position)
+            base = self.data_offset
+            data = self._map[base + position : base + position + first]
+            if first < size:
+                data += self._map[base : base + size - first]
+            return data
+
+    def snapshot(
+        self,
+        when: Union[datetime, float],
+        before: float = 20.0,
+        after: float = 10.0,
+        path: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Save the audio around a point in time as a WAV file.
+
+        Args:
+            when: Center of the window (e.g. the message timestamp)
+            before: Seconds before ``when``
+            after: Seconds after ``when`` (limited to what was recorded so far)
+            path: Output file (default: next to the ring, named after the time)
+
+        Returns:
+            Path of the WAV file, or None if the ring holds no audio for the window
+        """
+        stamp = when.timestamp() if isinstance(when, datetime) else float(when)
+        start = self.position_at(stamp - before)
+        end = self.position_at(stamp + after)
+        if start is None or end is None:
+            return None
+
+        data = self.read(start, end)
+        if not data:
+            return None
+
+        if path is None:
+            name = os.path.splitext(os.path.basename(self.path))[0]
+            label = datetime.fromtimestamp(stamp).strftime("%Y%m%d-%H%M%S")
+            path = os.path.join(
+                os.path.dirname(self.path), "snapshots", f"{name}-{label}.wav"
+            )
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        with wave.open(path, "wb") as f:
+            f.setnchannels(1)
+            f.setsampwidth(SAMPLE_WIDTH)
+            f.setframerate(self.sample_rate)
+            f.writeframes(data)
+
+        if self.logger:
+            self.logger.info(
+                "Audio snapshot saved: %s (%.1f s)", path, len(data) / self.byte_rate
+            )
+        return path
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._map.closed:
+                self._map.flush()
+                self._map.close()
@@ -0,0 +1,389 @@
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Optional, Dict, Any, Iterator, List, IO, Tuple
+import logging
+
+# Live segments: YYYYMMDD-NNN.jsonl (NNN >= 001, 000 is reserved for migrated legacy files)
+SEGMENT_PATTERN = re.compile(r"^(\d{8})-(\d{3,})\.jsonl$")
+LEGACY_PATTERN = re.compile(r"^(\d{8})\.json$")
+
+
+class MessageStore:
+    """
+    Append-only storage for received messages.
+
+    Messages are written as one JSON object per line (JSONL) into daily
+    segment files. A segment is rotated when it exceeds a size limit or an
+    age limit, so no single file grows without bound and every save is a
+    single append instead of a rewrite of the whole day.
+
+    Layout:
+        messages/20260215-000.jsonl   # migrated legacy 20260215.json (optional)
+        messages/20260215-001.jsonl   # first live segment of the day
+        messages/20260215-002.jsonl   # after size/age rotation
+
+    A torn last line (e.g. power loss during a write) is truncated when the
+    segment is reopened for appending, and skipped by the readers.
+    """
+
+    def __init__(
+        self,
+        storage_dir: str = "messages",
+        max_segment_bytes: int = 16 * 1024 * 1024,
+        max_segment_age: int = 0,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """
+        Args:
+            storage_dir: Directory for the segment files
+            max_segment_bytes: Rotate a segment once it reaches this size (0 = no size limit)
+            max_segment_age: Rotate a segment after this many seconds (0 = daily only)
+            logger: Optional logger instance
+        """
+        self.storage_dir = storage_dir
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segment_age = max_segment_age
+        self.logger = logger
+        self._lock = threading.Lock()
+        self._file: Optional[IO[str]] = None
+        self._path: Optional[str] = None
+        self._day: Optional[str] = None
+        self._seq = 0
+        self._size = 0
+        self._opened_at = 0.0
+        os.makedirs(self.storage_dir, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def append(
+        self, message_data: Dict[str, Any], when: Optional[datetime] = None
+    ) -> str:
+        """
+        Append one message to the current segment.
+
+        Returns:
+            Path of the segment the message was written to
+        """
+        line = self.encode(message_data)
+        size = len(line.encode("utf-8"))
+        with self._lock:
+            self._prepare_segment(when or datetime.now(), size)
+            self._file.write(line)
+            self._file.flush()
+            self._size += size
+            return self._path
+
+    def append_many(
+        self,
+        messages: List[Tuple[Dict[str, Any], datetime]],
+        sync_closed: bool = False,
+    ) -> Optional[str]:
+        """
+        Append several messages with one write (and one flush) per segment.
+
+        Args:
+            messages: (message_data, received_at) pairs in arrival order
+            sync_closed: fsync segments closed by a rotation during this call
+
+        Returns:
+            Path of the segment the last message was written to
+        """
+        with self._lock:
+            pending: List[str] = []
+            for message_data, when in messages:
+                line = self.encode(message_data)
+                size = len(line.encode("utf-8"))
+                path = self._path
+                self._prepare_segment(when, size, pending, sync_closed)
+                if self._path != path:
+                    pending = []
+                pending.append(line)
+                self._size += size
+
+            if pending:
+                self._file.write("".join(pending))
+                self._file.flush()
+            return self._path
+
+    def sync(self) -> None:
+        """Flush the current segment and fsync it to disk."""
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+
+    @staticmethod
+    def encode(message_data: Dict[str, Any]) -> str:
+        """Encode a message as a single JSONL line."""
+        return (
+            json.dumps(message_data, ensure_ascii=False, separators=(",", ":")) + "\n"
+        )
+
+    def close(self) -> None:
+        """Close the current segment."""
+        with self._lock:
+            self._close_segment()
+
+    def _prepare_segment(
+        self,
+        when: datetime,
+        incoming: int,
+        pending: Optional[List[str]] = None,
+        sync: bool = False,
+    ) -> None:
+        """
+        Make sure the right segment is open for the next line.
+
+        Lines buffered in ``pending`` belong to the current segment and are
+        written out before it is closed.
+        """
+        day = when.strftime("%Y%m%d")
+
+        if self._file is None or day != self._day:
+            self._close_segment(pending, sync)
+            self._open_latest_segment(day)
+        elif self._needs_rotation(incoming):
+            self._close_segment(pending, sync)
+            self._open_segment(day, self._seq + 1)
+
+    def _needs_rotation(self, incoming: int) -> bool:
+        if (
+            self.max_segment_bytes
+            and self._size > 0
+            and self._size + incoming > self.max_segment_bytes
+        ):
+            return True
+        if (
+            self.max_segment_age
+            and time.monotonic() - self._opened_at >= self.max_segment_age
+        ):
+            return True
+        return False
+
+    def _open_latest_segment(self, day: str) -> None:
+        """Continue the newest live segment of the day (after a restart) or start a new one."""
+        seqs = [seq for seq, _ in self._segments_for_day(day) if seq > 0]
+        seq = max(seqs) if seqs else 1
+        self._open_segment(day, seq)
+        if self.max_segment_bytes and self._size >= self.max_segment_bytes:
+            self._close_segment()
+            self._open_segment(day, seq + 1)
+
+    def _open_segment(self, day: str, seq: int) -> None:
+        path = self.segment_path(day, seq)
+        self._repair_tail(path)
+        self._file = open(path, "a", encoding="utf-8")
+        self._path = path
+        self._day = day
+        self._seq = seq
+        self._size = os.path.getsize(path)
+        self._opened_at = time.monotonic()
+
+        if self.logger:
+            self.logger.debug("Message segment opened: %s", path)
+
+    def _close_segment(
+        self, pending: Optional[List[str]] = None, sync: bool = False
+    ) -> None:
+        if self._file is not None:
+            try:
+                if pending:
+                    self._file.write("".join(pending))
+                if sync:
+                    self._file.flush()
+                    os.fsync(self._file.fileno())
+                self._file.close()
+            except IOError as e:
+                if self.logger:
+                    self.logger.error("Failed to close message segment: %s", e)
+        self._file = None
+
+    def _repair_tail(self, path: str) -> None:
+        """Truncate a partially written last line left behind by a crash."""
+        if not os.path.exists(path):
+            return
+
+        with open(path, "rb+") as f:
+            f.seek(0, os.SEEK_END)
+            end = f.tell()
+            if end == 0:
+                return
+
+            f.seek(end - 1)
+            if f.read(1) == b"\n":
+                return
+
+            # Walk back to the last complete line
+            pos = end
+            chunk_size = 4096
+            while pos > 0:
+                start = max(0, pos - chunk_size)
+                f.seek(start)
+                chunk = f.read(pos - start)
+                idx = chunk.rfind(b"\n")
+                if idx >= 0:
+                    pos = start + idx + 1
+                    break
+                pos = start
+
+            f.truncate(pos)
+
+        if self.logger:
+            self.logger.warning(
+                "Truncated incomplete last line in %s (%d bytes dropped)",
+                path,
+                end - pos,
+            )
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def segment_path(self, day: str, seq: int) -> str:
+        return os.path.join(self.storage_dir, f"{day}-{seq:03d}.jsonl")
+
+    def legacy_path(self, day: str) -> str:
+        return os.path.join(self.storage_dir, f"{day}.json")
+
+    def _segments_for_day(self, day: str) -> List[tuple]:
+        segments = []
+        for name in os.listdir(self.storage_dir):
+            match = SEGMENT_PATTERN.match(name)
+            if match and match.group(1) == day:
+                segments.append(
+                    (int(match.group(2)), os.path.join(self.storage_dir, name))
+                )
+        segments.sort()
+        return segments
+
+    def days(self) -> List[str]:
+        """List all days (YYYYMMDD) with stored messages, oldest first."""
+        days = set()
+        for name in os.listdir(self.storage_dir):
+            match = SEGMENT_PATTERN.match(name) or LEGACY_PATTERN.match(name)
+            if match:
+                days.add(match.group(1))
+        return sorted(days)
+
+    def iter_day(self, day: str) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over all messages of one day in the order they were stored.
+
+        Reads a not yet migrated legacy YYYYMMDD.json array first, then the
+        JSONL segments. Undecodable lines (torn writes) are skipped.
+        """
+        segments = self._segments_for_day(day)
+        legacy = self.legacy_path(day)
+
+        if os.path.exists(legacy) and not any(seq == 0 for seq, _ in segments):
+            yield from self._read_legacy(legacy)
+
+        for _, path in segments:
+            yield from self._read_segment(path)
+
+    def iter_messages(
+        self, start_day: Optional[str] = None, end_day: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Iterate over all messages between start_day and end_day (inclusive, YYYYMMDD)."""
+        for day in self.days():
+            if start_day and day < start_day:
+                continue
+            if end_day and day > end_day:
+                break
+            yield from self.iter_day(day)
+
+    def _read_segment(self, path: str) -> Iterator[Dict[str, Any]]:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    # Torn tail of a segment still being written or left by a crash
+                    break
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    if self.logger:
+                        self.logger.warning("Skipping corrupt line in %s", path)
+
+    def _read_legacy(self, path: str) -> Iterator[Dict[str, Any]]:
+        yield from self._load_legacy(path) or []
+
+    def _load_legacy(self, path: str) -> Optional[List[Dict[str, Any]]]:
+        """Messages of a legacy day file, None if it can not be read."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                messages = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            if self.logger:
+                self.logger.error("Failed to read legacy message file %s: %s", path, e)
+            return None
+        if not isinstance(messages, list):
+            if self.logger:
+                self.logger.error("Legacy message file %s is not a list", path)
+            return None
+        return messages
+
+    # ------------------------------------------------------------------
+    # Migration
+    # ------------------------------------------------------------------
+
+    def migrate_legacy(self, delete: bool = False) -> int:
+        """
+        Convert legacy YYYYMMDD.json day files into YYYYMMDD-000.jsonl segments.
+
+        The segment is written to a temporary file and renamed into place, so
+        an interrupted migration can simply be rerun. Afterwards the legacy
+        file is renamed to YYYYMMDD.json.migrated (or deleted). A legacy
+        file that can not be parsed is left in place and not migrated.
+
+        Args:
+            delete: Delete legacy files instead of renaming them
+
+        Returns:
+            Number of migrated day files
+        """
+        migrated = 0
+
+        for name in sorted(os.listdir(self.storage_dir)):
+            match = LEGACY_PATTERN.match(name)
+            if not match:
+                continue
+
+            day = match.group(1)
+            legacy = os.path.join(self.storage_dir, name)
+            target = self.segment_path(day, 0)
+
+            if not os.path.exists(target):
+                messages = self._load_legacy(legacy)
+                if messages is None:
+                    # Keep the original for manual repair
+                    continue
+
+                tmp_path = f"{target}.tmp"
+                count = 0
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    for message_data in messages:
+                        f.write(self.encode(message_data))
+                        count += 1
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, target)
+
+                if self.logger:
+                    self.logger.info(
+                        "Migrated %d messages from %s to %s", count, legacy, target
+                    )
+
+            if delete:
+                os.remove(legacy)
+            else:
+                os.replace(legacy, f"{legacy}.migrated")
+
+            migrated += 1
+
+        return migrated
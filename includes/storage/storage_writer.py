@@ -0,0 +1,233 @@
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+import logging
+
+from .message_store import MessageStore
+
+FSYNC_ALWAYS = "always"
+FSYNC_INTERVAL = "interval"
+FSYNC_OS = "os"
+FSYNC_POLICIES = (FSYNC_ALWAYS, FSYNC_INTERVAL, FSYNC_OS)
+
+
+class StorageWriter:
+    """
+    Write-behind thread in front of a MessageStore.
+
+    The decode loop only enqueues message records; a dedicated thread
+    encodes them and appends them in groups (group commit): one write per
+    tick or per ``batch_size`` messages, whichever comes first. Slow disks
+    (SD cards) therefore never stall the multimon-ng read loop.
+
+    Durability is chosen by the fsync policy:
+
+    - always:   fsync after every write batch
+    - interval: fsync at most every ``fsync_interval`` seconds
+    - os:       never fsync, the OS writes back dirty pages on its own
+
+    stop() writes everything still queued and fsyncs (unless 'os').
+    """
+
+    def __init__(
+        self,
+        store: MessageStore,
+        batch_size: int = 256,
+        flush_interval: float = 0.2,
+        fsync: str = FSYNC_INTERVAL,
+        fsync_interval: float = 1.0,
+        max_queue: int = 10000,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """
+        Args:
+            store: MessageStore receiving the messages
+            batch_size: Write as soon as this many messages are queued
+            flush_interval: Max seconds a message waits before it is written (tick)
+            fsync: fsync policy ('always', 'interval' or 'os')
+            fsync_interval: Seconds between fsyncs with the 'interval' policy
+            max_queue: put() blocks while this many messages are waiting
+            logger: Optional logger instance
+        """
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync}")
+
+        self.store = store
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.max_queue = max(1, max_queue)
+        self.logger = logger
+
+        self._queue: Deque[Tuple[Any, datetime]] = deque()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._unsynced = False
+        self._last_sync = time.monotonic()
+
+        # Counters
+        self.queued = 0
+        self.written = 0
+        self.failed = 0
+        self.batches = 0
+        self.syncs = 0
+        self.max_write_ms = 0.0
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stopping = False
+        self._thread = threading.Thread(
+            target=self._run, name="storage-writer", daemon=True
+        )
+        self._thread.start()
+
+        if self.logger:
+            self.logger.info(
+                "Storage writer started (batch=%d, tick=%.0fms, fsync=%s)",
+                self.batch_size,
+                self.flush_interval * 1000,
+                self.fsync,
+            )
+
+    def put(self, record: Any) -> None:
+        """
+        Queue a message for writing.
+
+        Args:
+            record: PocsagMessage (or anything with to_storage_dict()) or a dict
+        """
+        when = getattr(record, "received_at", None) or datetime.now()
+        with self._cond:
+            while len(self._queue) >= self.max_queue and not self._stopping:
+                # Disk is far behind: slow the producer down instead of losing data
+                self._cond.wait(0.1)
+            self._queue.append((record, when))
+            self.queued += 1
+            if len(self._queue) == 1 or len(self._queue) >= self.batch_size:
+                self._cond.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._queue and not self._stopping:
+                    # Sleep until a message arrives or the next fsync is due
+                    self._cond.wait(self._sync_timeout())
+
+                if self._queue and not self._stopping:
+                    # Group commit: collect until the batch is full or the tick ends
+                    deadline = time.monotonic() + self.flush_interval
+                    while len(self._queue) < self.batch_size and not self._stopping:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._cond.wait(remaining)
+
+                count = min(len(self._queue), self.batch_size)
+                batch = [self._queue.popleft() for _ in range(count)]
+                stopping = self._stopping and not self._queue
+                self._cond.notify_all()
+
+            if batch:
+                self._write(batch)
+            self._maybe_sync()
+
+            if stopping:
+                return
+
+    def _sync_timeout(self) -> Optional[float]:
+        if self.fsync == FSYNC_INTERVAL and self._unsynced:
+            return max(0.0, self._last_sync + self.fsync_interval - time.monotonic())
+        return None
+
+    @staticmethod
+    def _storage_dict(record: Any) -> Dict[str, Any]:
+        if hasattr(record, "to_storage_dict"):
+            return record.to_storage_dict()
+        return record
+
+    def _write(self, batch: List[Tuple[Any, datetime]]) -> None:
+        messages = [(self._storage_dict(record), when) for record, when in batch]
+
+        started = time.monotonic()
+        try:
+            path = self.store.append_many(messages, sync_closed=self.fsync != FSYNC_OS)
+        except (IOError, OSError, ValueError) as e:
+            self.failed += len(batch)
+            if self.logger:
+                self.logger.error(
+                    "Failed to save %d messages locally: %s", len(batch), e
+                )
+            return
+
+        elapsed_ms = (time.monotonic() - started) * 1000
+        self.max_write_ms = max(self.max_write_ms, elapsed_ms)
+        self.written += len(batch)
+        self.batches += 1
+        self._unsynced = True
+
+        if self.logger:
+            self.logger.debug(
+                "Wrote %d messages to %s in %.1fms", len(batch), path, elapsed_ms
+            )
+
+    def _maybe_sync(self, force: bool = False) -> None:
+        if not self._unsynced or self.fsync == FSYNC_OS:
+            return
+        if (
+            not force
+            and self.fsync == FSYNC_INTERVAL
+            and time.monotonic() - self._last_sync < self.fsync_interval
+        ):
+            return
+
+        try:
+            self.store.sync()
+        except (IOError, OSError) as e:
+            if self.logger:
+                self.logger.error("Failed to fsync message segment: %s", e)
+            return
+        self._unsynced = False
+        self._last_sync = time.monotonic()
+        self.syncs += 1
+
+    def depth(self) -> int:
+        with self._cond:
+            return len(self._queue)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Write all queued messages, fsync and stop the thread."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+
+        if self._thread:
+            self._thread.join(timeout)
+            if self._thread.is_alive() and self.logger:
+                self.logger.warning(
+                    "Storage writer did not finish within %.0fs (%d queued)",
+                    timeout,
+                    self.depth(),
+                )
+            self._thread = None
+
+        self._maybe_sync(force=True)
+
+        if self.logger:
+            self.logger.info("Storage writer stopped: %s", self.stats())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "depth": self.depth(),
+            "queued": self.queued,
+            "written": self.written,
+            "failed": self.failed,
+            "batches": self.batches,
+            "syncs": self.syncs,
+            "max_write_ms": round(self.max_write_ms, 1),
+        }
@@ -1,4 +1,25 @@
 from .rtl_fm_worker import RtlFmWorker
+from .rtl_sdr_worker import RtlSdrWorker
 from .multimon_worker import MultimonWorker
+from .native_decoder_worker import NativeDecoderWorker
+from .wideband_decoder_worker import WidebandDecoderWorker
+from .replay_worker import ReplayWorker
+from .pipeline_supervisor import PipelineSupervisor
+from .pipeline_group import PipelineGroup
+from .stall_watchdog import StallWatchdog
+from .frequency_scanner import FrequencyScanner
+from .rf_auto_tuner import RfAutoTuner
 
-__all__ = ["RtlFmWorker", "MultimonWorker"]
+__all__ = [
+    "RtlFmWorker",
+    "RtlSdrWorker",
+    "MultimonWorker",
+    "NativeDecoderWorker",
+    "WidebandDecoderWorker",
+    "ReplayWorker",
+    "PipelineSupervisor",
+    "PipelineGroup",
+    "StallWatchdog",
+    "FrequencyScanner",
+    "RfAutoTuner",
+]
@@ -0,0 +1,317 @@
+import collections
+import threading
+import time
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+import logging
+
+from .pipeline_supervisor import PipelineSupervisor
+from .rtl_sdr_worker import RtlSdrWorker
+
+
+class _Channel:
+    def __init__(self, frequency: int, weight: float, dwell: float) -> None:
+        self.frequency = frequency
+        self.weight = weight
+        self.dwell = dwell
+        # Smooth weighted round robin state
+        self.current = 0.0
+        self.last_hit = 0.0
+
+        # Counters
+        self.visits = 0
+        self.listened = 0.0
+        self.hits = 0
+
+
+class FrequencyScanner:
+    """
+    Time-sliced scanning of several frequencies with one rtl_fm pipeline.
+
+    rtl_fm's own scanning (several ``-f``) hops on squelch and never tells
+    which frequency a page came from. The scanner instead tunes rtl_fm to
+    one frequency at a time and restarts it on the next one through the
+    attached PipelineSupervisor (a planned restart without backoff;
+    multimon-ng keeps running). Frequencies are visited by smooth weighted
+    round robin, so a frequency with weight 2 gets twice the visits of one
+    with weight 1, each visit lasting its own dwell time. While pages keep
+    arriving the dwell is extended by ``hold`` seconds (up to
+    ``max_hold``), so a burst is not cut off.
+
+    Decoded lines are attributed to the frequency whose audio had started
+    at least ``guard`` seconds before the line arrived: the decoder still
+    finishes the old frequency's audio right after a hop, while a page on
+    the new frequency needs its preamble and sync first.
+
+    ``stats()`` reports visits, listening time, pages and pages per hour
+    of listening per frequency, the basis for tuning weights and dwells.
+    """
+
+    def __init__(
+        self,
+        frequencies: Sequence[Any],
+        dwell: float = 10.0,
+        hold: float = 3.0,
+        max_hold: float = 30.0,
+        guard: float = 0.3,
+        settle_timeout: float = 15.0,
+        stats_interval: float = 600.0,
+        name: str = "default",
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """
+        Args:
+            frequencies: Frequencies ("168.075M", Hz) or dicts with
+                ``frequency`` and optional ``weight``/``dwell``
+            dwell: Default seconds per visit
+            hold: Stay this long after the last page once the dwell is over
+            max_hold: Upper bound for the extension of one visit (seconds)
+            guard: Lines arriving within this many seconds after the new
+                audio started still count for the previous frequency
+            settle_timeout: Seconds to wait for audio after a retune before
+                moving on
+            stats_interval: Seconds between stats log lines (0 = off)
+            name: Pipeline name used in log messages
+            logger: Optional logger instance
+
+        Raises:
+            ValueError: No frequencies, duplicates, or a weight/dwell <= 0
+        """
+        self.supervisor: Optional[PipelineSupervisor] = None
+        self.name = name
+        self.hold = hold
+        self.max_hold = max_hold
+        self.guard = guard
+        self.settle_timeout = settle_timeout
+        self.stats_interval = stats_interval
+        self.logger = logger
+
+        self.channels: List[_Channel] = []
+        for entry in frequencies:
+            if not isinstance(entry, dict):
+                entry = {"frequency": entry}
+            channel = _Channel(
+                int(RtlSdrWorker.parse_frequency(entry["frequency"])),
+                float(entry.get("weight", 1)),
+                float(entry.get("dwell", dwell)),
+            )
+            if channel.weight <= 0 or channel.dwell <= 0:
+                raise ValueError(
+                    f"Scan frequency {entry['frequency']}: weight and dwell must be > 0"
+                )
+            if any(other.frequency == channel.frequency for other in self.channels):
+                raise ValueError(f"Duplicate scan frequency: {entry['frequency']}")
+            self.channels.append(channel)
+        if not self.channels:
+            raise ValueError("No scan frequencies configured")
+        self._by_frequency = {channel.frequency: channel for channel in self.channels}
+
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._audio = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._tuned = self._next()
+        # (monotonic time the audio started, channel)
+        self._history: Deque[Tuple[float, _Channel]] = collections.deque(maxlen=16)
+        self._visit_started: Optional[float] = None
+        self._started_at = time.monotonic()
+        self._logged_at = self._started_at
+
+        # Counters
+        self.hops = 0
+        self.retune_seconds = 0.0
+
+    # ------------------------------------------------------------------
+    # Schedule
+    # ------------------------------------------------------------------
+
+    def _next(self) -> _Channel:
+        total = sum(channel.weight for channel in self.channels)
+        for channel in self.channels:
+            channel.current += channel.weight
+        best = max(self.channels, key=lambda channel: channel.current)
+        best.current -= total
+        return best
+
+    @staticmethod
+    def tune(args: Sequence[str], frequency: int) -> List[str]:
+        """rtl_fm arguments with every ``-f`` replaced by ``frequency``."""
+        result: List[str] = []
+        skip = False
+        for arg in args:
+            if skip:
+                skip = False
+            elif arg == "-f":
+                skip = True
+            else:
+                result.append(arg)
+        return ["-f", str(frequency), *result]
+
+    def initial_args(self, args: Sequence[str]) -> List[str]:
+        """rtl_fm arguments for the first frequency (before the pipeline starts)."""
+        return self.tune(args, self._tuned.frequency)
+
+    def attach(self, supervisor: PipelineSupervisor) -> None:
+        """Scan with this pipeline's rtl_fm (before the pipeline starts)."""
+        self.supervisor = supervisor
+        supervisor.on_source_start = self._audio_started
+
+    # ------------------------------------------------------------------
+    # Scanning
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        if self.supervisor is None:
+            raise RuntimeError("FrequencyScanner.attach() was not called")
+        self._thread = threading.Thread(
+            target=self._run, name=f"scanner-{self.name}", daemon=True
+        )
+        self._thread.start()
+
+    def _audio_started(self) -> None:
+        # Pump thread: the first audio of a new rtl_fm process
+        with self._lock:
+            self._history.append((time.monotonic(), self._tuned))
+        self._audio.set()
+
+    def _run(self) -> None:
+        retune_started: Optional[float] = None
+
+        while not self._stop_event.is_set():
+            channel = self._tuned
+            if not self._audio.wait(self.settle_timeout):
+                if self._stop_event.is_set():
+                    break
+                if self.logger:
+                    self.logger.warning(
+                        "Scanner %s: no audio on %.4f MHz after %.0fs",
+                        self.name,
+                        channel.frequency / 1e6,
+                        self.settle_timeout,
+                    )
+            now = time.monotonic()
+            if retune_started is not None:
+                self.retune_seconds += now - retune_started
+
+            self._visit(channel, now)
+            if self._stop_event.is_set():
+                break
+            self._log_stats()
+
+            following = self._next()
+            if following is channel:
+                retune_started = None
+                continue
+
+            # Retune: rtl_fm is restarted right away on the new frequency
+            retune_started = time.monotonic()
+            self._audio.clear()
+            with self._lock:
+                self._tuned = following
+            self.hops += 1
+            rtl_worker = self.supervisor.rtl_worker
+            rtl_worker.args = self.tune(rtl_worker.args, following.frequency)
+            self.supervisor.restart_stage(
+                "rtl_fm",
+                f"scanning to {following.frequency / 1e6:.4f} MHz",
+                immediate=True,
+            )
+
+    def _visit(self, channel: _Channel, started: float) -> None:
+        """Listen for the dwell time, longer while pages keep arriving."""
+        channel.visits += 1
+        self._visit_started = started
+        deadline = started + channel.dwell
+        limit = deadline + self.max_hold
+
+        while not self._stop_event.wait(max(0.0, deadline - time.monotonic())):
+            now = time.monotonic()
+            extended = min(limit, channel.last_hit + self.hold)
+            if extended <= now:
+                break
+            deadline = extended
+
+        with self._lock:
+            channel.listened += time.monotonic() - started
+            self._visit_started = None
+
+    # ------------------------------------------------------------------
+    # Attribution
+    # ------------------------------------------------------------------
+
+    def frequency_at(self, when: Optional[float] = None) -> int:
+        """Frequency a line that arrived at ``when`` (monotonic, default now) was received on."""
+        when = time.monotonic() if when is None else when
+        with self._lock:
+            for started, channel in reversed(self._history):
+                if started <= when - self.guard:
+                    return channel.frequency
+            if self._history:
+                return self._history[0][1].frequency
+            return self._tuned.frequency
+
+    def record(self, frequency: int) -> None:
+        """Count a page received on ``frequency`` (also extends the current visit)."""
+        channel = self._by_frequency.get(frequency)
+        if channel is None:
+            return
+        with self._lock:
+            channel.hits += 1
+            channel.last_hit = time.monotonic()
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def _log_stats(self) -> None:
+        now = time.monotonic()
+        if not self.stats_interval or now - self._logged_at < self.stats_interval:
+            return
+        self._logged_at = now
+        if self.logger:
+            self.logger.info("Scanner %s: %s", self.name, self.stats())
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            listened = {
+                channel.frequency: channel.listened for channel in self.channels
+            }
+            if self._visit_started is not None:
+                listened[self._tuned.frequency] += now - self._visit_started
+            total_listened = sum(listened.values())
+            hits = sum(channel.hits for channel in self.channels)
+            elapsed = now - self._started_at
+
+            return {
+                "hops": self.hops,
+                "retune_seconds": round(self.retune_seconds, 1),
+                "pages": hits,
+                "pages_per_hour": round(hits * 3600 / elapsed, 1) if elapsed else 0.0,
+                "frequencies": {
+                    str(channel.frequency): {
+                        "weight": channel.weight,
+                        "dwell": channel.dwell,
+                        "visits": channel.visits,
+                        "listened_seconds": round(listened[channel.frequency], 1),
+                        "time_share": (
+                            round(listened[channel.frequency] / total_listened, 3)
+                            if total_listened
+                            else 0.0
+                        ),
+                        "pages": channel.hits,
+                        # Pages per hour while listening on this frequency
+                        "pages_per_hour": (
+                            round(channel.hits * 3600 / listened[channel.frequency], 1)
+                            if listened[channel.frequency]
+                            else 0.0
+                        ),
+                    }
+                    for channel in self.channels
+                },
+            }
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop_event.set()
+        self._audio.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
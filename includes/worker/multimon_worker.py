@@ -1,7 +1,9 @@
 import subprocess
-from typing import List, Optional, Iterable
+from typing import List, Optional, Iterable, Dict, Any
 import logging
 
+from .stderr_drain import StderrDrain, MULTIMON_VALUES
+
 
 class MultimonWorker:
     """Worker for starting multimon-ng."""
@@ -11,18 +13,25 @@ class MultimonWorker:
         command: str = "multimon-ng",
         args: Optional[List[str]] = None,
         input_stream=None,
+        stderr_lines: int = 200,
+        name: str = "multimon-ng",
         logger: Optional[logging.Logger] = None,
     ) -> None:
         self.command = command
         self.args = args or []
         self.input_stream = input_stream
         self.logger = logger
+        # Shown in log messages, e.g. "rtl_fm[net-a]" with several pipelines
+        self.name = name
         self.process: Optional[subprocess.Popen] = None
+        # Recent stderr lines and telemetry of the current process
+        self.stderr_lines = stderr_lines
+        self.stderr: Optional[StderrDrain] = None
 
     def start(self) -> subprocess.Popen:
         if self.logger:
             self.logger.info(
-                "Starting multimon-ng: %s %s", self.command, " ".join(self.args)
+                "Starting %s: %s %s", self.name, self.command, " ".join(self.args)
             )
 
         self.process = subprocess.Popen(
@@ -33,16 +42,38 @@ class MultimonWorker:
             text=True,
             bufsize=1,
         )
+        self.stderr = StderrDrain(
+            self.process.stderr,
+            self.name,
+            max_lines=self.stderr_lines,
+            values=MULTIMON_VALUES,
+            logger=self.logger,
+        ).start()
         return self.process
 
+    def audio_sink(self):
+        """Binary stdin of the process (multimon-ng itself runs in text mode)."""
+        return self.process.stdin.buffer
+
     def iter_lines(self) -> Iterable[str]:
         if not self.process or not self.process.stdout:
             return []
         for line in self.process.stdout:
             yield line.rstrip("\n")
 
+    def stderr_tail(self, count: int = 20) -> str:
+        """Last stderr lines of the current process (waits briefly for a dead one)."""
+        if not self.stderr:
+            return ""
+        if self.process and self.process.poll() is not None:
+            self.stderr.join()
+        return self.stderr.tail(count)
+
+    def telemetry(self) -> Dict[str, Any]:
+        return self.stderr.telemetry() if self.stderr else {}
+
     def stop(self) -> None:
         if self.process and self.process.poll() is None:
             if self.logger:
-                self.logger.info("Stopping multimon-ng")
+                self.logger.info("Stopping %s", self.name)
             self.process.terminate()
@@ -0,0 +1,139 @@
+import queue
+import threading
+from typing import Any, Dict, Iterable, Optional, Sequence
+import logging
+
+from includes.decoder import PocsagDecoder
+from includes.handlers import PocsagMessage
+
+# Put on the queue when the decoder was closed
+_DONE = object()
+
+
+class NativeDecoderWorker:
+    """
+    In-process replacement for MultimonWorker.
+
+    Provides the decoder stage interface of the PipelineSupervisor: the
+    audio pump writes rtl_fm PCM into audio_sink(), where it is decoded
+    right away by a PocsagDecoder (NumPy), and iter_lines() yields the
+    resulting PocsagMessage records instead of multimon-ng text lines.
+    No subprocess, no text round trip.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 22050,
+        baud_rates: Sequence[int] = (512, 1200, 2400),
+        charset: str = "auto",
+        block_size: int = 8192,
+        name: str = "decoder",
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """
+        Args:
+            sample_rate: Sample rate of the rtl_fm output (rtl_fm -s)
+            baud_rates: POCSAG baud rates to decode
+            charset: 'alpha', 'numeric' or 'auto'
+            block_size: Samples buffered before a block is demodulated
+            name: Shown in log messages
+            logger: Optional logger instance
+        """
+        self.sample_rate = sample_rate
+        self.baud_rates = tuple(baud_rates)
+        self.charset = charset
+        self.block_size = block_size
+        self.name = name
+        self.logger = logger
+
+        # Interface shared with MultimonWorker; there is no child process
+        self.process = None
+        self.input_stream = None
+
+        self.decoder: Optional[Any] = None
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._closed = True
+
+    def start(self) -> None:
+        """Start with a fresh decoder state (also used for restarts)."""
+        if self.logger:
+            self.logger.info(
+                "Starting %s: POCSAG %s at %d Hz",
+                self.name,
+                "/".join(str(baud) for baud in self.baud_rates),
+                self.sample_rate,
+            )
+
+        with self._lock:
+            self.decoder = self._create_decoder()
+            self._queue = queue.Queue()
+            self._closed = False
+
+    def _create_decoder(self) -> Any:
+        return PocsagDecoder(
+            sample_rate=self.sample_rate,
+            baud_rates=self.baud_rates,
+            charset=self.charset,
+            block_size=self.block_size,
+            logger=self.logger,
+        )
+
+    def audio_sink(self) -> "NativeDecoderWorker":
+        """The pump writes the audio directly into this worker."""
+        return self
+
+    def write(self, data: bytes) -> int:
+        with self._lock:
+            if self._closed:
+                raise ValueError("decoder is closed")
+            try:
+                messages = self.decoder.feed(data)
+            except Exception as e:
+                if self.logger:
+                    self.logger.error("%s failed: %s", self.name, e, exc_info=True)
+                self._close()
+                raise ValueError(f"decoder failed: {e}") from e
+        for message in messages:
+            self._queue.put(message)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        """End of the audio: decode what is buffered and end iter_lines()."""
+        with self._lock:
+            self._close()
+
+    def _close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            for message in self.decoder.flush():
+                self._queue.put(message)
+        except Exception as e:
+            if self.logger:
+                self.logger.error("%s failed: %s", self.name, e)
+        self._queue.put(_DONE)
+
+    def iter_lines(self) -> Iterable[PocsagMessage]:
+        """Yield decoded messages until the decoder is closed."""
+        messages = self._queue
+        while True:
+            message = messages.get()
+            if message is _DONE:
+                return
+            yield message
+
+    def stderr_tail(self, count: int = 20) -> str:
+        return ""
+
+    def telemetry(self) -> Dict[str, Any]:
+        return self.decoder.stats() if self.decoder else {}
+
+    def stop(self) -> None:
+        if self.logger and not self._closed:
+            self.logger.info("Stopping %s", self.name)
+        self.close()
@@ -0,0 +1,135 @@
+import queue
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import logging
+
+from .pipeline_supervisor import PipelineSupervisor
+
+# Put on the queue by a reader thread when its pipeline has ended
+_DONE = object()
+
+
+class PipelineGroup:
+    """
+    Runs several rtl_fm -> multimon-ng pipelines side by side.
+
+    Each pipeline (one dongle / frequency) keeps its own supervisor with
+    independent restarts. A reader thread per pipeline forwards the decoded
+    lines into one queue, so the caller consumes a single merged stream of
+    (pipeline name, line) pairs and a single MessageHandler serves all
+    dongles. Every rtl_fm and multimon-ng is a separate process, so the
+    demodulation work spreads over all cores.
+    """
+
+    def __init__(
+        self,
+        supervisors: Dict[str, PipelineSupervisor],
+        max_queue: int = 10000,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """
+        Args:
+            supervisors: Pipeline supervisors by pipeline name
+            max_queue: Lines buffered before the readers block
+            logger: Optional logger instance
+        """
+        if not supervisors:
+            raise ValueError("PipelineGroup needs at least one pipeline")
+
+        self.supervisors = supervisors
+        self.logger = logger
+
+        self._queue: "queue.Queue[Tuple[str, Any]]" = queue.Queue(maxsize=max_queue)
+        self._readers: List[threading.Thread] = []
+        self._running: Dict[str, bool] = {}
+        self._stop_event = threading.Event()
+        # Last time the consumer asked for a line (main loop liveness)
+        self._polled_at = time.monotonic()
+
+        # Counters
+        self.lines: Dict[str, int] = {name: 0 for name in supervisors}
+
+    def start(self) -> None:
+        """Start all pipelines and their reader threads."""
+        for name, supervisor in self.supervisors.items():
+            supervisor.start()
+            self._running[name] = True
+
+            reader = threading.Thread(
+                target=self._read, args=(name, supervisor), name=f"lines-{name}"
+            )
+            reader.daemon = True
+            reader.start()
+            self._readers.append(reader)
+
+    def _read(self, name: str, supervisor: PipelineSupervisor) -> None:
+        try:
+            for line in supervisor.iter_lines():
+                self._put((name, line))
+        except Exception as e:
+            if self.logger:
+                self.logger.error("Pipeline %s: reading output failed: %s", name, e)
+        finally:
+            self._put((name, _DONE))
+
+    def _put(self, item: Tuple[str, Any]) -> None:
+        # Blocks while the consumer is behind, but never past stop()
+        while not self._stop_event.is_set():
+            try:
+                self._queue.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def iter_lines(self) -> Iterable[Tuple[str, str]]:
+        """Yield (pipeline name, line) pairs until every pipeline has ended."""
+        while any(self._running.values()) and not self._stop_event.is_set():
+            self._polled_at = time.monotonic()
+            try:
+                name, line = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if line is _DONE:
+                self._running[name] = False
+                if self.logger and any(self._running.values()):
+                    self.logger.error(
+                        "Pipeline %s ended, %d pipelines still running",
+                        name,
+                        sum(self._running.values()),
+                    )
+                continue
+            self.lines[name] += 1
+            yield name, line
+
+    def healthy(self, max_age: float) -> bool:
+        """
+        Liveness for the systemd watchdog.
+
+        True while at least one pipeline runs and the main loop fetched a
+        line (or polled for one) within the last ``max_age`` seconds.
+        """
+        if self._stop_event.is_set() or not any(self._running.values()):
+            return False
+        if time.monotonic() - self._polled_at > max_age:
+            return False
+        return any(
+            supervisor.alive()
+            for name, supervisor in self.supervisors.items()
+            if self._running.get(name)
+        )
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop all pipelines."""
+        self._stop_event.set()
+        for supervisor in self.supervisors.values():
+            supervisor.stop(timeout)
+        for reader in self._readers:
+            if reader is not threading.current_thread():
+                reader.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            name: {**supervisor.stats(), "lines": self.lines[name]}
+            for name, supervisor in self.supervisors.items()
+        }
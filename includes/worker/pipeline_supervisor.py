@@ -0,0 +1,457 @@
+import os
+import random
+import subprocess
+import threading
+import time
+from typing import Callable, Iterable, Optional, Dict, Any, Tuple
+import logging
+
+from includes.storage import AudioRing
+from .rtl_fm_worker import RtlFmWorker
+from .multimon_worker import MultimonWorker
+
+# Kernel pipe-to-pipe copies (Linux, Python 3.10+)
+HAS_SPLICE = hasattr(os, "splice")
+
+
+class PipelineSupervisor:
+    """
+    Keeps the rtl_fm -> multimon-ng pipeline running inside the process.
+
+    Instead of connecting rtl_fm's stdout directly to multimon-ng, a pump
+    thread copies the audio from one to the other. That way each stage can
+    be restarted on its own: when rtl_fm dies (USB hiccup), multimon-ng
+    keeps running and simply receives audio from the new rtl_fm; when
+    multimon-ng dies, the read loop restarts it and carries on. API
+    client, WebSocket listeners and queues are not affected.
+
+    Restarts use exponential backoff with jitter, starting at
+    ``initial_delay`` and capped at ``max_delay``. A stage that ran for
+    ``stable_after`` seconds is considered healthy again and the backoff
+    starts over.
+
+    The pump reads into one reused buffer (no allocation per chunk) and can
+    mirror the audio into an AudioRing on the way (tee). Without a ring and
+    with multimon-ng as decoder, the audio is moved with splice() and never
+    enters user space at all.
+    """
+
+    def __init__(
+        self,
+        rtl_worker: RtlFmWorker,
+        multimon_worker: MultimonWorker,
+        auto_restart: bool = True,
+        initial_delay: float = 0.25,
+        max_delay: float = 5.0,
+        jitter: float = 0.2,
+        stable_after: float = 30.0,
+        chunk_size: int = 4096,
+        name: str = "default",
+        audio_ring: Optional[AudioRing] = None,
+        ready_timeout: float = 10.0,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """
+        Args:
+            rtl_worker: rtl_fm worker (audio source)
+            multimon_worker: multimon-ng worker or NativeDecoderWorker (decoder)
+            auto_restart: Restart a stage that exited (False = stop the pipeline)
+            initial_delay: Delay before the first restart (seconds)
+            max_delay: Upper bound for the exponential restart delay (seconds)
+            jitter: Random +/- share applied to each delay (0.2 = 20%)
+            stable_after: Runtime after which the backoff is reset (seconds)
+            chunk_size: Audio bytes copied per read
+            name: Pipeline name used in log messages and thread names
+            audio_ring: Optional rolling recording of the raw audio
+            ready_timeout: A restarted rtl_fm that does not report ready within
+                this many seconds is killed and retried (0 = do not wait)
+            logger: Optional logger instance
+        """
+        self.rtl_worker = rtl_worker
+        self.multimon_worker = multimon_worker
+        self.auto_restart = auto_restart
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.stable_after = stable_after
+        self.chunk_size = chunk_size
+        self.name = name
+        self.audio_ring = audio_ring
+        self.ready_timeout = ready_timeout
+        self.logger = logger
+
+        self._lock = threading.Condition()
+        self._stop_event = threading.Event()
+        self._pump: Optional[threading.Thread] = None
+        self._sink = None
+        self._source_done = False
+        self._failures: Dict[str, int] = {"rtl_fm": 0, "multimon-ng": 0}
+        self._started_at: Dict[str, float] = {}
+        # Restarts asked for from outside (stall watchdog, scanner):
+        # stage -> (reason, action before the start, immediate)
+        self._requested: Dict[str, Tuple[str, Optional[Callable[[], None]], bool]] = {}
+
+        # Called by the pump when the first audio of a new rtl_fm arrives
+        self.on_source_start: Optional[Callable[[], None]] = None
+
+        # Counters
+        self.bytes_read = 0
+        self.lines_read = 0
+        self.retunes = 0
+        self.restarts: Dict[str, int] = {"rtl_fm": 0, "multimon-ng": 0}
+        self.last_exit_code: Dict[str, Optional[int]] = {
+            "rtl_fm": None,
+            "multimon-ng": None,
+        }
+
+    def start(self) -> None:
+        """Start the pipeline (rtl_fm may already be running, e.g. after a startup check)."""
+        if self.rtl_worker.process is None:
+            self.rtl_worker.start()
+        self._started_at["rtl_fm"] = time.monotonic()
+
+        self._start_multimon()
+
+        self._pump = threading.Thread(
+            target=self._pump_audio, name=f"audio-pump-{self.name}", daemon=True
+        )
+        self._pump.start()
+
+    # ------------------------------------------------------------------
+    # Audio pump (rtl_fm -> multimon-ng)
+    # ------------------------------------------------------------------
+
+    def _pump_audio(self) -> None:
+        buffer = bytearray(self.chunk_size)
+        view = memoryview(buffer)
+
+        while not self._stop_event.is_set():
+            source = self.rtl_worker.process.stdout
+            fd = source.fileno()
+            first = True
+
+            while True:
+                sink = self._splice_target()
+                if sink is not None:
+                    size = self._splice(fd, sink)
+                    if size is None:
+                        continue
+                    self.bytes_read += size
+                else:
+                    try:
+                        size = os.readv(fd, [buffer])
+                    except OSError:
+                        size = 0
+                    if size:
+                        self.bytes_read += size
+                        chunk = view[:size]
+                        self._tee(chunk)
+                        self._write(chunk)
+                if not size:
+                    break
+                if first:
+                    first = False
+                    if self.on_source_start:
+                        self.on_source_start()
+
+            # rtl_fm closed its output: it exited or is about to
+            exit_code = self._reap(self.rtl_worker.process)
+            if self._stop_event.is_set():
+                break
+
+            self.last_exit_code["rtl_fm"] = exit_code
+            self._report_failure("rtl_fm", self.rtl_worker, exit_code)
+
+            if not self.auto_restart or not self._restart("rtl_fm"):
+                break
+
+        # No more audio: let multimon-ng finish so the read loop ends
+        with self._lock:
+            self._source_done = True
+            self._close_sink()
+            self._lock.notify_all()
+
+    def _splice_target(self):
+        """The decoder's stdin if the audio can bypass user space, else None."""
+        if not HAS_SPLICE or self.audio_ring is not None:
+            return None
+        sink = self._sink
+        if sink is None or not hasattr(sink, "fileno"):
+            return None
+        return sink
+
+    def _splice(self, fd: int, sink) -> Optional[int]:
+        """Move audio pipe to pipe. Returns bytes moved, 0 at EOF, None if the decoder is gone."""
+        try:
+            return os.splice(fd, sink.fileno(), self.chunk_size)
+        except (ValueError, OSError):
+            # multimon-ng is gone (or rtl_fm; then the next read ends the loop)
+            with self._lock:
+                if self._sink is sink:
+                    self._sink = None
+            return None
+
+    def _tee(self, chunk: memoryview) -> None:
+        if self.audio_ring is None:
+            return
+        try:
+            self.audio_ring.write(chunk)
+        except (OSError, ValueError) as e:
+            # Recording is best effort; decoding goes on without it
+            if self.logger:
+                self.logger.error(
+                    "Pipeline %s: audio recording disabled: %s", self.name, e
+                )
+            self.audio_ring = None
+
+    def _write(self, chunk: memoryview) -> None:
+        with self._lock:
+            if self._sink is None:
+                # multimon-ng is being restarted: wait briefly, drop audio meanwhile
+                self._lock.wait(0.5)
+            sink = self._sink
+        if sink is None:
+            return
+
+        try:
+            sink.write(chunk)
+            sink.flush()
+        except (BrokenPipeError, ValueError, OSError):
+            # multimon-ng is gone; the read loop restarts it
+            with self._lock:
+                if self._sink is sink:
+                    self._sink = None
+
+    def _close_sink(self) -> None:
+        if self._sink is not None:
+            try:
+                self._sink.close()
+            except (BrokenPipeError, ValueError, OSError):
+                pass
+            self._sink = None
+
+    # ------------------------------------------------------------------
+    # Decoder output
+    # ------------------------------------------------------------------
+
+    def iter_lines(self) -> Iterable[str]:
+        """Yield multimon-ng output lines across multimon-ng restarts."""
+        while True:
+            for line in self.multimon_worker.iter_lines():
+                self.lines_read += 1
+                yield line
+
+            exit_code = self._reap(self.multimon_worker.process)
+            with self._lock:
+                source_done = self._source_done
+                self._close_sink()
+
+            if self._stop_event.is_set() or source_done:
+                return
+
+            self.last_exit_code["multimon-ng"] = exit_code
+            self._report_failure("multimon-ng", self.multimon_worker, exit_code)
+
+            if not self.auto_restart or not self._restart("multimon-ng"):
+                self.stop()
+                return
+
+    def _start_multimon(self) -> None:
+        # The decoder reads from a pipe fed by the pump, never from rtl_fm directly
+        self.multimon_worker.input_stream = subprocess.PIPE
+        self.multimon_worker.start()
+        with self._lock:
+            self._sink = self.multimon_worker.audio_sink()
+            self._lock.notify_all()
+        self._started_at["multimon-ng"] = time.monotonic()
+
+    def _report_failure(self, stage: str, worker, exit_code: Optional[int]) -> None:
+        """Log an unexpected exit together with the stage's last stderr lines."""
+        if not self.logger:
+            return
+        if stage in self._requested:
+            reason, _, immediate = self._requested[stage]
+            self.logger.log(
+                logging.DEBUG if immediate else logging.WARNING,
+                "Pipeline %s: %s stopped (%s), exit code %s",
+                self.name,
+                stage,
+                reason,
+                exit_code,
+            )
+            return
+        self.logger.error(
+            "Pipeline %s: %s exited unexpectedly (exit code %s), telemetry: %s, "
+            "last stderr:\n%s",
+            self.name,
+            stage,
+            exit_code,
+            worker.telemetry(),
+            worker.stderr_tail() or "(empty)",
+        )
+
+    # ------------------------------------------------------------------
+    # Restarts
+    # ------------------------------------------------------------------
+
+    def _restart(self, stage: str) -> bool:
+        """Restart a stage after the backoff delay. Returns False if stopped."""
+        if time.monotonic() - self._started_at.get(stage, 0.0) >= self.stable_after:
+            self._failures[stage] = 0
+
+        while True:
+            reason, action, immediate = self._requested.get(stage, ("", None, False))
+            if immediate:
+                # Planned restart (e.g. retune): no backoff, not a failure
+                delay = 0.0
+            else:
+                delay = self.backoff_delay(self._failures[stage])
+                self._failures[stage] += 1
+
+                if self.logger:
+                    self.logger.warning(
+                        "Pipeline %s: restarting %s in %.2fs (attempt %d)",
+                        self.name,
+                        stage,
+                        delay,
+                        self._failures[stage],
+                    )
+
+            if self._stop_event.wait(delay):
+                return False
+
+            if action is not None:
+                self._requested[stage] = (reason, None, immediate)
+                try:
+                    action()
+                except OSError as e:
+                    if self.logger:
+                        self.logger.error(
+                            "Pipeline %s: before restarting %s: %s", self.name, stage, e
+                        )
+
+            try:
+                if stage == "rtl_fm":
+                    self.rtl_worker.start()
+                    self._started_at[stage] = time.monotonic()
+                    self._await_rtl_ready()
+                else:
+                    self._start_multimon()
+                break
+            except OSError as e:
+                if self.logger:
+                    self.logger.error(
+                        "Pipeline %s: failed to restart %s: %s", self.name, stage, e
+                    )
+                if stage in self._requested:
+                    # Retry with the normal backoff
+                    self._requested[stage] = (reason, None, False)
+
+        if self._requested.pop(stage, ("", None, False))[2]:
+            self.retunes += 1
+            return True
+        self.restarts[stage] += 1
+        if self.logger:
+            self.logger.info("Pipeline %s: %s restarted", self.name, stage)
+        return True
+
+    def _await_rtl_ready(self) -> None:
+        """Kill a restarted rtl_fm that hangs in its startup (e.g. USB) instead of waiting forever."""
+        if not self.ready_timeout or self.rtl_worker.wait_ready(self.ready_timeout):
+            return
+        if self._stop_event.is_set() or self.rtl_worker.process.poll() is not None:
+            return
+        if self.logger:
+            self.logger.error(
+                "Pipeline %s: rtl_fm not ready after %.0fs, last stderr:\n%s",
+                self.name,
+                self.ready_timeout,
+                self.rtl_worker.stderr_tail() or "(empty)",
+            )
+        # The pump sees EOF and restarts it with backoff
+        self.rtl_worker.process.kill()
+
+    def restart_stage(
+        self,
+        stage: str,
+        reason: str,
+        before_start: Optional[Callable[[], None]] = None,
+        immediate: bool = False,
+    ) -> None:
+        """
+        Stop a running stage so the supervisor restarts it with backoff.
+
+        Args:
+            stage: "rtl_fm" or "multimon-ng" (the decoder stage)
+            reason: Logged instead of an unexpected exit
+            before_start: Called right before the new process starts
+                (e.g. a USB reset of the dongle); OSError is logged
+            immediate: Planned restart (e.g. a retune): no backoff delay,
+                counted in ``retunes`` instead of ``restarts``
+        """
+        if self._stop_event.is_set():
+            return
+        if self.logger:
+            self.logger.log(
+                logging.DEBUG if immediate else logging.WARNING,
+                "Pipeline %s: restarting %s: %s",
+                self.name,
+                stage,
+                reason,
+            )
+        self._requested[stage] = (reason, before_start, immediate)
+        worker = self.rtl_worker if stage == "rtl_fm" else self.multimon_worker
+        worker.stop()
+
+    def restart_pending(self) -> bool:
+        """True from restart_stage() until the stage was started again (retunes excluded)."""
+        return any(not immediate for _, _, immediate in self._requested.values())
+
+    def backoff_delay(self, failures: int) -> float:
+        """Delay before the next restart after ``failures`` quick failures in a row."""
+        delay = min(self.max_delay, self.initial_delay * (2**failures))
+        return max(0.0, delay * (1 + random.uniform(-self.jitter, self.jitter)))
+
+    @staticmethod
+    def _reap(process: Optional[subprocess.Popen]) -> Optional[int]:
+        if process is None:
+            return None
+        try:
+            return process.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            return process.wait()
+
+    # ------------------------------------------------------------------
+    # Shutdown
+    # ------------------------------------------------------------------
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop both stages and the pump."""
+        self._stop_event.set()
+        with self._lock:
+            self._lock.notify_all()
+
+        self.rtl_worker.stop()
+        if self._pump and self._pump is not threading.current_thread():
+            self._pump.join(timeout)
+        self.multimon_worker.stop()
+
+    def alive(self) -> bool:
+        """True while the pipeline runs (the pump keeps it restarting)."""
+        return (
+            not self._stop_event.is_set()
+            and self._pump is not None
+            and self._pump.is_alive()
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "bytes_read": self.bytes_read,
+            "lines_read": self.lines_read,
+            "restarts": dict(self.restarts),
+            "retunes": self.retunes,
+            "last_exit_code": dict(self.last_exit_code),
+            "rtl_fm": self.rtl_worker.telemetry(),
+            "multimon-ng": self.multimon_worker.telemetry(),
+        }
@@ -0,0 +1,225 @@
+import os
+import subprocess
+import threading
+import time
+import wave
+from datetime import datetime
+from typing import Iterable, List, Optional
+import logging
+
+from .multimon_worker import MultimonWorker
+
+MODE_AUTO = "auto"
+MODE_TEXT = "text"
+MODE_AUDIO = "audio"
+MODES = (MODE_AUTO, MODE_TEXT, MODE_AUDIO)
+
+AUDIO_EXTENSIONS = (".raw", ".pcm", ".s16", ".wav")
+
+# multimon-ng --timestamp prefix: "YYYY-MM-DD HH:MM:SS: "
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+TIMESTAMP_LEN = 19
+
+
+class ReplayWorker:
+    """
+    Replays a recording instead of a live RTL-SDR.
+
+    Two kinds of recordings are supported:
+
+    - text:  captured multimon-ng output, one line per decode
+    - audio: raw rtl_fm output (signed 16 bit mono PCM, or a WAV file),
+             piped into a multimon-ng process like the live pipeline does
+
+    With speed 0 the recording is replayed as fast as possible; with
+    speed 1.0 at real-time pace (2.0 = twice as fast). Text recordings
+    are paced by their multimon-ng --timestamp prefixes, audio by the
+    sample rate.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        mode: str = MODE_AUTO,
+        speed: float = 0.0,
+        sample_rate: int = 22050,
+        multimon_command: str = "multimon-ng",
+        multimon_args: Optional[List[str]] = None,
+        chunk_size: int = 8192,
+        decoder=None,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """
+        Args:
+            path: Recording to replay
+            mode: 'text', 'audio' or 'auto' (detected from extension and content)
+            speed: Replay speed factor (0 = as fast as possible, 1.0 = real time)
+            sample_rate: Sample rate of raw PCM recordings (rtl_fm -s)
+            multimon_command: multimon-ng binary (audio mode)
+            multimon_args: multimon-ng arguments (audio mode)
+            chunk_size: PCM bytes written to multimon-ng per write
+            decoder: Decoder stage for audio instead of multimon-ng (NativeDecoderWorker)
+            logger: Optional logger instance
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown replay mode: {mode}")
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"Replay file not found: {path}")
+
+        self.path = path
+        self.mode = self.detect_mode(path) if mode == MODE_AUTO else mode
+        self.speed = max(0.0, speed)
+        self.sample_rate = sample_rate
+        self.chunk_size = chunk_size
+        self.logger = logger
+
+        self.multimon_worker: Optional[MultimonWorker] = None
+        if self.mode == MODE_AUDIO and decoder is not None:
+            self.multimon_worker = decoder
+        elif self.mode == MODE_AUDIO:
+            self.multimon_worker = MultimonWorker(
+                multimon_command,
+                multimon_args,
+                input_stream=subprocess.PIPE,
+                logger=logger,
+            )
+
+        self._feeder: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+        # Counters
+        self.bytes_fed = 0
+        self.lines_read = 0
+
+    @staticmethod
+    def detect_mode(path: str) -> str:
+        """Guess whether a recording is multimon-ng text or rtl_fm audio."""
+        if path.lower().endswith(AUDIO_EXTENSIONS):
+            return MODE_AUDIO
+
+        with open(path, "rb") as f:
+            head = f.read(4096)
+        try:
+            head.decode("utf-8")
+        except UnicodeDecodeError:
+            return MODE_AUDIO
+        # PCM usually contains NUL bytes; text never does
+        return MODE_AUDIO if b"\x00" in head else MODE_TEXT
+
+    def start(self) -> None:
+        if self.logger:
+            self.logger.info(
+                "Replaying %s (%s, speed=%s)",
+                self.path,
+                self.mode,
+                self.speed or "max",
+            )
+
+        if self.multimon_worker:
+            self.multimon_worker.start()
+            self._feeder = threading.Thread(
+                target=self._feed_audio,
+                args=(self.multimon_worker.audio_sink(),),
+                name="replay-feeder",
+                daemon=True,
+            )
+            self._feeder.start()
+
+    def iter_lines(self) -> Iterable[str]:
+        if self.multimon_worker:
+            lines = self.multimon_worker.iter_lines()
+        else:
+            lines = self._iter_text()
+
+        for line in lines:
+            self.lines_read += 1
+            yield line
+
+    def _iter_text(self) -> Iterable[str]:
+        started = time.monotonic()
+        first_stamp: Optional[datetime] = None
+
+        with open(self.path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                if self._stop_event.is_set():
+                    return
+
+                if self.speed:
+                    stamp = self._parse_timestamp(line)
+                    if stamp is not None:
+                        if first_stamp is None:
+                            first_stamp = stamp
+                        due = (stamp - first_stamp).total_seconds() / self.speed
+                        delay = due - (time.monotonic() - started)
+                        if delay > 0 and self._stop_event.wait(delay):
+                            return
+
+                yield line.rstrip("\n")
+
+    @staticmethod
+    def _parse_timestamp(line: str) -> Optional[datetime]:
+        if len(line) < TIMESTAMP_LEN or line[4] != "-":
+            return None
+        try:
+            return datetime.strptime(line[:TIMESTAMP_LEN], TIMESTAMP_FORMAT)
+        except ValueError:
+            return None
+
+    def _feed_audio(self, stdin) -> None:
+        """Write the PCM recording to multimon-ng, paced by the sample rate."""
+        try:
+            if self.path.lower().endswith(".wav"):
+                with wave.open(self.path, "rb") as recording:
+                    byte_rate = recording.getframerate() * recording.getsampwidth()
+                    byte_rate *= recording.getnchannels()
+                    frames = (
+                        self.chunk_size
+                        // recording.getsampwidth()
+                        // recording.getnchannels()
+                    )
+                    self._pump(lambda: recording.readframes(frames), stdin, byte_rate)
+            else:
+                with open(self.path, "rb") as recording:
+                    self._pump(
+                        lambda: recording.read(self.chunk_size),
+                        stdin,
+                        self.sample_rate * 2,
+                    )
+        except (BrokenPipeError, ValueError):
+            # multimon-ng exited or was stopped
+            pass
+        except Exception as e:
+            if self.logger:
+                self.logger.error("Replay feeder failed: %s", e)
+        finally:
+            try:
+                stdin.close()
+            except OSError:
+                pass
+
+    def _pump(self, read, stdin, byte_rate: int) -> None:
+        started = time.monotonic()
+        while not self._stop_event.is_set():
+            chunk = read()
+            if not chunk:
+                return
+            stdin.write(chunk)
+            self.bytes_fed += len(chunk)
+
+            if self.speed:
+                due = self.bytes_fed / (byte_rate * self.speed)
+                delay = due - (time.monotonic() - started)
+                if delay > 0:
+                    self._stop_event.wait(delay)
+
+    def wait(self) -> None:
+        """Wait until the recording has been fully processed."""
+        if self._feeder:
+            self._feeder.join()
+        if self.multimon_worker and self.multimon_worker.process:
+            self.multimon_worker.process.wait()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self.multimon_worker:
+            self.multimon_worker.stop()
@@ -0,0 +1,470 @@
+import collections
+import math
+import statistics
+import threading
+import time
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+import logging
+
+from .rtl_fm_worker import RtlFmWorker
+
+# Gains supported by the R820T/R820T2 tuner (dB); rtl_fm rounds to these
+R820T_GAINS = (
+    0.0,
+    0.9,
+    1.4,
+    2.7,
+    3.7,
+    7.7,
+    8.7,
+    12.5,
+    14.4,
+    15.7,
+    16.6,
+    19.7,
+    20.7,
+    22.9,
+    25.4,
+    28.0,
+    29.7,
+    32.8,
+    33.8,
+    36.4,
+    37.2,
+    38.6,
+    40.2,
+    42.1,
+    43.4,
+    43.9,
+    44.5,
+    48.0,
+    49.6,
+)
+
+# Bits per POCSAG codeword covered by the BCH(31,21) code
+CODEWORD_BITS = 31
+# Codewords per POCSAG batch (after the sync codeword)
+BATCH_CODEWORDS = 16
+
+# A setting: (gain in dB or None for automatic gain, squelch level)
+Setting = Tuple[Optional[float], int]
+
+
+class RfAutoTuner:
+    """
+    Tunes rtl_fm gain and squelch by decode yield.
+
+    Hand-set ``-g``/``-l`` values drift out of their sweet spot when the RF
+    environment changes. Every ``interval`` seconds the tuner runs one
+    round: it measures the current setting for ``trial_seconds``, then
+    each neighbouring candidate (one gain step and one squelch step up and
+    down; with automatic gain, fixed gains spread over the gain table),
+    restarting rtl_fm through the supervisor for every candidate.
+    A trial is scored by valid decodes per minute (codewords with the
+    native decoder, otherwise messages), weighted with the BCH bit error
+    rate as the share of codewords that would have decoded without
+    correction. The best candidate is kept if it beats the current
+    setting by ``min_improvement`` and the difference is significant,
+    otherwise the current setting is restored. Repeated rounds walk
+    towards the optimum one step at a time.
+
+    Trials run one after another on live traffic, so page arrivals alone
+    make their scores differ (Poisson noise, about 30% at 10 messages per
+    trial). A trial counts its decodes: messages, or with codeword
+    telemetry the received batches if there are more. A candidate needs
+    ``min_decodes`` of them, and its lead must hold at ``confidence`` in
+    a one-sided test that treats each score as a Poisson rate of the
+    trial's decodes. Without enough traffic the setting stays unchanged.
+
+    A round costs at most one restart per candidate plus one, each a short
+    gap (rtl_fm startup), and restarts are capped at
+    ``max_restarts_per_hour``. Decisions go to ``on_decision`` (noxfeed
+    persists them to config.json).
+
+    The tuner is a state machine driven by ``tick(now)``; the thread only
+    calls it once per second. A simulation can drive it with virtual time
+    and a simulated supervisor (see benchmarks/bench_autotune.py).
+    """
+
+    def __init__(
+        self,
+        supervisor: Any,
+        interval: float = 21600.0,
+        start_delay: float = 600.0,
+        trial_seconds: float = 300.0,
+        settle: float = 5.0,
+        gains: Sequence[float] = R820T_GAINS,
+        gain_steps: int = 1,
+        squelch_step: int = 5,
+        min_improvement: float = 0.15,
+        min_decodes: int = 10,
+        confidence: float = 0.99,
+        max_restarts_per_hour: int = 12,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """
+        Args:
+            supervisor: PipelineSupervisor (or a simulation with rtl_worker.args,
+                restart_stage() and multimon_worker.telemetry())
+            interval: Seconds between tuning rounds
+            start_delay: Seconds before the first round
+            trial_seconds: Measurement time per candidate
+            settle: Seconds after a restart before the measurement starts
+            gains: Gain steps of the tuner (dB)
+            gain_steps: Gain candidates are this many steps up and down
+            squelch_step: Squelch candidates are this much up and down (0 = fixed)
+            min_improvement: Relative score gain needed to change the setting
+            min_decodes: Decodes (messages or codeword batches) a winning trial needs
+            confidence: Confidence that the candidate's lead is not chance
+            max_restarts_per_hour: Restart budget; a round waits for enough budget
+            logger: Optional logger instance
+        """
+        self.supervisor = supervisor
+        self.interval = interval
+        self.trial_seconds = trial_seconds
+        self.settle = settle
+        self.gains = sorted(gains)
+        self.gain_steps = gain_steps
+        self.squelch_step = squelch_step
+        self.min_improvement = min_improvement
+        self.min_decodes = min_decodes
+        # One-sided z threshold of the significance test
+        self.min_z = statistics.NormalDist().inv_cdf(confidence)
+        self.max_restarts_per_hour = max_restarts_per_hour
+        self.logger = logger
+
+        # Called with (gain, squelch) when a new setting was kept
+        self.on_decision: Optional[Callable[[Optional[float], int], None]] = None
+
+        self.setting = self._current_setting()
+        self._active = self.setting
+        self._messages = 0
+        self._restarts: Deque[float] = collections.deque()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # Round state
+        self._next_round = time.monotonic() + start_delay
+        self._candidates: List[Setting] = []
+        self._scores: Dict[Setting, float] = {}
+        self._decodes: Dict[Setting, int] = {}
+        self._trial: Optional[Setting] = None
+        self._trial_start = 0.0
+        self._trial_counters: Optional[Tuple[int, int, int, int]] = None
+
+        # Counters
+        self.rounds = 0
+        self.changes = 0
+        self.last_round: Dict[str, Any] = {}
+
+    # ------------------------------------------------------------------
+    # Settings
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _option(args: Sequence[str], flag: str) -> Optional[str]:
+        if flag in args and args.index(flag) + 1 < len(args):
+            return args[args.index(flag) + 1]
+        return None
+
+    def _current_setting(self) -> Setting:
+        args = self.supervisor.rtl_worker.args
+        gain = self._option(args, "-g")
+        squelch = self._option(args, "-l")
+        return (
+            self._snap(float(gain)) if gain is not None else None,
+            int(float(squelch)) if squelch is not None else 0,
+        )
+
+    def _snap(self, gain: float) -> float:
+        return min(self.gains, key=lambda step: abs(step - gain))
+
+    def candidates(self, setting: Setting) -> List[Setting]:
+        """
+        The setting itself, followed by its neighbours.
+
+        Automatic gain has no neighbours in the gain table; instead
+        ``2 * gain_steps`` fixed gains spread evenly over the table are
+        tried, and later rounds walk on from the one that wins.
+        """
+        gain, squelch = setting
+        result = [setting]
+        if gain is None:
+            seeds = 2 * self.gain_steps
+            for position in range(1, seeds + 1):
+                index = position * len(self.gains) // (seeds + 1)
+                if (self.gains[index], squelch) not in result:
+                    result.append((self.gains[index], squelch))
+        else:
+            index = self.gains.index(gain)
+            for offset in range(1, self.gain_steps + 1):
+                for neighbour in (index - offset, index + offset):
+                    if 0 <= neighbour < len(self.gains):
+                        result.append((self.gains[neighbour], squelch))
+        if self.squelch_step:
+            for level in (squelch - self.squelch_step, squelch + self.squelch_step):
+                if level >= 0:
+                    result.append((gain, level))
+        return result
+
+    def _apply(self, setting: Setting, now: float, reason: str) -> None:
+        gain, squelch = setting
+        rtl_worker = self.supervisor.rtl_worker
+        args = rtl_worker.args
+        if gain is None:
+            args = RtlFmWorker.remove_option(args, "-g")
+        else:
+            args = RtlFmWorker.set_option(args, "-g", f"{gain:g}")
+        rtl_worker.args = RtlFmWorker.set_option(args, "-l", squelch)
+        self._active = setting
+        self._restarts.append(now)
+        self.supervisor.restart_stage(
+            "rtl_fm",
+            f"{reason}: gain {self._format_gain(gain)}, squelch {squelch}",
+            immediate=True,
+        )
+
+    @staticmethod
+    def _format_gain(gain: Optional[float]) -> str:
+        return "auto" if gain is None else f"{gain:g} dB"
+
+    # ------------------------------------------------------------------
+    # Measurement
+    # ------------------------------------------------------------------
+
+    def record(self) -> None:
+        """Count a decoded message of this pipeline (called by the main loop)."""
+        self._messages += 1
+
+    def _counters(self) -> Tuple[int, int, int, int]:
+        """(messages, codewords, corrected bits, uncorrectable codewords)."""
+        codewords = corrected = uncorrectable = 0
+        telemetry = self.supervisor.multimon_worker.telemetry() or {}
+        # Native decoder: counters per baud rate; multimon-ng reports none
+        for value in telemetry.values():
+            if isinstance(value, dict):
+                codewords += value.get("codewords", 0)
+                corrected += value.get("corrected_bits", 0)
+                uncorrectable += value.get("uncorrectable", 0)
+        return self._messages, codewords, corrected, uncorrectable
+
+    def score(
+        self,
+        start: Tuple[int, int, int, int],
+        end: Tuple[int, int, int, int],
+        seconds: float,
+    ) -> Dict[str, Any]:
+        """Score of a trial from the counters at its start and end."""
+        # A restarted decoder starts counting from zero again
+        messages, codewords, corrected, uncorrectable = (
+            after - before if after >= before else after
+            for before, after in zip(start, end)
+        )
+        minutes = max(seconds, 1e-9) / 60
+        if codewords:
+            bit_error_rate = (corrected + 3 * uncorrectable) / (
+                CODEWORD_BITS * codewords
+            )
+            clean_share = max(0.0, 1 - bit_error_rate) ** CODEWORD_BITS
+            valid = (codewords - uncorrectable) / minutes
+        else:
+            bit_error_rate = None
+            clean_share = 1.0
+            valid = messages / minutes
+        return {
+            # Independent units for the significance test
+            "decodes": max(messages, codewords // BATCH_CODEWORDS),
+            "messages_per_minute": round(messages / minutes, 2),
+            "valid_per_minute": round(valid, 2),
+            "bit_error_rate": (
+                None if bit_error_rate is None else round(bit_error_rate, 5)
+            ),
+            "score": valid * clean_share,
+        }
+
+    # ------------------------------------------------------------------
+    # State machine
+    # ------------------------------------------------------------------
+
+    def _budget(self, now: float) -> int:
+        while self._restarts and now - self._restarts[0] > 3600:
+            self._restarts.popleft()
+        return self.max_restarts_per_hour - len(self._restarts)
+
+    def tick(self, now: Optional[float] = None) -> None:
+        """Advance the tuner; call about once per second."""
+        now = time.monotonic() if now is None else now
+
+        if self._trial is None:
+            if now < self._next_round:
+                return
+            candidates = self.candidates(self.setting)
+            if len(candidates) < 2:
+                self._next_round = now + self.interval
+                return
+            # Worst case: one restart per candidate plus restoring the setting
+            if self._budget(now) < len(candidates):
+                self._next_round = now + 60
+                return
+            self._candidates = candidates
+            self._scores = {}
+            self._decodes = {}
+            self.last_round = {"started": time.time(), "trials": {}}
+            self._start_trial(candidates[0], now)
+            return
+
+        if self._trial_counters is None:
+            # Counters are taken once the new rtl_fm has settled
+            if now >= self._trial_start:
+                self._trial_start = now
+                self._trial_counters = self._counters()
+            return
+
+        if now < self._trial_start + self.trial_seconds:
+            return
+
+        result = self.score(
+            self._trial_counters, self._counters(), now - self._trial_start
+        )
+        self._scores[self._trial] = result["score"]
+        self._decodes[self._trial] = result["decodes"]
+        self.last_round["trials"][self._label(self._trial)] = {
+            **result,
+            "score": round(result["score"], 2),
+        }
+
+        remaining = [
+            candidate for candidate in self._candidates if candidate not in self._scores
+        ]
+        if remaining:
+            self._start_trial(remaining[0], now)
+        else:
+            self._finish_round(now)
+
+    def _start_trial(self, setting: Setting, now: float) -> None:
+        self._trial = setting
+        self._trial_counters = None
+        if setting != self._active:
+            self._apply(setting, now, "auto-tune trial")
+            self._trial_start = now + self.settle
+        else:
+            self._trial_start = now
+
+    def significance(self, candidate: Setting) -> float:
+        """
+        z value of the candidate's lead over the current setting.
+
+        A score from n decodes is taken as a Poisson rate, so its variance
+        is about score**2 / n.
+        """
+        variance = 0.0
+        for setting in (candidate, self.setting):
+            if self._decodes[setting]:
+                variance += self._scores[setting] ** 2 / self._decodes[setting]
+        lead = self._scores[candidate] - self._scores[self.setting]
+        return lead / math.sqrt(variance) if variance else 0.0
+
+    def _finish_round(self, now: float) -> None:
+        baseline = self._scores[self.setting]
+        best = max(self._scores, key=lambda setting: self._scores[setting])
+        z = self.significance(best) if best != self.setting else 0.0
+        improved = (
+            best != self.setting
+            and (
+                self._scores[best] > baseline * (1 + self.min_improvement)
+                if baseline
+                else self._scores[best] > 0
+            )
+            and self._decodes[best] >= self.min_decodes
+            and z >= self.min_z
+        )
+        self.last_round["z"] = round(z, 2)
+
+        self.rounds += 1
+        self._trial = None
+        self._next_round = now + self.interval
+
+        if improved:
+            previous, self.setting = self.setting, best
+            self.changes += 1
+            if self.logger:
+                self.logger.info(
+                    "Auto-tune %s: gain %s -> %s, squelch %d -> %d "
+                    "(score %.1f -> %.1f)",
+                    self.supervisor.name,
+                    self._format_gain(previous[0]),
+                    self._format_gain(best[0]),
+                    previous[1],
+                    best[1],
+                    baseline,
+                    self._scores[best],
+                )
+            if self.on_decision:
+                self.on_decision(*best)
+        elif self.logger:
+            self.logger.info(
+                "Auto-tune %s: keeping gain %s, squelch %d "
+                "(score %.1f, best other %.1f, z %.2f; a change needs z %.2f "
+                "and %d decodes)",
+                self.supervisor.name,
+                self._format_gain(self.setting[0]),
+                self.setting[1],
+                baseline,
+                max(
+                    (
+                        score
+                        for setting, score in self._scores.items()
+                        if setting != self.setting
+                    ),
+                    default=0.0,
+                ),
+                z,
+                self.min_z,
+                self.min_decodes,
+            )
+
+        self.last_round["kept"] = self._label(self.setting)
+        if self._active != self.setting:
+            self._apply(self.setting, now, "auto-tune result")
+
+    def _label(self, setting: Setting) -> str:
+        return f"gain={self._format_gain(setting[0])} squelch={setting[1]}"
+
+    # ------------------------------------------------------------------
+    # Thread
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name=f"auto-tune-{self.supervisor.name}", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(1.0):
+            try:
+                self.tick()
+            except Exception as e:
+                if self.logger:
+                    self.logger.error(
+                        "Auto-tune %s failed: %s",
+                        self.supervisor.name,
+                        e,
+                        exc_info=True,
+                    )
+                return
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "gain": self.setting[0],
+            "squelch": self.setting[1],
+            "rounds": self.rounds,
+            "changes": self.changes,
+            "trial": None if self._trial is None else self._label(self._trial),
+            "last_round": self.last_round,
+        }
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop_event.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
@@ -1,7 +1,9 @@
 import subprocess
-from typing import List, Optional
+from typing import List, Optional, Dict, Any
 import logging
 
+from .stderr_drain import StderrDrain, RTL_FM_VALUES, RTL_FM_COUNTERS, RTL_FM_READY
+
 
 class RtlFmWorker:
     """Worker for starting rtl_fm."""
@@ -10,28 +12,119 @@ class RtlFmWorker:
         self,
         command: str = "rtl_fm",
         args: Optional[List[str]] = None,
+        stderr_lines: int = 200,
+        name: str = "rtl_fm",
         logger: Optional[logging.Logger] = None,
     ) -> None:
         self.command = command
         self.args = args or []
         self.logger = logger
+        # Shown in log messages, e.g. "rtl_fm[net-a]" with several pipelines
+        self.name = name
         self.process: Optional[subprocess.Popen] = None
+        # Recent stderr lines and telemetry of the current process
+        self.stderr_lines = stderr_lines
+        self.stderr: Optional[StderrDrain] = None
 
     def start(self) -> subprocess.Popen:
         if self.logger:
             self.logger.info(
-                "Starting rtl_fm: %s %s", self.command, " ".join(self.args)
+                "Starting %s: %s %s",
+                self.name,
+                self.command,
+                " ".join(self.padded_args(self.args)),
             )
 
         self.process = subprocess.Popen(
-            [self.command, *self.args],
+            [self.command, *self.padded_args(self.args)],
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
         )
+        self.stderr = StderrDrain(
+            self.process.stderr,
+            self.name,
+            max_lines=self.stderr_lines,
+            values=RTL_FM_VALUES,
+            counters=RTL_FM_COUNTERS,
+            ready=RTL_FM_READY,
+            logger=self.logger,
+        ).start()
         return self.process
 
+    @staticmethod
+    def set_option(args: List[str], flag: str, value: Any) -> List[str]:
+        """
+        Return a copy of ``args`` with ``flag`` set to ``value``.
+
+        An existing occurrence (e.g. "-f 168.075M") is replaced, otherwise
+        the option is prepended.
+        """
+        args = list(args)
+        if flag in args and args.index(flag) + 1 < len(args):
+            args[args.index(flag) + 1] = str(value)
+        else:
+            args[:0] = [flag, str(value)]
+        return args
+
+    @staticmethod
+    def remove_option(args: List[str], flag: str) -> List[str]:
+        """Return a copy of ``args`` without ``flag`` and its value."""
+        args = list(args)
+        if flag in args:
+            index = args.index(flag)
+            del args[index : index + 2]
+        return args
+
+    @staticmethod
+    def padded_args(args: List[str]) -> List[str]:
+        """
+        ``args`` plus "-E pad" if a squelch (-l above 0) is set.
+
+        A closed squelch otherwise stops rtl_fm's output altogether, which
+        looks exactly like a hung dongle. Padded, rtl_fm writes silence at
+        the full sample rate, so the stall watchdog can tell the two apart.
+        """
+        if "-l" not in args or args.index("-l") + 1 >= len(args):
+            return args
+        try:
+            squelch = float(args[args.index("-l") + 1])
+        except ValueError:
+            return args
+        padded = any(
+            flag == "-E" and value == "pad" for flag, value in zip(args, args[1:])
+        )
+        if squelch <= 0 or padded:
+            return args
+        return [*args, "-E", "pad"]
+
+    def wait_ready(self, timeout: float = 10.0) -> bool:
+        """
+        Wait until rtl_fm reported its tuned frequency and sample rate.
+
+        Replaces a fixed startup sleep: returns as soon as the dongle is
+        streaming, and does not mistake a slow failure (e.g. tuning) for
+        a successful start.
+
+        Returns:
+            True when ready, False if rtl_fm exited or timed out first
+        """
+        if not self.stderr:
+            return False
+        return self.stderr.wait_ready(timeout)
+
+    def stderr_tail(self, count: int = 20) -> str:
+        """Last stderr lines of the current process (waits briefly for a dead one)."""
+        if not self.stderr:
+            return ""
+        if self.process and self.process.poll() is not None:
+            self.stderr.join()
+        return self.stderr.tail(count)
+
+    def telemetry(self) -> Dict[str, Any]:
+        return self.stderr.telemetry() if self.stderr else {}
+
     def stop(self) -> None:
         if self.process and self.process.poll() is None:
             if self.logger:
-                self.logger.info("Stopping rtl_fm")
+                self.logger.info("Stopping %s", self.name)
             self.process.terminate()
@@ -0,0 +1,60 @@
+import re
+from typing import List, Optional, Union
+import logging
+
+from .rtl_fm_worker import RtlFmWorker
+
+# "168.075M", "450k", "168075000"
+_FREQUENCY = re.compile(r"^\s*([\d.]+)\s*([kKmMgG]?)\s*$")
+_UNITS = {"": 1, "k": 1e3, "m": 1e6, "g": 1e9}
+
+
+class RtlSdrWorker(RtlFmWorker):
+    """
+    Worker for starting rtl_sdr (raw u8 I/Q on stdout, no demodulation).
+
+    Used by the wideband mode: one dongle captures several paging
+    frequencies at once and the Channelizer splits them in-process.
+    stderr telemetry and readiness ("Tuned to", "Sampling at") work the
+    same as for rtl_fm.
+    """
+
+    def __init__(
+        self,
+        command: str = "rtl_sdr",
+        args: Optional[List[str]] = None,
+        stderr_lines: int = 200,
+        name: str = "rtl_sdr",
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        super().__init__(command, args, stderr_lines, name, logger)
+
+    @staticmethod
+    def build_args(
+        center_frequency: float,
+        sample_rate: int,
+        device: Optional[Union[int, str]] = None,
+        extra_args: Optional[List[str]] = None,
+    ) -> List[str]:
+        """rtl_sdr arguments writing to stdout, e.g. ["-f", "168500000", "-s", "2400000", "-"]."""
+        args = [arg for arg in extra_args or [] if arg != "-"]
+        args = RtlFmWorker.set_option(args, "-s", sample_rate)
+        args = RtlFmWorker.set_option(args, "-f", int(center_frequency))
+        if device is not None:
+            args = RtlFmWorker.set_option(args, "-d", device)
+        return [*args, "-"]
+
+    @staticmethod
+    def parse_frequency(value: Union[int, float, str]) -> float:
+        """
+        Frequency in Hz from a number or an rtl_fm style string ("168.075M").
+
+        Raises:
+            ValueError: Not a frequency
+        """
+        if isinstance(value, (int, float)):
+            return float(value)
+        match = _FREQUENCY.match(str(value))
+        if not match:
+            raise ValueError(f"Invalid frequency: {value}")
+        return float(match.group(1)) * _UNITS[match.group(2).lower()]
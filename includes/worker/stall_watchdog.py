@@ -0,0 +1,326 @@
+import collections
+import threading
+import time
+from typing import Any, Deque, Dict, Optional, Tuple
+import logging
+
+from .pipeline_supervisor import PipelineSupervisor
+from .usb_reset import find_rtlsdr, reset_usb_device
+
+# Escalation levels of a stalled pipeline
+OK = "ok"
+WARNED = "warned"
+RESTARTED = "restarted"
+USB_RESET = "usb_reset"
+
+
+class _PipelineState:
+    def __init__(self) -> None:
+        # (monotonic time, bytes read, lines read)
+        self.samples: Deque[Tuple[float, int, int]] = collections.deque()
+        self.level = OK
+        self.escalated_at = 0.0
+        # Last restart or USB reset and when it happened (survives recoveries)
+        self.last_action: Optional[str] = None
+        self.last_action_at = 0.0
+        self.bytes_per_second: Optional[float] = None
+        self.lines_per_second: Optional[float] = None
+
+        # Counters
+        self.stalls = 0
+        self.restarts = 0
+        self.usb_resets = 0
+
+
+class StallWatchdog:
+    """
+    Detects pipelines that are alive but no longer deliver anything.
+
+    A dongle that drops off the USB bus often leaves rtl_fm running without
+    output, so the pump and iter_lines() block forever while every process
+    looks healthy. The watchdog samples the bytes read from rtl_fm and the
+    lines (messages) read from the decoder of every pipeline, and compares
+    the rates over a sliding window with configurable floors.
+
+    A stalled pipeline is escalated step by step, each after the previous
+    one had ``restart_after`` seconds (and, after a restart, a fresh
+    measurement window) to help:
+
+    1. warning in the log
+    2. restart through the supervisor (rtl_fm when the audio stalls,
+       the decoder when only the lines stall)
+    3. USB reset of the dongle (USBDEVFS_RESET) before starting rtl_fm again
+
+    After the USB reset the cycle starts over. A pipeline that stalls again
+    within ``stable_after`` seconds of a restart did not really recover, so
+    the escalation continues where it left off. The measured rates are
+    available from ``stats()``.
+
+    With a squelch (``-l`` above 0) rtl_fm runs with ``-E pad`` and writes
+    silence while the squelch is closed, so the audio floor applies as
+    usual. The line floor does not: a squelch legitimately suppresses
+    weak pages on a quiet channel.
+    """
+
+    def __init__(
+        self,
+        supervisors: Dict[str, PipelineSupervisor],
+        min_bytes_per_second: float = 1000.0,
+        min_lines_per_second: float = 0.0,
+        window: float = 30.0,
+        lines_window: float = 900.0,
+        interval: float = 5.0,
+        restart_after: float = 60.0,
+        usb_reset: bool = True,
+        stable_after: float = 600.0,
+        stats_interval: float = 300.0,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """
+        Args:
+            supervisors: Pipeline supervisors by pipeline name
+            min_bytes_per_second: Audio floor (rtl_fm -s 22050 delivers 44100 B/s;
+                0 = off)
+            min_lines_per_second: Decoder output floor (0 = off; quiet
+                networks legitimately send nothing for minutes; not applied
+                to pipelines with a squelch)
+            window: Seconds over which the audio rate is measured
+            lines_window: Seconds over which the line rate is measured
+            interval: Seconds between checks
+            restart_after: Seconds between escalation steps
+            usb_reset: Reset the dongle as the last step (needs write access
+                to /dev/bus/usb)
+            stable_after: Seconds after a restart until a new stall starts
+                the escalation over
+            stats_interval: Seconds between rate log lines (0 = off)
+            logger: Optional logger instance
+        """
+        self.supervisors = supervisors
+        self.min_bytes_per_second = min_bytes_per_second
+        self.min_lines_per_second = min_lines_per_second
+        self.window = window
+        self.lines_window = lines_window
+        self.interval = interval
+        self.restart_after = restart_after
+        self.usb_reset = usb_reset
+        self.stable_after = stable_after
+        self.stats_interval = stats_interval
+        self.logger = logger
+
+        self._states = {name: _PipelineState() for name in supervisors}
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._logged_at = time.monotonic()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name="stall-watchdog", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            now = time.monotonic()
+            for name, supervisor in self.supervisors.items():
+                if supervisor.alive():
+                    self.check(name, now)
+
+            if (
+                self.stats_interval
+                and self.logger
+                and now - self._logged_at >= self.stats_interval
+            ):
+                self._logged_at = now
+                self.logger.info("Pipeline rates: %s", self.rates())
+
+    # ------------------------------------------------------------------
+    # Measurement
+    # ------------------------------------------------------------------
+
+    def _rate(
+        self, state: _PipelineState, now: float, window: float, index: int
+    ) -> Optional[float]:
+        """Rate of counter ``index`` over ``window`` (None until the window is covered)."""
+        oldest = None
+        for sample in state.samples:
+            if now - sample[0] <= window:
+                break
+            oldest = sample
+        if oldest is None:
+            return None
+        latest = state.samples[-1]
+        return (latest[index] - oldest[index]) / (latest[0] - oldest[0])
+
+    def check(self, name: str, now: Optional[float] = None) -> str:
+        """Sample one pipeline, escalate if needed and return its level."""
+        now = time.monotonic() if now is None else now
+        supervisor = self.supervisors[name]
+        state = self._states[name]
+
+        if supervisor.restart_pending():
+            # Measure again once the new process runs
+            state.samples.clear()
+            return state.level
+
+        state.samples.append((now, supervisor.bytes_read, supervisor.lines_read))
+        keep = max(self.window, self.lines_window) + 2 * self.interval
+        while now - state.samples[0][0] > keep:
+            state.samples.popleft()
+
+        state.bytes_per_second = self._rate(state, now, self.window, 1)
+        state.lines_per_second = self._rate(state, now, self.lines_window, 2)
+
+        audio_stalled = (
+            self.min_bytes_per_second > 0
+            and state.bytes_per_second is not None
+            and state.bytes_per_second < self.min_bytes_per_second
+        )
+        lines_stalled = (
+            self.min_lines_per_second > 0
+            and not self._squelch(supervisor)
+            and state.lines_per_second is not None
+            and state.lines_per_second < self.min_lines_per_second
+        )
+
+        if not (audio_stalled or lines_stalled):
+            measured = (
+                not self.min_bytes_per_second or state.bytes_per_second is not None
+            ) and (not self.min_lines_per_second or state.lines_per_second is not None)
+            if state.level != OK and not measured:
+                # Still measuring after a restart
+                return state.level
+            if state.level != OK and self.logger:
+                self.logger.info(
+                    "Pipeline %s recovered (%.0f B/s)",
+                    name,
+                    state.bytes_per_second or 0,
+                )
+            state.level = OK
+            return state.level
+
+        if state.level == OK:
+            state.stalls += 1
+            self._escalate(name, WARNED, now)
+            if self.logger:
+                self.logger.warning(
+                    "Pipeline %s stalled: %s",
+                    name,
+                    self._describe(state, audio_stalled, lines_stalled),
+                )
+            return state.level
+
+        if now - state.escalated_at < self.restart_after:
+            return state.level
+
+        stage = "rtl_fm" if audio_stalled else "multimon-ng"
+        reason = f"stalled, {self._describe(state, audio_stalled, lines_stalled)}"
+
+        restarted_recently = (
+            state.last_action == RESTARTED
+            and now - state.last_action_at < self.stable_after
+        )
+        if restarted_recently and audio_stalled and self.usb_reset:
+            node = find_rtlsdr(self._device(supervisor))
+            if node:
+                self._escalate(name, USB_RESET, now)
+                state.usb_resets += 1
+                supervisor.restart_stage(
+                    stage,
+                    f"{reason}, resetting USB device {node}",
+                    before_start=lambda: self._reset(name, node),
+                )
+                return state.level
+            if self.logger:
+                self.logger.error("Pipeline %s: dongle not found for USB reset", name)
+
+        # First restart, or the cycle starts over after a USB reset
+        self._escalate(name, RESTARTED, now)
+        state.restarts += 1
+        supervisor.restart_stage(stage, reason)
+        return state.level
+
+    def _escalate(self, name: str, level: str, now: float) -> None:
+        state = self._states[name]
+        state.level = level
+        state.escalated_at = now
+        if level != WARNED:
+            state.last_action = level
+            state.last_action_at = now
+            # Rates are measured again from the restart on
+            state.samples.clear()
+
+    def _describe(
+        self, state: _PipelineState, audio_stalled: bool, lines_stalled: bool
+    ) -> str:
+        parts = []
+        if audio_stalled:
+            parts.append(
+                f"audio {state.bytes_per_second:.0f} B/s "
+                f"< {self.min_bytes_per_second:.0f} B/s over {self.window:.0f}s"
+            )
+        if lines_stalled:
+            parts.append(
+                f"decoder {state.lines_per_second:.4f} lines/s "
+                f"< {self.min_lines_per_second} over {self.lines_window:.0f}s"
+            )
+        return ", ".join(parts)
+
+    @staticmethod
+    def _squelch(supervisor: PipelineSupervisor) -> float:
+        """rtl_fm squelch level (-l) of the pipeline, 0 if none is set."""
+        args = supervisor.rtl_worker.args
+        if "-l" in args and args.index("-l") + 1 < len(args):
+            try:
+                return float(args[args.index("-l") + 1])
+            except ValueError:
+                return 0.0
+        return 0.0
+
+    @staticmethod
+    def _device(supervisor: PipelineSupervisor) -> Any:
+        args = supervisor.rtl_worker.args
+        if "-d" in args and args.index("-d") + 1 < len(args):
+            return args[args.index("-d") + 1]
+        return 0
+
+    def _reset(self, name: str, node: str) -> None:
+        reset_usb_device(node)
+        if self.logger:
+            self.logger.warning("Pipeline %s: USB device %s reset", name, node)
+        # The device re-enumerates before rtl_fm can open it again
+        self._stop_event.wait(2.0)
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _round(value: Optional[float], digits: int) -> Optional[float]:
+        return None if value is None else round(value, digits)
+
+    def rates(self) -> Dict[str, Dict[str, Optional[float]]]:
+        return {
+            name: {
+                "bytes_per_second": self._round(state.bytes_per_second, 0),
+                "lines_per_second": self._round(state.lines_per_second, 4),
+            }
+            for name, state in self._states.items()
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        rates = self.rates()
+        return {
+            name: {
+                **rates[name],
+                "level": state.level,
+                "stalls": state.stalls,
+                "restarts": state.restarts,
+                "usb_resets": state.usb_resets,
+            }
+            for name, state in self._states.items()
+        }
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop_event.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
@@ -0,0 +1,182 @@
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, IO, List, Optional, Pattern, Sequence
+import logging
+
+# rtl_fm status lines, e.g. "Tuned to 168327000 Hz."
+RTL_FM_VALUES: Dict[str, Pattern] = {
+    "device": re.compile(r"Using device \d+: (.+)"),
+    "gain_db": re.compile(r"Tuner gain set to (-?[\d.]+) dB"),
+    "tuned_hz": re.compile(r"Tuned to (\d+) Hz"),
+    "sample_rate": re.compile(r"Sampling at (\d+) S/s"),
+    "output_rate": re.compile(r"Output at (\d+) Hz"),
+}
+
+# rtl_fm is up once it tuned and reports its sample rate; a failed tuning
+# prints "Failed to set center freq." instead of "Tuned to"
+RTL_FM_READY = ("tuned_hz", "sample_rate")
+
+# Problems worth counting; a captured number is added, otherwise 1
+RTL_FM_COUNTERS: Dict[str, Pattern] = {
+    "overflows": re.compile(r"Lost at least|samples lost|[Oo]verflow"),
+    "lost_bytes": re.compile(r"Lost at least (\d+) bytes"),
+    # "cb transfer status" is librtlsdr's report of a dongle that went away
+    "usb_errors": re.compile(
+        r"usb_\w+ error|LIBUSB_ERROR|Failed to open rtlsdr|cb transfer status"
+    ),
+}
+
+# Log a matched counter line as a warning at most this often (seconds)
+WARNING_INTERVAL = 60
+
+MULTIMON_VALUES: Dict[str, Pattern] = {
+    "version": re.compile(r"multimon-ng ([\d.]+)"),
+    "demodulators": re.compile(r"Enabled demodulators: (.+)"),
+}
+
+
+class StderrDrain:
+    """
+    Background reader for a child process' stderr.
+
+    A stderr pipe that is never read fills up (64 KiB on Linux) and the
+    child then blocks on its next status message - for rtl_fm that means
+    decoding silently stops. The drain reads every line as it arrives,
+    keeps the last ``max_lines`` in a ring buffer for failure reports and
+    extracts telemetry (last seen values and counters) with regular
+    expressions. With ``ready`` keys, wait_ready() reports when the child
+    printed all of them (its startup is complete).
+    """
+
+    def __init__(
+        self,
+        stream: IO,
+        name: str,
+        max_lines: int = 200,
+        values: Optional[Dict[str, Pattern]] = None,
+        counters: Optional[Dict[str, Pattern]] = None,
+        ready: Sequence[str] = (),
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """
+        Args:
+            stream: stderr pipe of the child (text or binary)
+            name: Process name used in log messages
+            max_lines: Number of recent lines kept
+            values: Telemetry patterns; the first group is stored as the latest value
+            counters: Patterns counted per match (or summed, if they capture a number)
+            ready: Telemetry keys that must all have been seen for wait_ready()
+            logger: Optional logger instance
+        """
+        self.stream = stream
+        self.name = name
+        self.values = values or {}
+        self.counters = counters or {}
+        self.ready = tuple(ready)
+        self.logger = logger
+
+        self._lines: Deque[str] = deque(maxlen=max(1, max_lines))
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._ready = False
+        self._eof = False
+        self._telemetry: Dict[str, Any] = {}
+        self._counts: Dict[str, int] = {key: 0 for key in self.counters}
+        self._warned_at: Dict[str, float] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "StderrDrain":
+        self._thread = threading.Thread(
+            target=self._run, name=f"{self.name}-stderr", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        try:
+            for raw in self.stream:
+                if isinstance(raw, bytes):
+                    raw = raw.decode("utf-8", errors="replace")
+                line = raw.rstrip()
+                if line:
+                    self._handle(line)
+        except (ValueError, OSError):
+            # Pipe closed while reading
+            pass
+        finally:
+            with self._changed:
+                self._eof = True
+                self._changed.notify_all()
+
+    def _handle(self, line: str) -> None:
+        warn = False
+        now = time.monotonic()
+        with self._lock:
+            self._lines.append(line)
+
+            for key, pattern in self.values.items():
+                match = pattern.search(line)
+                if match:
+                    self._telemetry[key] = self._convert(match.group(1))
+
+            if self.ready and not self._ready:
+                if all(key in self._telemetry for key in self.ready):
+                    self._ready = True
+                    self._changed.notify_all()
+
+            for key, pattern in self.counters.items():
+                match = pattern.search(line)
+                if match:
+                    self._counts[key] += int(match.group(1)) if match.groups() else 1
+                    if (
+                        now - self._warned_at.get(key, -WARNING_INTERVAL)
+                        >= WARNING_INTERVAL
+                    ):
+                        self._warned_at[key] = now
+                        warn = True
+
+        if self.logger:
+            if warn:
+                self.logger.warning("%s: %s", self.name, line)
+            else:
+                self.logger.debug("%s: %s", self.name, line)
+
+    @staticmethod
+    def _convert(value: str) -> Any:
+        for cast in (int, float):
+            try:
+                return cast(value)
+            except ValueError:
+                pass
+        return value.strip()
+
+    def join(self, timeout: float = 1.0) -> None:
+        """Wait for the drain to reach EOF (e.g. after the child exited)."""
+        if self._thread:
+            self._thread.join(timeout)
+
+    def wait_ready(self, timeout: float) -> bool:
+        """
+        Wait until all ``ready`` keys were seen.
+
+        Returns:
+            True when ready; False on timeout or when stderr ended first
+            (the child exited)
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: self._ready or self._eof, timeout)
+            return self._ready
+
+    def lines(self) -> List[str]:
+        with self._lock:
+            return list(self._lines)
+
+    def tail(self, count: int = 20) -> str:
+        """Last ``count`` stderr lines as one string, for failure reports."""
+        return "\n".join(self.lines()[-count:])
+
+    def telemetry(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._telemetry, **self._counts}
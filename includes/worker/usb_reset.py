@@ -0,0 +1,128 @@
+import fcntl
+import os
+from typing import Any, List, Optional, Tuple
+
+# linux/usbdevice_fs.h: _IO('U', 20)
+USBDEVFS_RESET = 0x5514
+
+SYSFS_USB = "/sys/bus/usb/devices"
+
+# RTL2832U based receivers known to librtlsdr (vendor, product)
+RTLSDR_IDS = {
+    ("0bda", "2832"),  # Generic RTL2832U
+    ("0bda", "2838"),  # Generic RTL2832U OEM (RTL-SDR Blog, NooElec, ...)
+    ("0413", "6680"),
+    ("0413", "6f0f"),
+    ("0458", "707f"),
+    ("0ccd", "00a9"),
+    ("0ccd", "00b3"),
+    ("0ccd", "00b4"),
+    ("0ccd", "00b5"),
+    ("0ccd", "00b7"),
+    ("0ccd", "00b8"),
+    ("0ccd", "00b9"),
+    ("0ccd", "00c0"),
+    ("0ccd", "00c6"),
+    ("0ccd", "00d3"),
+    ("0ccd", "00d7"),
+    ("0ccd", "00e0"),
+    ("1554", "5020"),
+    ("15f4", "0131"),
+    ("15f4", "0133"),
+    ("185b", "0620"),
+    ("185b", "0650"),
+    ("185b", "0680"),
+    ("1b80", "d393"),
+    ("1b80", "d394"),
+    ("1b80", "d395"),
+    ("1b80", "d397"),
+    ("1b80", "d398"),
+    ("1b80", "d39d"),
+    ("1b80", "d3a4"),
+    ("1b80", "d3a8"),
+    ("1b80", "d3af"),
+    ("1b80", "d3b0"),
+    ("1d19", "1101"),
+    ("1d19", "1102"),
+    ("1d19", "1103"),
+    ("1d19", "1104"),
+    ("1f4d", "a803"),
+    ("1f4d", "b803"),
+    ("1f4d", "c803"),
+    ("1f4d", "d286"),
+    ("1f4d", "d803"),
+}
+
+
+def _read(path: str) -> str:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+
+def rtlsdr_devices() -> List[Tuple[str, str]]:
+    """
+    RTL-SDR dongles on the USB bus as (device node, serial), in bus order.
+
+    The order follows bus and device number, which matches the ``-d``
+    index of rtl_fm/rtl_sdr on typical setups. With several dongles, a
+    serial number (set with ``rtl_eeprom -s``) is the reliable choice.
+    """
+    devices = []
+    try:
+        entries = os.listdir(SYSFS_USB)
+    except OSError:
+        return []
+
+    for entry in entries:
+        base = os.path.join(SYSFS_USB, entry)
+        ids = (_read(f"{base}/idVendor").lower(), _read(f"{base}/idProduct").lower())
+        if ids not in RTLSDR_IDS:
+            continue
+        bus, device = _read(f"{base}/busnum"), _read(f"{base}/devnum")
+        if not (bus.isdigit() and device.isdigit()):
+            continue
+        devices.append((int(bus), int(device), _read(f"{base}/serial")))
+
+    return [
+        (f"/dev/bus/usb/{bus:03d}/{device:03d}", serial)
+        for bus, device, serial in sorted(devices)
+    ]
+
+
+def find_rtlsdr(device: Any = 0) -> Optional[str]:
+    """
+    Device node of the dongle rtl_fm/rtl_sdr would open with ``-d device``.
+
+    Args:
+        device: Device index or serial number (like ``-d``)
+
+    Returns:
+        e.g. "/dev/bus/usb/001/004", or None if no such dongle is present
+    """
+    devices = rtlsdr_devices()
+    text = str(device)
+
+    # rtl_fm tries the serial first, then the index
+    for node, serial in devices:
+        if serial and serial == text:
+            return node
+    if text.isdigit() and int(text) < len(devices):
+        return devices[int(text)][0]
+    return None
+
+
+def reset_usb_device(node: str) -> None:
+    """
+    Reset a USB device (USBDEVFS_RESET), like unplugging and replugging it.
+
+    Raises:
+        OSError: Device node missing, no permission or the reset failed
+    """
+    fd = os.open(node, os.O_WRONLY)
+    try:
+        fcntl.ioctl(fd, USBDEVFS_RESET, 0)
+    finally:
+        os.close(fd)
@@ -0,0 +1,72 @@
+from typing import Any, Dict, Optional, Sequence
+import logging
+
+from includes.decoder import Channelizer, WidebandDecoder
+from .native_decoder_worker import NativeDecoderWorker
+
+
+class WidebandDecoderWorker(NativeDecoderWorker):
+    """
+    Decoder stage for a wideband rtl_sdr pipeline.
+
+    Like NativeDecoderWorker, but the audio sink takes rtl_sdr u8 I/Q and
+    a WidebandDecoder splits it into several channels. Runs inside a
+    PipelineSupervisor (rtl_sdr restarts, readiness, backoff); the yielded
+    messages carry their channel name as ``source``.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        center_frequency: float,
+        channels: Dict[str, float],
+        channel_rate: int = 24000,
+        baud_rates: Sequence[int] = (512, 1200, 2400),
+        charset: str = "auto",
+        block_size: int = 8192,
+        name: str = "wideband",
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """
+        Args:
+            sample_rate: rtl_sdr sample rate (-s), a multiple of ``channel_rate``
+            center_frequency: rtl_sdr tuning frequency (-f) in Hz
+            channels: Channel name -> frequency in Hz
+            channel_rate: Audio sample rate of every channel
+            baud_rates: POCSAG baud rates to decode
+            charset: 'alpha', 'numeric' or 'auto'
+            block_size: Audio samples buffered per channel before decoding
+            name: Shown in log messages
+            logger: Optional logger instance
+
+        Raises:
+            RuntimeError: NumPy is not installed
+            ValueError: Invalid rates or a channel outside the captured band
+                (checked here, before rtl_sdr is started)
+        """
+        super().__init__(
+            sample_rate=sample_rate,
+            baud_rates=baud_rates,
+            charset=charset,
+            block_size=block_size,
+            name=name,
+            logger=logger,
+        )
+        self.center_frequency = center_frequency
+        self.channels = dict(channels)
+        self.channel_rate = channel_rate
+
+        # Fail early on a bad channel plan; start() builds the actual decoder
+        Channelizer(sample_rate, center_frequency, self.channels, channel_rate)
+
+    def _create_decoder(self) -> Any:
+        return WidebandDecoder(
+            self.sample_rate,
+            self.center_frequency,
+            self.channels,
+            channel_rate=self.channel_rate,
+            baud_rates=self.baud_rates,
+            charset=self.charset,
+            block_size=self.block_size,
+            logger=self.logger,
+        )
@@ -1,8 +1,13 @@
 #!/usr/bin/env python3
+import glob
+import os
+import signal
 import sys
 import time
 import argparse
+from datetime import datetime
 import setproctitle
+from includes.api.async_api_client import AsyncLaravelAPIClient, SyncAPIFacade
 from includes.api.laravel_api_client import LaravelAPIClient
 from includes.config import Config
 from includes.logger import (
@@ -12,8 +17,28 @@ from includes.logger import (
     file_logger,
 )
 from includes.realtime import LaravelWebSocketListener
-from includes.worker import RtlFmWorker, MultimonWorker
-from includes.handlers import MessageHandler, CommandHandler
+from includes.service import SystemdNotifier
+from includes.worker import (
+    RtlFmWorker,
+    MultimonWorker,
+    NativeDecoderWorker,
+    WidebandDecoderWorker,
+    RtlSdrWorker,
+    ReplayWorker,
+    PipelineSupervisor,
+    PipelineGroup,
+    StallWatchdog,
+    FrequencyScanner,
+    RfAutoTuner,
+)
+from includes.handlers import (
+    MessageHandler,
+    CommandHandler,
+    DuplicateFilter,
+    PocsagMessage,
+)
+from includes.storage import MessageStore, StorageWriter, AudioRing
+from includes.delivery import SendQueue, Outbox
 
 
 # Main program
@@ -29,8 +54,51 @@ if __name__ == "__main__":
             default=["file", "api"],
             help="Logging targets (default: file api)",
         )
+        parser.add_argument(
+            "--replay",
+            metavar="FILE",
+            help="Replay a recorded multimon-ng output or raw rtl_fm audio file "
+            "instead of using the RTL-SDR",
+        )
+        parser.add_argument(
+            "--replay-mode",
+            choices=["auto", "text", "audio"],
+            default="auto",
+            help="Type of the replay file (default: auto)",
+        )
+        parser.add_argument(
+            "--replay-speed",
+            type=float,
+            default=0.0,
+            help="Replay speed: 0 = as fast as possible, 1 = real time (default: 0)",
+        )
+        parser.add_argument(
+            "--snapshot",
+            metavar="TIMESTAMP",
+            help="Save the recorded audio around TIMESTAMP (ISO 8601) as WAV "
+            "files and exit (requires audio_tee)",
+        )
+        parser.add_argument(
+            "--snapshot-before",
+            type=float,
+            metavar="SECONDS",
+            help="Seconds before TIMESTAMP (default: audio_tee.before)",
+        )
+        parser.add_argument(
+            "--snapshot-after",
+            type=float,
+            metavar="SECONDS",
+            help="Seconds after TIMESTAMP (default: audio_tee.after)",
+        )
         args = parser.parse_args()
 
+        # systemd stops the service with SIGTERM: shut down like on Ctrl+C so
+        # queued messages are still written and delivered
+        def handle_sigterm(signum, frame):
+            raise KeyboardInterrupt
+
+        signal.signal(signal.SIGTERM, handle_sigterm)
+
         # Load configuration
         config = Config()
 
@@ -44,20 +112,97 @@ if __name__ == "__main__":
             targets=args.log,
         )
 
+        # Rolling audio recording: rtl_fm audio is teed into one ring file per
+        # pipeline, WAV snapshots around a message are cut on demand
+        audio_tee_enabled = config.get("audio_tee.enabled", False)
+        audio_tee_dir = config.get("audio_tee.dir", "messages/audio")
+        audio_rings = {}
+        stall_watchdog = None
+        # Scanning pipelines, keyed like the message source (None = single pipeline)
+        scanners = {}
+        # Gain/squelch auto-tuners, keyed like the message source
+        auto_tuners = {}
+
+        def snapshot_audio(
+            when,
+            before=config.get("audio_tee.before", 20),
+            after=config.get("audio_tee.after", 10),
+        ):
+            paths = []
+            for ring in audio_rings.values():
+                path = ring.snapshot(when, before, after)
+                if path:
+                    paths.append(path)
+            return paths
+
+        if args.snapshot:
+            # Offline: read the rings of a running (or stopped) instance
+            for path in sorted(glob.glob(os.path.join(audio_tee_dir, "*.ring"))):
+                name = os.path.splitext(os.path.basename(path))[0]
+                audio_rings[name] = AudioRing(path, create=False, logger=api_logger)
+            if not audio_rings:
+                console_logger.error("No audio recordings found in %s", audio_tee_dir)
+                sys.exit(1)
+
+            window = {}
+            if args.snapshot_before is not None:
+                window["before"] = args.snapshot_before
+            if args.snapshot_after is not None:
+                window["after"] = args.snapshot_after
+            paths = snapshot_audio(datetime.fromisoformat(args.snapshot), **window)
+            for path in paths:
+                print(path)
+            if not paths:
+                console_logger.error("No audio recorded around %s", args.snapshot)
+            sys.exit(0 if paths else 1)
+
         api_logger.info("NoxFeed starting...")
 
+        # Type=notify: READY=1 once the pipelines run, WATCHDOG=1 while they stay alive
+        notifier = SystemdNotifier(logger=api_logger)
+        notifier.status("Starting")
+
         # API client
         api_user = config.get("api.user")
         api_password = config.get("api.password")
         api_token = config.get("api.token")
 
-        api_client = LaravelAPIClient(
+        api_options = dict(
             base_url=config.api_base_url,
             api_token=api_token if api_token else None,
+            token_expires_at=config.get("api.token_expires_at") or None,
             user=api_user if api_user else None,
             password=api_password if api_password else None,
+            timeout=config.api_timeout,
+            connect_timeout=config.api_connect_timeout,
+            max_retries=config.api_max_retries,
+            retry_delay=config.api_retry_delay,
+            max_retry_delay=config.api_max_retry_delay,
+            circuit_failures=config.api_circuit_failures,
+            circuit_reset=config.api_circuit_reset,
+            refresh_before=config.api_token_refresh_before,
+            compression=config.api_compression,
+            compression_min_bytes=config.api_compression_min_bytes,
             logger=api_logger,
         )
+        api_client = None
+        if config.api_async:
+            # One event loop carries the requests of all threads; the
+            # facade keeps the blocking interface for existing callers
+            try:
+                api_client = SyncAPIFacade(
+                    AsyncLaravelAPIClient(
+                        concurrency=config.api_concurrency, **api_options
+                    )
+                )
+                api_logger.info(
+                    "Using asyncio API client (concurrency %d)",
+                    config.api_concurrency,
+                )
+            except RuntimeError as e:
+                api_logger.warning("%s, using the threaded API client", e)
+        if api_client is None:
+            api_client = LaravelAPIClient(pool_size=config.api_pool_size, **api_options)
 
         # Setup callback to persist token on updates (login/renewal)
         def persist_token(token, expires_at):
@@ -72,6 +217,11 @@ if __name__ == "__main__":
         # Assign callback to API client
         api_client.on_token_updated = persist_token
 
+        # Open the API connection (DNS, TCP, TLS) in the background while the
+        # rest starts up (storage, WebSocket, rtl_fm); a login opens it anyway
+        if api_token or not (api_user and api_password):
+            api_client.warm_up(wait=False)
+
         # Authenticate if user/password configured
         if api_user and api_password:
             # Check if we have a valid token already
@@ -92,25 +242,132 @@ if __name__ == "__main__":
                     )
                     sys.exit(1)
 
+        # Renew ahead of expiry in the background instead of on a request path
+        if api_client.token or (api_user and api_password):
+            api_client.start_token_refresh()
+
         # Use API token for WebSocket authentication if available
         # This allows private channels to work with the same authentication
         websocket_auth_token = (
             api_client.token if api_client.token else config.get("websocket.token", "")
         )
 
+        # Local message storage (append-only JSONL segments)
+        storage_dir = config.get("messages.storage_dir", "messages")
+        message_store = MessageStore(
+            storage_dir=storage_dir,
+            max_segment_bytes=config.get(
+                "messages.segment_max_bytes", 16 * 1024 * 1024
+            ),
+            max_segment_age=config.get("messages.segment_max_age", 0),
+            logger=file_logger,
+        )
+
+        # Convert old YYYYMMDD.json day files once so history stays readable
+        if config.get("messages.migrate_legacy", True):
+            try:
+                migrated = message_store.migrate_legacy()
+                if migrated:
+                    api_logger.info("Migrated %d legacy message files", migrated)
+            except Exception as e:
+                api_logger.error("Failed to migrate legacy message files: %s", e)
+
+        # Write-behind storage thread (group commit, configurable fsync)
+        storage_writer = None
+        if config.get("messages.storage_writer.enabled", True):
+            storage_writer = StorageWriter(
+                message_store,
+                batch_size=config.get("messages.storage_writer.batch_size", 256),
+                flush_interval=config.get(
+                    "messages.storage_writer.flush_interval_ms", 200
+                )
+                / 1000.0,
+                fsync=config.get("messages.storage_writer.fsync", "interval"),
+                fsync_interval=config.get(
+                    "messages.storage_writer.fsync_interval_ms", 1000
+                )
+                / 1000.0,
+                max_queue=config.get("messages.storage_writer.max_queue", 10000),
+                logger=file_logger,
+            )
+            storage_writer.start()
+
         # Message handler
+        messages_endpoint = config.get("api.messages_endpoint", "/messages")
+        batch_enabled = config.get("messages.batch.enabled", False)
         message_handler = MessageHandler(
-            storage_dir=config.get("messages.storage_dir", "messages"),
+            storage_dir=storage_dir,
             api_client=api_client if config.get("messages.send_to_api", True) else None,
-            api_endpoint=config.get("api.messages_endpoint", "/messages"),
+            api_endpoint=messages_endpoint,
+            bulk_endpoint=(
+                config.get("api.messages_bulk_endpoint", f"{messages_endpoint}/bulk")
+                if batch_enabled
+                else None
+            ),
+            compact_batches=config.get("messages.batch.compact", False),
+            store=message_store,
+            keep_raw=config.get("messages.keep_raw", True),
+            storage_writer=storage_writer,
+            duplicate_filter=(
+                DuplicateFilter(
+                    window=config.get("messages.dedup.window", 30),
+                    max_entries=config.get("messages.dedup.max_entries", 4096),
+                )
+                if config.get("messages.dedup.enabled", True)
+                else None
+            ),
             logger=file_logger,
         )
 
+        # Durable outbox: payloads are persisted before delivery and replayed
+        if message_handler.api_client and config.get("messages.outbox.enabled", True):
+            outbox = Outbox(
+                path=os.path.join(storage_dir, "outbox.sqlite3"),
+                sender=message_handler.post_payload,
+                batch_sender=message_handler.post_batch if batch_enabled else None,
+                batch_size=config.get("messages.batch.max_messages", 50),
+                replay_rate=config.get("messages.outbox.replay_rate", 5),
+                retry_delay=config.get("messages.outbox.retry_delay", 5),
+                max_retry_delay=config.get("messages.outbox.max_retry_delay", 300),
+                claim_timeout=config.get("messages.outbox.claim_timeout", 60),
+                retention=config.get("messages.outbox.retention", 86400),
+                synchronous=config.get("messages.outbox.synchronous", "NORMAL"),
+                logger=file_logger,
+            )
+            outbox.start()
+            message_handler.outbox = outbox
+
+        # Outbound send queue: API delivery runs on worker threads
+        if message_handler.api_client and config.get(
+            "messages.send_queue.enabled", True
+        ):
+            send_queue = SendQueue(
+                sender=message_handler.deliver,
+                max_size=config.get("messages.send_queue.max_size", 1000),
+                workers=config.get("messages.send_queue.workers", 2),
+                policy=config.get("messages.send_queue.policy", "block"),
+                block_timeout=config.get("messages.send_queue.block_timeout", 5),
+                spill_dir=storage_dir,
+                stats_interval=config.get("messages.send_queue.stats_interval", 60),
+                batch_sender=message_handler.deliver_many if batch_enabled else None,
+                batch_size=config.get("messages.batch.max_messages", 50),
+                batch_max_bytes=config.get("messages.batch.max_bytes", 65536),
+                batch_linger=config.get("messages.batch.linger_ms", 100) / 1000.0,
+                sizer=message_handler.estimate_size,
+                encoder=message_handler.encode_item,
+                decoder=message_handler.decode_item,
+                logger=file_logger,
+            )
+            send_queue.start()
+            message_handler.send_queue = send_queue
+
         # Command handler
         command_handler = CommandHandler(
             install_dir="/home/nox/noxfeed",
             logger=api_logger,
         )
+        if audio_tee_enabled:
+            command_handler.on_audio_snapshot = snapshot_audio
 
         # Config update handler
         config_endpoint = config.get("api.config_endpoint", "/config")
@@ -153,7 +410,8 @@ if __name__ == "__main__":
         # WebSocket listeners
         ws_listeners = []
 
-        if ws_host and ws_app_key:
+        # No remote commands or config reloads while replaying a recording
+        if ws_host and ws_app_key and not args.replay:
             # Log WebSocket authentication status
             if websocket_auth_token:
                 api_logger.info("WebSocket will use API authentication token")
@@ -211,72 +469,435 @@ if __name__ == "__main__":
             api_logger.info("WebSocket commands listener started")
 
         # RTL-FM and Multimon-NG workers
-        rtl_command = config.get("rtl_fm.command", "rtl_fm")
-        rtl_args = config.get("rtl_fm.args", [])
-
         multimon_command = config.get("multimon.command", "multimon-ng")
         multimon_args = config.get("multimon.args", [])
 
-        api_logger.info("Starting RTL-FM worker...")
-        console_logger.info("Checking for RTL-SDR device...")
+        # Decoder stage: "multimon" (multimon-ng subprocess) or "native"
+        # (in-process NumPy decoder, emits PocsagMessage records directly)
+        decoder_type = config.get("decoder.type", "multimon")
+        decoder_block_size = config.get("decoder.block_size", 8192)
 
-        rtl_worker = RtlFmWorker(rtl_command, rtl_args, logger=api_logger)
-        rtl_process = rtl_worker.start()
+        def sample_rate_of(rtl_args):
+            return (
+                int(rtl_args[rtl_args.index("-s") + 1]) if "-s" in rtl_args else 22050
+            )
 
-        # Check if rtl_fm started successfully - wait a bit longer for device detection
-        time.sleep(1.0)  # Give RTL-FM more time to detect device
-        rtl_exit_code = rtl_process.poll()
+        def native_decoder(sample_rate, name="decoder"):
+            return NativeDecoderWorker(
+                sample_rate=sample_rate,
+                baud_rates=config.get("decoder.baud_rates", [512, 1200, 2400]),
+                charset=config.get("decoder.charset", "auto"),
+                block_size=decoder_block_size,
+                name=name,
+                logger=api_logger,
+            )
 
-        if rtl_exit_code is not None:
-            # Process already exited - RTL-SDR error
-            console_logger.error("RTL-FM failed to start!")
-            console_logger.error("Exit code: %d", rtl_exit_code)
-            if rtl_process.stderr:
-                error_output = rtl_process.stderr.read()
-                if isinstance(error_output, bytes):
-                    error_output = error_output.decode("utf-8", errors="replace")
+        def wideband_decoder(pipeline, name):
+            # One rtl_sdr capture, split into channels in-process (native decoder only)
+            channels = {
+                str(channel["name"]): RtlSdrWorker.parse_frequency(channel["frequency"])
+                for channel in pipeline.get("channels", [])
+            }
+            return WidebandDecoderWorker(
+                sample_rate=int(pipeline.get("sample_rate", 2400000)),
+                center_frequency=RtlSdrWorker.parse_frequency(
+                    pipeline["center_frequency"]
+                ),
+                channels=channels,
+                channel_rate=int(pipeline.get("channel_rate", 24000)),
+                baud_rates=config.get("decoder.baud_rates", [512, 1200, 2400]),
+                charset=config.get("decoder.charset", "auto"),
+                block_size=decoder_block_size,
+                name=f"wideband[{name}]",
+                logger=api_logger,
+            )
+
+        def persist_rf_setting(pipeline):
+            # Auto-tune decisions survive restarts: pipeline entries get
+            # gain/squelch keys, a single pipeline updates rtl_fm.args
+            def persist(gain, squelch):
+                if not config.get("config.persist", False):
+                    return
+                if pipeline in (config.get("pipelines", []) or []):
+                    if gain is not None:
+                        pipeline["gain"] = gain
+                    pipeline["squelch"] = squelch
+                else:
+                    updated = config.get("rtl_fm.args", [])
+                    if gain is not None:
+                        updated = RtlFmWorker.set_option(updated, "-g", f"{gain:g}")
+                    config.set(
+                        "rtl_fm.args", RtlFmWorker.set_option(updated, "-l", squelch)
+                    )
+                config.save()
+                api_logger.info("Auto-tune setting saved to config.json")
+
+            return persist
+
+        if args.replay:
+            # Offline replay: no RTL-SDR needed
+            sample_rate = sample_rate_of(config.get("rtl_fm.args", []))
+            line_source = ReplayWorker(
+                args.replay,
+                mode=args.replay_mode,
+                speed=args.replay_speed,
+                sample_rate=sample_rate,
+                multimon_command=multimon_command,
+                multimon_args=multimon_args,
+                decoder=(
+                    native_decoder(sample_rate) if decoder_type == "native" else None
+                ),
+                logger=api_logger,
+            )
+            line_source.start()
+            console_logger.info(
+                "Replaying %s (%s). Processing POCSAG messages...",
+                args.replay,
+                line_source.mode,
+            )
+            lines = ((None, line) for line in line_source.iter_lines())
+        else:
+            rtl_command = config.get("rtl_fm.command", "rtl_fm")
+            rtl_args = config.get("rtl_fm.args", [])
+
+            # Several dongles / frequencies: one pipeline per "pipelines" entry,
+            # all merged into one message stream tagged with the pipeline name
+            pipeline_configs = [
+                pipeline
+                for pipeline in config.get("pipelines", []) or []
+                if pipeline.get("enabled", True)
+            ]
+            multi_pipeline = bool(pipeline_configs)
+            if not multi_pipeline:
+                pipeline_configs = [{"name": "default"}]
+
+            api_logger.info("Starting RTL-FM workers...")
+            console_logger.info("Checking for RTL-SDR device...")
+
+            pipelines = {}
+            wideband_decoders = {}
+            sources = set()
+            for index, pipeline in enumerate(pipeline_configs, start=1):
+                name = str(pipeline.get("name") or f"pipeline{index}")
+                if name in pipelines:
+                    raise ValueError(f"Duplicate pipeline name: {name}")
+
+                scan = pipeline.get(
+                    "scan", None if multi_pipeline else config.get("rtl_fm.scan")
+                )
+                if pipeline.get("type") == "wideband":
+                    if scan and scan.get("frequencies"):
+                        raise ValueError(
+                            f"Pipeline {name}: wideband pipelines cannot scan"
+                        )
+                    # Messages are tagged with the channel names instead
+                    decoder_worker = wideband_decoder(pipeline, name)
+                    for channel in decoder_worker.channels:
+                        if channel in sources:
+                            raise ValueError(f"Duplicate pipeline name: {channel}")
+                        sources.add(channel)
+                    wideband_decoders[name] = decoder_worker
+
+                    rtl_worker = RtlSdrWorker(
+                        config.get("rtl_sdr.command", "rtl_sdr"),
+                        RtlSdrWorker.build_args(
+                            decoder_worker.center_frequency,
+                            decoder_worker.sample_rate,
+                            pipeline.get("device"),
+                            pipeline.get(
+                                "rtl_sdr_args", config.get("rtl_sdr.args", [])
+                            ),
+                        ),
+                        name=f"rtl_sdr[{name}]",
+                        logger=api_logger,
+                    )
+                    rtl_worker.start()
+                    pipelines[name] = (pipeline, rtl_worker)
+                    continue
+
+                if name in sources:
+                    raise ValueError(f"Duplicate pipeline name: {name}")
+                sources.add(name)
+
+                pipeline_rtl_args = pipeline.get("rtl_fm_args", rtl_args)
+                if pipeline.get("device") is not None:
+                    pipeline_rtl_args = RtlFmWorker.set_option(
+                        pipeline_rtl_args, "-d", pipeline["device"]
+                    )
+                if pipeline.get("frequency"):
+                    pipeline_rtl_args = RtlFmWorker.set_option(
+                        pipeline_rtl_args, "-f", pipeline["frequency"]
+                    )
+                # Written by the auto-tuner
+                if pipeline.get("gain") is not None:
+                    pipeline_rtl_args = RtlFmWorker.set_option(
+                        pipeline_rtl_args, "-g", pipeline["gain"]
+                    )
+                if pipeline.get("squelch") is not None:
+                    pipeline_rtl_args = RtlFmWorker.set_option(
+                        pipeline_rtl_args, "-l", pipeline["squelch"]
+                    )
+                if scan and scan.get("frequencies"):
+                    # One frequency at a time, retuned by the scanner
+                    scanner = FrequencyScanner(
+                        scan["frequencies"],
+                        dwell=scan.get("dwell", 10),
+                        hold=scan.get("hold", 3),
+                        max_hold=scan.get("max_hold", 30),
+                        guard=scan.get("guard", 0.3),
+                        stats_interval=scan.get("stats_interval", 600),
+                        name=name,
+                        logger=api_logger,
+                    )
+                    scanners[name if multi_pipeline else None] = scanner
+                    pipeline_rtl_args = scanner.initial_args(pipeline_rtl_args)
+
+                rtl_worker = RtlFmWorker(
+                    rtl_command,
+                    pipeline_rtl_args,
+                    name=f"rtl_fm[{name}]" if multi_pipeline else "rtl_fm",
+                    logger=api_logger,
+                )
+                rtl_worker.start()
+                pipelines[name] = (pipeline, rtl_worker)
+
+            # rtl_fm is ready once it reports "Tuned to" and "Sampling at" on
+            # stderr; the dongles start in parallel, so this waits for the slowest
+            ready_timeout = config.get("rtl_fm.ready_timeout", 10)
+            failed = [
+                name
+                for name, (_, rtl_worker) in pipelines.items()
+                if not rtl_worker.wait_ready(ready_timeout)
+            ]
+            for name in failed:
+                # Exited (RTL-SDR error) or stuck in its startup
+                rtl_worker = pipelines.pop(name)[1]
+                if multi_pipeline:
+                    console_logger.error(
+                        "RTL-FM failed to start for pipeline %s!", name
+                    )
+                else:
+                    console_logger.error("RTL-FM failed to start!")
+                if rtl_worker.process.poll() is None:
+                    console_logger.error(
+                        "No tuning/sample rate reported within %ss", ready_timeout
+                    )
+                    rtl_worker.process.kill()
+                else:
+                    console_logger.error("Exit code: %d", rtl_worker.process.returncode)
+                error_output = rtl_worker.stderr_tail()
                 if error_output.strip():
                     console_logger.error("RTL-FM error: %s", error_output)
-            console_logger.error("")
-            console_logger.error("Common issues:")
-            console_logger.error("  • No RTL-SDR device connected via USB")
-            console_logger.error("  • Device already in use by another process")
-            console_logger.error(
-                "  • Missing permissions (run as root or add user to plugdev group)"
+
+            if not pipelines:
+                console_logger.error("")
+                console_logger.error("Common issues:")
+                console_logger.error("  • No RTL-SDR device connected via USB")
+                console_logger.error("  • Device already in use by another process")
+                console_logger.error(
+                    "  • Missing permissions (run as root or add user to plugdev group)"
+                )
+                console_logger.error("")
+                console_logger.error("Test your RTL-SDR device with: rtl_test")
+                sys.exit(1)
+
+            if failed:
+                api_logger.error(
+                    "Pipelines not started: %s - continuing with %s",
+                    ", ".join(failed),
+                    ", ".join(pipelines),
+                )
+
+            console_logger.info("RTL-FM started successfully")
+
+            api_logger.info("Starting decoder workers...")
+
+            # Each supervisor pumps its rtl_fm audio into its own decoder and
+            # restarts whichever stage dies, without restarting the whole service
+            supervisors = {}
+            for name, (pipeline, rtl_worker) in pipelines.items():
+                suffix = f"[{name}]" if multi_pipeline else ""
+                if name in wideband_decoders:
+                    decoder_worker = wideband_decoders[name]
+                    # rtl_sdr delivers 2 bytes per sample at MS/s rates
+                    chunk_size = 256 * 1024
+                elif pipeline.get("decoder", decoder_type) == "native":
+                    decoder_worker = native_decoder(
+                        sample_rate_of(rtl_worker.args), name=f"decoder{suffix}"
+                    )
+                    # Large reads: the decoder demodulates whole blocks at once
+                    chunk_size = decoder_block_size * 2
+                else:
+                    decoder_worker = MultimonWorker(
+                        multimon_command,
+                        pipeline.get("multimon_args", multimon_args),
+                        name=f"multimon-ng{suffix}",
+                        logger=api_logger,
+                    )
+                    chunk_size = 4096
+                if audio_tee_enabled and name not in wideband_decoders:
+                    audio_rings[name] = AudioRing(
+                        os.path.join(audio_tee_dir, f"{name}.ring"),
+                        sample_rate=sample_rate_of(rtl_worker.args),
+                        seconds=int(config.get("audio_tee.minutes", 10) * 60),
+                        logger=api_logger,
+                    )
+                supervisors[name] = PipelineSupervisor(
+                    rtl_worker,
+                    decoder_worker,
+                    auto_restart=config.get("rtl_fm.auto_restart", True),
+                    initial_delay=config.get("rtl_fm.restart_initial_delay", 0.25),
+                    max_delay=config.get("rtl_fm.restart_delay", 5),
+                    chunk_size=chunk_size,
+                    name=name,
+                    audio_ring=audio_rings.get(name),
+                    ready_timeout=ready_timeout,
+                    logger=api_logger,
+                )
+
+            for scanner in scanners.values():
+                scanner.attach(supervisors[scanner.name])
+
+            line_source = PipelineGroup(supervisors, logger=api_logger)
+            line_source.start()
+            for scanner in scanners.values():
+                scanner.start()
+
+            # Gain/squelch are tried around the current setting by decode
+            # yield; scanning and wideband pipelines are left alone
+            if config.get("autotune.enabled", False):
+                for name, supervisor in supervisors.items():
+                    source = name if multi_pipeline else None
+                    if name in wideband_decoders or source in scanners:
+                        continue
+                    tuner = RfAutoTuner(
+                        supervisor,
+                        interval=config.get("autotune.interval", 21600),
+                        start_delay=config.get("autotune.start_delay", 600),
+                        trial_seconds=config.get("autotune.trial_seconds", 300),
+                        settle=config.get("autotune.settle", 5),
+                        gain_steps=config.get("autotune.gain_steps", 1),
+                        squelch_step=config.get("autotune.squelch_step", 5),
+                        min_improvement=config.get("autotune.min_improvement", 0.15),
+                        min_decodes=config.get("autotune.min_decodes", 10),
+                        confidence=config.get("autotune.confidence", 0.99),
+                        max_restarts_per_hour=config.get(
+                            "autotune.max_restarts_per_hour", 12
+                        ),
+                        logger=api_logger,
+                    )
+                    tuner.on_decision = persist_rf_setting(pipelines[name][0])
+                    auto_tuners[source] = tuner
+                    tuner.start()
+
+            # A dongle can hang with rtl_fm still running: watch the audio and
+            # decoder rates and escalate (warning, restart, USB reset)
+            if config.get("watchdog.enabled", True):
+                stall_watchdog = StallWatchdog(
+                    supervisors,
+                    min_bytes_per_second=config.get(
+                        "watchdog.min_bytes_per_second", 1000
+                    ),
+                    min_lines_per_second=config.get("watchdog.min_lines_per_second", 0),
+                    window=config.get("watchdog.window", 30),
+                    lines_window=config.get("watchdog.lines_window", 900),
+                    interval=config.get("watchdog.interval", 5),
+                    restart_after=config.get("watchdog.restart_after", 60),
+                    usb_reset=config.get("watchdog.usb_reset", True),
+                    stable_after=config.get("watchdog.stable_after", 600),
+                    stats_interval=config.get("watchdog.stats_interval", 300),
+                    logger=api_logger,
+                )
+                stall_watchdog.start()
+            lines = (
+                (name if multi_pipeline else None, line)
+                for name, line in line_source.iter_lines()
             )
-            console_logger.error("")
-            console_logger.error("Test your RTL-SDR device with: rtl_test")
-            sys.exit(1)
 
-        console_logger.info("RTL-FM started successfully")
+            console_logger.info("Workers started. Listening for POCSAG messages...")
 
-        api_logger.info("Starting Multimon-NG worker...")
-        multimon_worker = MultimonWorker(
-            multimon_command,
-            multimon_args,
-            input_stream=rtl_process.stdout,
-            logger=api_logger,
-        )
-        multimon_process = multimon_worker.start()
+            notifier.ready(f"Listening on {len(supervisors)} pipeline(s)")
+            # A main loop blocked longer than the watchdog timeout counts as hung
+            notifier.start_watchdog(
+                lambda: line_source.healthy(notifier.watchdog_timeout)
+            )
 
-        # Don't close rtl_process.stdout - multimon-ng needs it!
-        # The pipe will be closed automatically when processes terminate
+        if args.replay:
+            notifier.ready(f"Replaying {args.replay}")
+            notifier.start_watchdog(lambda: True)
 
-        console_logger.info("Workers started. Listening for POCSAG messages...")
+        loop_started = time.monotonic()
+        messages_processed = 0
 
         # Process multimon-ng output
-        for line in multimon_worker.iter_lines():
+        for source, line in lines:
+            # Scanning pipelines: the frequency the line was received on
+            scanner = scanners.get(source)
+            auto_tuner = auto_tuners.get(source)
+            frequency = scanner.frequency_at() if scanner else None
+
+            # Wideband channels tag their messages themselves
+            if isinstance(line, PocsagMessage) and line.source:
+                source = line.source
+
             # Log raw output if console logging is enabled
             if "console" in args.log:
-                print(line)
+                print(f"[{source}] {line}" if source else line)
 
-            # Process POCSAG messages
-            message_data = message_handler.process_line(line)
+            # Process POCSAG messages (the native decoder yields them ready-made)
+            if isinstance(line, PocsagMessage):
+                message_data = message_handler.process_message(line, source, frequency)
+            else:
+                message_data = message_handler.process_line(line, source, frequency)
+            if message_data:
+                messages_processed += 1
+                if scanner:
+                    scanner.record(frequency)
+                if auto_tuner:
+                    auto_tuner.record()
 
             # You can add additional processing here if needed
             # For example, filtering, alerting, etc.
 
-        multimon_process.wait()
+        if args.replay:
+            line_source.wait()
+            elapsed = time.monotonic() - loop_started
+            console_logger.info(
+                "Replay finished: %d lines, %d messages in %.2fs (%.0f lines/s)",
+                line_source.lines_read,
+                messages_processed,
+                elapsed,
+                line_source.lines_read / elapsed if elapsed > 0 else 0.0,
+            )
+        else:
+            notifier.stopping()
+            if stall_watchdog:
+                stall_watchdog.stop()
+            for scanner in scanners.values():
+                scanner.stop()
+            for auto_tuner in auto_tuners.values():
+                auto_tuner.stop()
+            line_source.stop()
+            api_logger.info("Pipeline stats: %s", line_source.stats())
+            if stall_watchdog:
+                api_logger.info("Stall watchdog: %s", stall_watchdog.stats())
+            for scanner in scanners.values():
+                api_logger.info("Scanner %s: %s", scanner.name, scanner.stats())
+            for auto_tuner in auto_tuners.values():
+                api_logger.info(
+                    "Auto-tune %s: %s", auto_tuner.supervisor.name, auto_tuner.stats()
+                )
+        notifier.stop()
+        for ring in audio_rings.values():
+            ring.close()
+        if message_handler.send_queue:
+            message_handler.send_queue.stop()
+        if message_handler.outbox:
+            message_handler.outbox.stop()
+        message_handler.close()
+        api_logger.info("Message delivery: %s", message_handler.stats())
+        api_logger.info("API client: %s", api_client.stats())
+        api_client.close()
 
     except FileNotFoundError as e:
         console_logger.error("Error: %s", e)
@@ -285,10 +906,42 @@ if __name__ == "__main__":
         console_logger.info("Stopped by user")
 
         # Cleanup
+        if "notifier" in locals():
+            notifier.stopping()
+            notifier.stop()
+
+        if "stall_watchdog" in locals() and stall_watchdog:
+            stall_watchdog.stop()
+
+        if "scanners" in locals():
+            for scanner in scanners.values():
+                scanner.stop()
+
+        if "auto_tuners" in locals():
+            for auto_tuner in auto_tuners.values():
+                auto_tuner.stop()
+
+        if "line_source" in locals():
+            line_source.stop()
+
+        if "audio_rings" in locals():
+            for ring in audio_rings.values():
+                ring.close()
+
         if "ws_listeners" in locals():
             for listener in ws_listeners:
                 listener.stop()
 
+        if "message_handler" in locals():
+            if message_handler.send_queue:
+                message_handler.send_queue.stop()
+            if message_handler.outbox:
+                message_handler.outbox.stop()
+            message_handler.close()
+
+        if "api_client" in locals():
+            api_client.close()
+
         sys.exit(0)
     except Exception as e:
         console_logger.error("Error: %s", e, exc_info=True)
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The tests import the application packages and the benchmark signal
+# generators (benchmarks/pocsag_synth.py) from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,134 @@
+import random
+
+import numpy as np
+import pytest
+
+from benchmarks.pocsag_synth import modulate, transmission_bits
+from includes.decoder import PocsagDecoder
+from includes.decoder.bch import IDLE_CODEWORD, SYNC_CODEWORD, correct, encode
+
+PAGES = [
+    (1234567, 3, "alpha", "Einsatz B2 Brandmeldeanlage"),
+    (8, 0, "numeric", "0123-456 789"),
+    (2097151, 1, "tone", ""),
+]
+
+
+def decode(pcm, chunk=4096, **kwargs):
+    decoder = PocsagDecoder(**kwargs)
+    messages = []
+    for offset in range(0, len(pcm), chunk):
+        messages.extend(decoder.feed(pcm[offset : offset + chunk]))
+    messages.extend(decoder.flush())
+    return [
+        (m.protocol, int(m.address), int(m.function), m.type, m.message)
+        for m in messages
+    ]
+
+
+def expected(baud, pages=PAGES):
+    return [
+        (f"POCSAG{baud}", address, function, message_type, text)
+        for address, function, message_type, text in pages
+    ]
+
+
+@pytest.mark.parametrize("baud", [512, 1200, 2400])
+def test_decodes_each_baud_rate(baud):
+    pcm = modulate(transmission_bits(PAGES), baud)
+    assert decode(pcm) == expected(baud)
+
+
+@pytest.mark.parametrize("baud", [512, 1200, 2400])
+def test_only_matching_baud_rate_reports(baud):
+    pcm = modulate(transmission_bits(PAGES), baud)
+    decoded = decode(pcm, baud_rates=(512, 1200, 2400))
+    assert {protocol for protocol, *_ in decoded} == {f"POCSAG{baud}"}
+
+
+@pytest.mark.parametrize("bit_errors", [1, 2])
+def test_corrects_bit_errors_on_air(bit_errors):
+    pcm = modulate(transmission_bits(PAGES, bit_errors=bit_errors), 1200)
+    assert decode(pcm) == expected(1200)
+
+
+def test_inverted_and_offset_audio():
+    pcm = modulate(transmission_bits(PAGES), 1200, invert=True, dc_offset=0.3)
+    assert decode(pcm) == expected(1200)
+
+
+@pytest.mark.parametrize("chunk", [1, 3, 333, 4097, 65537])
+def test_feed_chunk_boundaries(chunk):
+    pcm = modulate(transmission_bits(PAGES), 2400)
+    assert decode(pcm, chunk=chunk) == expected(2400)
+
+
+def test_feed_random_chunks():
+    pcm = modulate(transmission_bits(PAGES), 512)
+    rng = random.Random(7)
+    decoder = PocsagDecoder()
+    messages = []
+    offset = 0
+    while offset < len(pcm):
+        size = rng.randrange(1, 20000)
+        messages.extend(decoder.feed(pcm[offset : offset + size]))
+        offset += size
+    messages.extend(decoder.flush())
+    assert [(int(m.address), m.message) for m in messages] == [
+        (address, text) for address, _, _, text in PAGES
+    ]
+
+
+def test_charset_forced():
+    pages = [(4711, 0, "numeric", "112")]
+    pcm = modulate(transmission_bits(pages), 1200)
+    assert decode(pcm, charset="numeric") == expected(1200, pages)
+
+
+def test_unsupported_arguments():
+    with pytest.raises(ValueError):
+        PocsagDecoder(charset="latin1")
+    with pytest.raises(ValueError):
+        PocsagDecoder(sample_rate=8000, baud_rates=(2400,))
+
+
+def _flip(codeword, bits):
+    for bit in bits:
+        codeword ^= 1 << bit
+    return codeword
+
+
+def test_bch_valid_codewords():
+    words = np.array([SYNC_CODEWORD, IDLE_CODEWORD, encode(0x12345)], dtype=np.uint32)
+    fixed, errors = correct(words)
+    assert list(fixed) == list(words)
+    assert list(errors) == [0, 0, 0]
+
+
+@pytest.mark.parametrize("count", [1, 2])
+def test_bch_corrects_every_error_position(count):
+    rng = random.Random(count)
+    word = encode(0x1ABCDE)
+    received = [_flip(word, rng.sample(range(32), count)) for _ in range(200)]
+    received += [_flip(word, [bit]) for bit in range(32)]
+    fixed, errors = correct(np.array(received, dtype=np.uint32))
+    assert (fixed == word).all()
+    assert (errors >= 1).all() and (errors <= count).all()
+
+
+def test_bch_rejects_uncorrectable_codewords():
+    rng = random.Random(3)
+    word = encode(0x0F0F0)
+    received = np.array(
+        [_flip(word, rng.sample(range(32), 3)) for _ in range(200)], dtype=np.uint32
+    )
+    fixed, errors = correct(received)
+    # Three errors never come back as the sent codeword with a valid count
+    assert not ((fixed == word) & (errors >= 0)).any()
+    assert (errors == -1).any()
+
+
+def test_uncorrectable_transmission_is_not_reported():
+    for seed in range(3):
+        pcm = modulate(transmission_bits(PAGES, bit_errors=3, seed=seed), 1200)
+        assert decode(pcm) == []
@@ -0,0 +1,134 @@
+import time
+from types import SimpleNamespace
+
+from includes.worker import RfAutoTuner
+from includes.worker.rf_auto_tuner import R820T_GAINS
+
+
+class FakeSupervisor:
+    """What RfAutoTuner uses of a PipelineSupervisor (without telemetry)."""
+
+    def __init__(self, args):
+        self.name = "test"
+        self.rtl_worker = SimpleNamespace(args=list(args))
+        self.multimon_worker = SimpleNamespace(telemetry=dict)
+        self.restarts = []
+
+    def restart_stage(self, stage, reason, immediate=False):
+        self.restarts.append((stage, immediate))
+
+    def gain(self):
+        args = self.rtl_worker.args
+        return float(args[args.index("-g") + 1]) if "-g" in args else None
+
+
+def make_tuner(args, **options):
+    supervisor = FakeSupervisor(args)
+    settings = dict(
+        start_delay=0,
+        interval=600,
+        trial_seconds=60,
+        settle=0,
+        squelch_step=0,
+    )
+    settings.update(options)
+    tuner = RfAutoTuner(supervisor, **settings)
+    decisions = []
+    tuner.on_decision = lambda gain, squelch: decisions.append((gain, squelch))
+    return tuner, supervisor, decisions
+
+
+def run(tuner, supervisor, rates, seconds, start):
+    """Tick once per virtual second; pages arrive at ``rates[gain]`` per minute."""
+    carry = 0.0
+    for second in range(int(seconds)):
+        tuner.tick(start + second)
+        carry += rates.get(supervisor.gain(), 0) / 60
+        while carry >= 1:
+            tuner.record()
+            carry -= 1
+
+
+def test_keeps_setting_without_significant_lead():
+    tuner, supervisor, decisions = make_tuner(["-g", "25.4", "-l", "10"])
+    # 20% ahead, but about ten pages per trial are well within chance
+    rates = {22.9: 10, 25.4: 10, 28.0: 12}
+    run(tuner, supervisor, rates, 300, time.monotonic())
+
+    assert tuner.rounds == 1
+    assert tuner.changes == 0
+    assert decisions == []
+    assert tuner.setting == (25.4, 10)
+    assert supervisor.gain() == 25.4
+    assert 0 < tuner.last_round["z"] < tuner.min_z
+    # Two trials plus restoring the kept setting
+    assert supervisor.restarts == [("rtl_fm", True)] * 3
+
+
+def test_changes_setting_on_significant_lead():
+    tuner, supervisor, decisions = make_tuner(["-g", "25.4", "-l", "10"])
+    rates = {22.9: 5, 25.4: 10, 28.0: 60}
+    run(tuner, supervisor, rates, 300, time.monotonic())
+
+    assert tuner.changes == 1
+    assert decisions == [(28.0, 10)]
+    assert tuner.setting == (28.0, 10)
+    assert supervisor.gain() == 28.0
+    assert tuner.last_round["z"] >= tuner.min_z
+
+
+def test_needs_min_decodes():
+    tuner, supervisor, decisions = make_tuner(
+        ["-g", "25.4"], confidence=0.5, min_decodes=10
+    )
+    rates = {25.4: 1, 28.0: 6}
+    run(tuner, supervisor, rates, 300, time.monotonic())
+
+    assert tuner.rounds == 1
+    assert decisions == []
+
+
+def test_round_waits_for_restart_budget():
+    # A round with three candidates needs three restarts
+    tuner, supervisor, _ = make_tuner(["-g", "25.4"], max_restarts_per_hour=2)
+    run(tuner, supervisor, {}, 1800, time.monotonic())
+    assert tuner.rounds == 0
+    assert supervisor.restarts == []
+
+    tuner, supervisor, _ = make_tuner(["-g", "25.4"], max_restarts_per_hour=3)
+    start = time.monotonic()
+    run(tuner, supervisor, {}, 1800, start)
+    # Later rounds wait until the first round's restarts are an hour old
+    assert tuner.rounds == 1
+    assert len(supervisor.restarts) == 3
+
+    run(tuner, supervisor, {}, 2400, start + 1800)
+    assert tuner.rounds == 2
+    assert len(supervisor.restarts) == 6
+
+
+def test_auto_gain_tries_fixed_gains():
+    tuner, supervisor, decisions = make_tuner(["-l", "10"])
+    candidates = tuner.candidates(tuner.setting)
+    assert candidates[0] == (None, 10)
+    gains = [gain for gain, _ in candidates[1:]]
+    assert len(gains) == 2 and all(gain in R820T_GAINS for gain in gains)
+
+    rates = {None: 10, gains[0]: 10, gains[1]: 60}
+    run(tuner, supervisor, rates, 300, time.monotonic())
+    assert decisions == [(gains[1], 10)]
+    assert supervisor.gain() == gains[1]
+    # From a fixed gain, the next rounds try its neighbours in the table
+    index = R820T_GAINS.index(gains[1])
+    assert tuner.candidates(tuner.setting)[1:] == [
+        (R820T_GAINS[index - 1], 10),
+        (R820T_GAINS[index + 1], 10),
+    ]
+
+
+def test_auto_gain_restored_without_gain_option():
+    tuner, supervisor, decisions = make_tuner(["-l", "10"])
+    run(tuner, supervisor, {None: 10}, 300, time.monotonic())
+    assert decisions == []
+    assert tuner.setting == (None, 10)
+    assert "-g" not in supervisor.rtl_worker.args
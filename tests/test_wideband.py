@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from benchmarks.pocsag_synth import modulate_iq, transmission_bits
+from includes.decoder import Channelizer, WidebandDecoder
+
+SAMPLE_RATE = 960000
+CENTER_FREQUENCY = 168.5e6
+
+# Two adjacent 25 kHz channels plus one further away, each with its own
+# network; "quiet" is configured but carries nothing
+CHANNELS = {
+    "north": (CENTER_FREQUENCY - 300000.0, 1200, [(1000001, 3, "alpha", "NORTH")]),
+    "south": (CENTER_FREQUENCY + 150000.0, 2400, [(2000002, 0, "numeric", "112")]),
+    "east": (CENTER_FREQUENCY + 175000.0, 1200, [(1500003, 2, "alpha", "EAST 7")]),
+}
+QUIET = CENTER_FREQUENCY - 100000.0
+
+
+def frequencies():
+    channels = {name: entry[0] for name, entry in CHANNELS.items()}
+    channels["quiet"] = QUIET
+    return channels
+
+
+@pytest.fixture(scope="module")
+def iq():
+    carriers = [
+        (frequency - CENTER_FREQUENCY, transmission_bits(pages), baud)
+        for frequency, baud, pages in CHANNELS.values()
+    ]
+    return b"".join(modulate_iq(carriers, SAMPLE_RATE, noise=0.5))
+
+
+def decode(iq, chunk):
+    decoder = WidebandDecoder(SAMPLE_RATE, CENTER_FREQUENCY, frequencies())
+    messages = []
+    for offset in range(0, len(iq), chunk):
+        messages.extend(decoder.feed(iq[offset : offset + chunk]))
+    messages.extend(decoder.flush())
+    return sorted(
+        (m.source, m.protocol, int(m.address), int(m.function), m.type, m.message)
+        for m in messages
+    )
+
+
+def expected():
+    return sorted(
+        (name, f"POCSAG{baud}", address, function, message_type, text)
+        for name, (_, baud, pages) in CHANNELS.items()
+        for address, function, message_type, text in pages
+    )
+
+
+def test_decodes_every_channel_without_leakage(iq):
+    # Every page exactly once, on its own channel only
+    assert decode(iq, 262144) == expected()
+
+
+@pytest.mark.parametrize("chunk", [4097, 99999])
+def test_feed_odd_chunks(iq, chunk):
+    assert decode(iq, chunk) == expected()
+
+
+def test_audio_independent_of_chunking(iq):
+    # One second of I/Q (two bytes per sample)
+    head = iq[: SAMPLE_RATE * 2]
+
+    def audio(sizes):
+        channelizer = Channelizer(SAMPLE_RATE, CENTER_FREQUENCY, frequencies())
+        blocks = {name: [] for name in frequencies()}
+        offset, index = 0, 0
+        while offset < len(head):
+            size = sizes[index % len(sizes)]
+            for name, samples in channelizer.feed(head[offset : offset + size]).items():
+                blocks[name].append(samples)
+            offset += size
+            index += 1
+        return {name: np.concatenate(parts) for name, parts in blocks.items()}
+
+    whole = audio([len(head)])
+    split = audio([1, 3, 8191, 2, 65537])
+    for name in whole:
+        assert len(whole[name])
+        assert np.array_equal(whole[name], split[name])
+
+
+def test_channel_outside_band():
+    with pytest.raises(ValueError):
+        Channelizer(SAMPLE_RATE, CENTER_FREQUENCY, {"far": CENTER_FREQUENCY + 480000})
+    with pytest.raises(ValueError):
+        WidebandDecoder(SAMPLE_RATE, CENTER_FREQUENCY, {"far": CENTER_FREQUENCY - 1e6})
+
+
+def test_invalid_rates():
+    with pytest.raises(ValueError):
+        Channelizer(1000000, CENTER_FREQUENCY, {"a": CENTER_FREQUENCY}, 24000)
+    with pytest.raises(ValueError):
+        Channelizer(SAMPLE_RATE, CENTER_FREQUENCY, {})